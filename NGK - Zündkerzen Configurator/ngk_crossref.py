@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+NGK Vergleichsliste (Cross-Reference)
+Löst Denso/Bosch/Champion-Nummern und vertippte Bezeichnungen auf NGK auf.
+
+Eingaben werden normalisiert ("cr9ek ", "CR-9EK" → "CR9EK"), exakte Treffer
+kommen aus einem Dict. Für Tippfehler gibt es einen Bigramm-Index: Kandidaten
+werden zuerst über einen Lösch-Nachbarschafts-Index gesucht (jede Nummer mit
+je einem gelöschten Zeichen, deckt Ersetzen/Einfügen/Löschen/Vertauschen ab).
+Liefert das nichts mit Distanz 1, wird nach Distanz 2 gesucht: kurze Anfragen
+über die Varianten mit zwei gelöschten Zeichen (nur für Nummern bis
+SHORT_KEY Zeichen gespeichert), längere über einen Bigramm-Index – Kandidaten
+müssen genug Bigramme mit der Anfrage teilen (q-Gramm-Lemma, mit
+Mehrfachzählung; ein Vertauschen zerstört bis zu 3 Bigramme), erst diese
+werden per Editierdistanz geprüft.
+"""
+
+import csv
+import random
+import re
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Bekannte Entsprechungen (Hersteller, Nummer, NGK)
+VERGLEICHSTABELLE = [
+    # 10mm Motorradkerzen (ZX6R: CR9E / CR10EIX)
+    ('DENSO', 'U27ESR-N', 'CR9E'),
+    ('DENSO', 'U24ESR-N', 'CR8E'),
+    ('DENSO', 'U22ESR-N', 'CR7E'),
+    ('DENSO', 'U31ESR-N', 'CR10E'),
+    ('DENSO', 'U27ETR', 'CR9EK'),
+    ('DENSO', 'IU27', 'CR9EIX'),
+    ('DENSO', 'IU31', 'CR10EIX'),
+    ('DENSO', 'IU24', 'CR8EIX'),
+    # 14mm PKW-Kerzen
+    ('DENSO', 'W20EPR-U', 'BPR6ES'),
+    ('BOSCH', 'WR7DC', 'BPR6ES'),
+    ('CHAMPION', 'RN9YC', 'BPR6ES'),
+    ('DENSO', 'K20PR-U', 'BKR6E'),
+    ('BOSCH', 'FR7DC', 'BKR6E'),
+    ('CHAMPION', 'RC9YC', 'BKR6E'),
+]
+
+HERSTELLER = ('NGK', 'DENSO', 'BOSCH', 'CHAMPION')
+# Bis zu dieser Länge bekommen Nummern auch die Varianten mit zwei gelöschten
+# Zeichen; der Bigramm-Filter taugt für so kurze Anfragen nichts
+SHORT_KEY = 10
+# Herstellerpräfix mit beliebigem (auch ohne) Trennzeichen: "Denso IU27", "denso-iu27", "DENSOIU27"
+_PREFIX = re.compile(r'^(?:%s)[\s\-_./]*(?=\S)' % '|'.join(HERSTELLER))
+
+
+def normalize(text: str) -> str:
+    """Großschreibung, Trennzeichen und Herstellerpräfix entfernen"""
+    upper = _PREFIX.sub('', text.upper().strip())
+    return re.sub(r'[\s\-_./]', '', upper)
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Editierdistanz (Vertauschen zählt 1) mit Abbruch über max_distance"""
+    # Gemeinsamer Anfang und gemeinsames Ende ändern die Distanz nicht
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return len(a) + len(b)
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            # Vergleiche statt min(): die Prüfung läuft für jeden Kandidaten
+            cost = previous[j - 1] if ca == cb else previous[j - 1] + 1
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb and before[j - 2] + 1 < cost:
+                cost = before[j - 2] + 1
+            current.append(cost)
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return max_distance + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(key: str) -> set:
+    """Die Nummer selbst und alle Varianten mit einem gelöschten Zeichen"""
+    return {key} | {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _deletes2(key: str) -> List[Tuple[str, int, int]]:
+    """Alle Varianten mit genau zwei gelöschten Zeichen, mit deren Positionen"""
+    return [(key[:i] + key[i + 1:j] + key[j + 1:], i, j)
+            for i in range(len(key)) for j in range(i + 1, len(key))]
+
+
+def _bigrams(key: str) -> List[str]:
+    """Bigramme mit Rand-Markern ('^CR9E$' → ^C, CR, R9, 9E, E$)"""
+    padded = f"^{key}$"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+class NGramIndex:
+    """Bigramm-Index für unscharfe Suche über kurze Teilenummern"""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.gram_counts: List[Counter] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.neighbours: Dict[str, List[int]] = {}
+        # Zwei Löschungen, nur Schlüssel bis SHORT_KEY Zeichen; Eintrag = Id << 10 | i << 5 | j
+        self.neighbours2: Dict[str, List[int]] = {}
+        self.long_keys = 0                              # Schlüssel, die dort fehlen
+
+    def add(self, key: str) -> int:
+        """Schlüssel aufnehmen, liefert die interne Id"""
+        key_id = len(self.keys)
+        self.keys.append(key)
+        self.gram_counts.append(Counter(_bigrams(key)))
+        for gram in self.gram_counts[-1]:
+            self.postings.setdefault(gram, []).append(key_id)
+        for variant in _deletes(key):
+            self.neighbours.setdefault(variant, []).append(key_id)
+        if len(key) <= SHORT_KEY:
+            for variant, i, j in _deletes2(key):
+                self.neighbours2.setdefault(variant, []).append(key_id << 10 | i << 5 | j)
+        else:
+            self.long_keys += 1
+        return key_id
+
+    def search(self, query: str, max_distance: int = 2) -> List[Tuple[int, int]]:
+        """(id, distanz) aller Schlüssel mit Editierdistanz <= max_distance
+
+        Distanz 1 kommt direkt aus der Lösch-Nachbarschaft; nur wenn dort
+        nichts mit Distanz 1 liegt, werden alle Treffer mit Distanz 2 ergänzt
+        (kurze Anfragen über zwei Löschungen, lange über den Bigramm-Filter).
+        """
+        hits = {}
+        for variant in _deletes(query):
+            for key_id in self.neighbours.get(variant, ()):
+                if key_id not in hits:
+                    hits[key_id] = edit_distance(query, self.keys[key_id], max_distance)
+        found = {key_id: d for key_id, d in hits.items() if d <= max_distance}
+        if max_distance < 2 or any(d <= 1 for d in found.values()):
+            return list(found.items())
+        # Vollständig, solange kein möglicher Treffer länger als SHORT_KEY ist
+        if max_distance == 2 and (len(query) + 2 <= SHORT_KEY or not self.long_keys):
+            extra = self._search_deletes2(query, max_distance)
+        else:
+            extra = self._search_bigrams(query, max_distance)
+        for key_id, distance in extra:
+            found.setdefault(key_id, distance)
+        return list(found.items())
+
+    def _search_deletes2(self, query: str, max_distance: int) -> List[Tuple[int, int]]:
+        """Distanz <= 2 über gemeinsame Varianten mit je bis zu zwei Löschungen
+
+        Jede Operation (auch Vertauschen) lässt sich durch höchstens eine
+        Löschung auf jeder Seite aufheben. Nur für Anfragen, deren mögliche
+        Treffer alle in neighbours2 stehen (höchstens SHORT_KEY Zeichen).
+        Zwei Löschungen auf beiden Seiten braucht es nur für zwei
+        Ersetzungen/Vertauschungen bei gleicher Länge – dann liegen die
+        gelöschten Positionen höchstens eins auseinander. Das sortiert die
+        vielen Nummern aus, die mit einer kurzen Anfrage nur zwei beliebige
+        Zeichen gemeinsam haben.
+        """
+        candidates = set()
+        for variant in _deletes(query):
+            candidates.update(self.neighbours.get(variant, ()))
+            candidates.update(entry >> 10 for entry in self.neighbours2.get(variant, ()))
+        for variant, i, j in _deletes2(query):
+            candidates.update(self.neighbours.get(variant, ()))
+            for entry in self.neighbours2.get(variant, ()):
+                if abs((entry >> 5 & 31) - i) <= 1 and abs((entry & 31) - j) <= 1:
+                    candidates.add(entry >> 10)
+        hits = []
+        for key_id in candidates:
+            distance = edit_distance(query, self.keys[key_id], max_distance)
+            if distance <= max_distance:
+                hits.append((key_id, distance))
+        return hits
+
+    def _search_bigrams(self, query: str, max_distance: int) -> List[Tuple[int, int]]:
+        """q-Gramm-Filter: seltenste Bigramme zuerst, dann Distanz prüfen"""
+        query_grams = Counter(_bigrams(query))
+        # Eine Editieroperation zerstört höchstens 3 Bigramme (Vertauschen "AB"→"BA"
+        # trifft xA, AB, By), ein Treffer teilt also mindestens needed Bigramme
+        needed = len(query) + 1 - 3 * max_distance
+        if needed <= 0:
+            # Filter greift nicht (nur bei max_distance > 2, kurze Anfragen gehen
+            # sonst über _search_deletes2): alle Schlüssel passender Länge prüfen
+            candidates = (i for i, key in enumerate(self.keys) if abs(len(key) - len(query)) <= max_distance)
+        else:
+            # Seltenste Bigramme zuerst; sobald die übrigen zusammen weniger als
+            # needed ausmachen, muss jeder Treffer schon gefunden sein
+            remaining = sum(query_grams.values())
+            probe = []
+            for gram in sorted(query_grams, key=lambda g: len(self.postings.get(g, ()))):
+                if remaining < needed:
+                    break
+                probe.append(gram)
+                remaining -= query_grams[gram]
+            candidates = dict.fromkeys(key_id for gram in probe for key_id in self.postings.get(gram, ()))
+
+        hits = []
+        for key_id in candidates:
+            key = self.keys[key_id]
+            shared = sum((query_grams & self.gram_counts[key_id]).values())
+            if shared < max(len(query), len(key)) + 1 - 3 * max_distance:
+                continue
+            distance = edit_distance(query, key, max_distance)
+            if distance <= max_distance:
+                hits.append((key_id, distance))
+        return hits
+
+
+class CrossReference:
+    """Vergleichsliste NGK ↔ andere Hersteller mit Tippfehler-Toleranz"""
+
+    def __init__(self, table=None):
+        self.entries: List[Dict] = []       # {'hersteller', 'nummer', 'ngk'}
+        self.exact: Dict[str, List[int]] = {}
+        self.fuzzy = NGramIndex()
+        self._entries_by_key: List[List[int]] = []
+
+        for hersteller, nummer, ngk in (table if table is not None else VERGLEICHSTABELLE):
+            self.add(hersteller, nummer, ngk)
+
+    def add(self, hersteller: str, nummer: str, ngk: str):
+        """Eine Entsprechung aufnehmen; die NGK-Seite ist selbst auch suchbar"""
+        ngk = normalize(ngk)
+        self._add_entry(hersteller.upper(), nummer.upper().strip(), ngk)
+        if hersteller.upper() != 'NGK' and ngk not in self.exact:
+            self._add_entry('NGK', ngk, ngk)
+
+    def _add_entry(self, hersteller: str, nummer: str, ngk: str):
+        entry_id = len(self.entries)
+        self.entries.append({'hersteller': hersteller, 'nummer': nummer, 'ngk': ngk})
+        key = normalize(nummer)
+        if key not in self.exact:
+            self.exact[key] = []
+            self.fuzzy.add(key)
+            self._entries_by_key.append(self.exact[key])
+        self.exact[key].append(entry_id)
+
+    def load_csv(self, path: str) -> int:
+        """Zusätzliche Einträge aus CSV laden (hersteller,nummer,ngk)"""
+        count = 0
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self.add(row['hersteller'], row['nummer'], row['ngk'])
+                count += 1
+        return count
+
+    def lookup(self, query: str, max_distance: int = 2, limit: int = 5) -> List[Dict]:
+        """Sucht eine Nummer, exakt oder unscharf; Ergebnis nach Distanz sortiert"""
+        key = normalize(query)
+        if not key:
+            return []
+
+        if key in self.exact:
+            return [dict(self.entries[i], distanz=0) for i in self.exact[key]][:limit]
+
+        results = []
+        for key_id, distance in sorted(self.fuzzy.search(key, max_distance), key=lambda hit: hit[1]):
+            for entry_id in self._entries_by_key[key_id]:
+                results.append(dict(self.entries[entry_id], distanz=distance))
+        results.sort(key=lambda r: (r['distanz'], r['nummer']))
+        return results[:limit]
+
+    def to_ngk(self, query: str, max_distance: int = 2) -> Optional[str]:
+        """Beste NGK-Entsprechung oder None"""
+        results = self.lookup(query, max_distance, limit=1)
+        return results[0]['ngk'] if results else None
+
+
+def _typo(key: str, rng: random.Random) -> str:
+    """Einen zufälligen Tippfehler erzeugen (Tausch, Löschen, Ersetzen)"""
+    pos = rng.randrange(len(key))
+    kind = rng.randrange(3)
+    if kind == 0 and pos < len(key) - 1:
+        return key[:pos] + key[pos + 1] + key[pos] + key[pos + 2:]
+    if kind == 1 and len(key) > 3:
+        return key[:pos] + key[pos + 1:]
+    return key[:pos] + rng.choice('ABCDEGKLPRSUVXZ0123456789') + key[pos + 1:]
+
+
+def run_benchmark(catalog_size: int = 20000, queries: int = 2000, seed: int = 42) -> Dict:
+    """Misst Abfragezeit über einen synthetischen Katalog in Händlergröße"""
+    rng = random.Random(seed)
+    table = list(VERGLEICHSTABELLE)
+    for _ in range(catalog_size):
+        hersteller = rng.choice(HERSTELLER[1:])
+        nummer = (rng.choice(['U', 'IU', 'W', 'K', 'WR', 'FR', 'RN', 'RC', 'RG'])
+                  + str(rng.randrange(2, 40))
+                  + ''.join(rng.choice('ABCDEGKLPRSTUVXYZ') for _ in range(rng.randrange(1, 4))))
+        ngk = (rng.choice('ABCDJ') + rng.choice(['', 'P', 'K', 'M']) + rng.choice(['', 'R'])
+               + str(rng.randrange(2, 15)) + rng.choice(['', 'E', 'H', 'L'])
+               + rng.choice(['', 'IX', 'VX', 'P', 'S', 'K']))
+        table.append((hersteller, nummer, ngk))
+
+    start = time.perf_counter()
+    xref = CrossReference(table=table)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    samples = [rng.choice(table)[1] for _ in range(queries)]
+    exact_queries = [f" {s.lower()} " for s in samples]
+    typo_queries = [_typo(normalize(s), rng) for s in samples]
+    # Kurze Nummern, die es nicht gibt: hier hilft kein Filter über gemeinsame Bigramme
+    short_queries = []
+    while len(short_queries) < queries:
+        query = ''.join(rng.choice('ABCDEGKLPQRSUVWXZ0123456789') for _ in range(rng.randrange(2, 7)))
+        if query not in xref.exact:
+            short_queries.append(query)
+
+    result = {'eintraege': len(xref.entries), 'aufbau_ms': build_ms}
+    for name, batch in (('exakt', exact_queries), ('tippfehler', typo_queries), ('kurz', short_queries)):
+        durations = []
+        for query in batch:
+            start = time.perf_counter()
+            xref.lookup(query)
+            durations.append((time.perf_counter() - start) * 1e6)
+        durations.sort()
+        result[f'{name}_us'] = sum(durations) / len(durations)
+        result[f'{name}_p99_us'] = durations[int(len(durations) * 0.99)]
+    return result
+
+
+def main():
+    """Benchmark (--bench) oder interaktive Abfrage"""
+    if '--bench' in sys.argv:
+        result = run_benchmark()
+        print(f"📚 Katalog: {result['eintraege']} Einträge (Aufbau {result['aufbau_ms']:.0f} ms)")
+        print(f"⚡ Exakte Abfrage:    {result['exakt_us']:7.1f} µs (p99 {result['exakt_p99_us']:.1f} µs)")
+        print(f"🔍 Mit Tippfehler:    {result['tippfehler_us']:7.1f} µs (p99 {result['tippfehler_p99_us']:.1f} µs)")
+        print(f"🔍 Kurz, unbekannt:   {result['kurz_us']:7.1f} µs (p99 {result['kurz_p99_us']:.1f} µs)")
+        return
+
+    xref = CrossReference()
+    while True:
+        query = input("🔍 Teilenummer (leer = Ende): ").strip()
+        if not query:
+            break
+        results = xref.lookup(query)
+        if not results:
+            print("   ❌ Keine Entsprechung gefunden")
+        for r in results:
+            print(f"   {r['hersteller']:<9} {r['nummer']:<10} → NGK {r['ngk']:<8} (Distanz {r['distanz']})")
+
+
+if __name__ == "__main__":
+    main()
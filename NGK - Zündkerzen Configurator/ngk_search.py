@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+NGK Zündkerzen Suche
+Umkehrung des Analyzers: Anforderungen → passende NGK Bezeichnungen.
+
+Aus den Code-Tabellen des NGKAnalyzer wird ein Katalog aller gültigen
+Bezeichnungen erzeugt. Pro Attribut-Wert gibt es eine Bitmenge (Python-int),
+eine Anfrage ist damit nur noch eine Folge von AND/OR-Operationen.
+"""
+
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ngk_terminal_analyzer import NGKAnalyzer
+
+# Bauart-Buchstaben zwischen Gewinde und Wärmewert (ohne Entstörung)
+PREFIX_CODES = ['', 'C', 'K', 'M', 'P', 'U']
+# Entstörung steht direkt vor dem Wärmewert
+ENTSTOER_CODES = ['', 'R', 'Z']
+# Mittelelektroden, die als gleichwertiger Ersatz einer Standard-Kerze gelten
+PREMIUM_ELEKTRODEN = {'G', 'GV', 'IX', 'P', 'S', 'V', 'VX'}
+# Gesetzte Bits pro Byte-Wert (für iter_rows)
+_BYTE_BITS = [tuple(i for i in range(8) if value >> i & 1) for value in range(256)]
+
+
+def _mm(text: str) -> Optional[float]:
+    """Erste mm-Angabe aus einem Tabellentext ('19mm (3/4")' → 19.0)"""
+    match = re.search(r'(\d+(?:\.\d+)?)mm', text)
+    return float(match.group(1)) if match else None
+
+
+class NGKSearchIndex:
+    """Invertierter Index über alle aus den Code-Tabellen bildbaren Bezeichnungen"""
+
+    def __init__(self, analyzer: Optional[NGKAnalyzer] = None):
+        self.analyzer = analyzer or NGKAnalyzer()
+
+        # Spalten des Katalogs (eine Zeile pro Bezeichnung)
+        self.designations: List[str] = []
+        self.gewinde: List[str] = []
+        self.bauart: List[Tuple[str, ...]] = []
+        self.waermewert: List[int] = []
+        self.gewindelaenge: List[str] = []
+        self.elektroden: List[str] = []
+
+        # (attribut, wert) → Bitmenge der Katalogzeilen
+        self.index: Dict[Tuple[str, object], int] = {}
+
+        self._suffix_codes = sorted(self.analyzer.elektroden_codes, key=len, reverse=True)
+        self._prefix_codes = sorted(self.analyzer.bauart_codes, key=len, reverse=True)
+        self._build()
+
+    def _build(self):
+        """Katalog erzeugen und Index füllen"""
+        a = self.analyzer
+        heat_values = [w['wert'] for w in a.waermewerte]
+        laengen = [''] + list(a.gewindelaenge_codes)
+        suffixe = [''] + list(a.elektroden_codes)
+        rows_by_key: Dict[Tuple[str, object], List[int]] = {}
+
+        for gew in a.gewinde_daten:
+            durchmesser = _mm(a.gewinde_daten[gew]['durchmesser'])
+            for prefix in PREFIX_CODES:
+                for entstoer in ENTSTOER_CODES:
+                    bauart = tuple(c for c in (prefix, entstoer) if c)
+                    for heat in heat_values:
+                        for laenge in laengen:
+                            for suffix in suffixe:
+                                row = len(self.designations)
+                                self.designations.append(f"{gew}{prefix}{entstoer}{heat}{laenge}{suffix}")
+                                self.gewinde.append(gew)
+                                self.bauart.append(bauart)
+                                self.waermewert.append(heat)
+                                self.gewindelaenge.append(laenge)
+                                self.elektroden.append(suffix)
+
+                                keys = [
+                                    ('gewinde', gew),
+                                    ('durchmesser', durchmesser),
+                                    ('waermewert', heat),
+                                    ('gewindelaenge', laenge),
+                                    ('laenge', _mm(a.gewindelaenge_codes[laenge]) if laenge else None),
+                                    ('elektrode', suffix),
+                                    ('entstoerung', bool(entstoer)),
+                                ]
+                                keys.extend(('bauart', code) for code in bauart or ('',))
+                                for key in keys:
+                                    rows_by_key.setdefault(key, []).append(row)
+
+        # Zeilenlisten einmalig in Bitmengen umwandeln (statt n-mal int |= bit)
+        size = (len(self.designations) + 7) // 8
+        for key, rows in rows_by_key.items():
+            buffer = bytearray(size)
+            for row in rows:
+                buffer[row >> 3] |= 1 << (row & 7)
+            self.index[key] = int.from_bytes(buffer, 'little')
+
+    def __len__(self):
+        return len(self.designations)
+
+    # ------------------------------------------------------------------
+    # Bezeichnungen zerlegen
+    # ------------------------------------------------------------------
+
+    def parse(self, designation: str) -> Optional[Dict]:
+        """Zerlegt eine Bezeichnung positionsgenau (Präfix | Wärmewert | Suffix)"""
+        upper = designation.upper().strip()
+        match = re.match(r'^([A-Z])([A-Z]*?)(\d{1,2})([A-Z]*)', upper)
+        if not match or match.group(1) not in self.analyzer.gewinde_daten:
+            return None
+
+        gew, prefix, heat, suffix = match.groups()
+        bauart = self._tokenize(prefix, self._prefix_codes)
+        laenge = ''
+        if suffix and suffix[0] in self.analyzer.gewindelaenge_codes:
+            laenge, suffix = suffix[0], suffix[1:]
+        elektroden = self._tokenize(suffix, self._suffix_codes)
+        if bauart is None or elektroden is None:
+            return None
+
+        return {
+            'designation': upper,
+            'gewinde': gew,
+            'bauart': tuple(bauart),
+            'waermewert': int(heat),
+            'gewindelaenge': laenge,
+            'elektroden': tuple(elektroden),
+        }
+
+    @staticmethod
+    def _tokenize(text: str, codes: List[str]) -> Optional[List[str]]:
+        """Zerlegt einen Buchstabenblock gierig in bekannte Codes"""
+        tokens = []
+        pos = 0
+        while pos < len(text):
+            code = next((c for c in codes if text.startswith(c, pos)), None)
+            if code is None:
+                return None
+            tokens.append(code)
+            pos += len(code)
+        return tokens
+
+    # ------------------------------------------------------------------
+    # Anfragen
+    # ------------------------------------------------------------------
+
+    def _bits(self, attribute: str, values) -> int:
+        """Vereinigung der Bitmengen für einen oder mehrere Werte"""
+        if not isinstance(values, (list, tuple, set, range)):
+            values = [values]
+        bits = 0
+        for value in values:
+            bits |= self.index.get((attribute, value), 0)
+        return bits
+
+    def query_bits(self, gewinde=None, durchmesser=None, laenge=None, gewindelaenge=None,
+                   entstoerung=None, waermewert=None, bauart=None, elektrode=None) -> int:
+        """Bitmenge aller Bezeichnungen, die alle Anforderungen erfüllen
+
+        waermewert darf ein einzelner Wert, eine Liste oder ein Tupel (min, max) sein.
+        bauart verlangt alle angegebenen Codes, die übrigen Attribute je einen der Werte.
+        """
+        result = None
+
+        if isinstance(waermewert, tuple) and len(waermewert) == 2:
+            waermewert = range(waermewert[0], waermewert[1] + 1)
+
+        for attribute, values in (
+            ('gewinde', gewinde),
+            ('durchmesser', durchmesser),
+            ('laenge', laenge),
+            ('gewindelaenge', gewindelaenge),
+            ('entstoerung', entstoerung),
+            ('waermewert', waermewert),
+            ('elektrode', elektrode),
+        ):
+            if values is not None:
+                bits = self._bits(attribute, values)
+                result = bits if result is None else result & bits
+                if not result:
+                    return 0
+
+        if bauart:
+            for code in ([bauart] if isinstance(bauart, str) else bauart):
+                bits = self.index.get(('bauart', code), 0)
+                result = bits if result is None else result & bits
+
+        if result is None:
+            return (1 << len(self.designations)) - 1
+        return result
+
+    def iter_rows(self, bits: int) -> Iterator[int]:
+        """Zeilennummern der gesetzten Bits
+
+        Einmal in Bytes umwandeln und byteweise ablaufen: bits ^= low pro Zeile
+        würde die ganze Zahl jedes Mal kopieren (quadratisch).
+        """
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        for offset, value in enumerate(data):
+            if value:
+                base = offset * 8
+                for bit in _BYTE_BITS[value]:
+                    yield base + bit
+
+    def search(self, limit: Optional[int] = None, **requirements) -> List[str]:
+        """Alle Bezeichnungen, die die Anforderungen erfüllen"""
+        result = []
+        for row in self.iter_rows(self.query_bits(**requirements)):
+            result.append(self.designations[row])
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def equivalents(self, designation: str, heat_spread: int = 1, limit: int = 10) -> List[Tuple[str, float]]:
+        """Nächstliegende Alternativen zu einer Kerze (gleiches Gewinde, gleiche Länge)
+
+        Gewinde, Gewindelänge und Entstörung müssen passen, sonst ist die Kerze
+        nicht einbaubar. Sortiert wird nach Abstand im Wärmewert und Abweichung
+        bei Bauart/Elektrode (kleiner = ähnlicher); Edelmetall-Elektroden gelten
+        als naheliegender Ersatz, Sonderbauformen werden stark abgewertet.
+        """
+        parsed = self.parse(designation)
+        if parsed is None:
+            return []
+
+        heat = parsed['waermewert']
+        bits = self.query_bits(
+            gewinde=parsed['gewinde'],
+            gewindelaenge=parsed['gewindelaenge'],
+            entstoerung='R' in parsed['bauart'] or 'Z' in parsed['bauart'],
+            waermewert=(heat - heat_spread, heat + heat_spread),
+        )
+
+        own_elektroden = set(parsed['elektroden'])
+        own_bauart = set(parsed['bauart'])
+        scored = []
+        for row in self.iter_rows(bits):
+            name = self.designations[row]
+            if name == parsed['designation']:
+                continue
+            elektrode = self.elektroden[row]
+            score = 0.5 * abs(self.waermewert[row] - heat)
+            score += 1.0 * len(own_bauart.symmetric_difference(self.bauart[row]))
+            if elektrode and elektrode not in own_elektroden:
+                score += 0.25 if elektrode in PREMIUM_ELEKTRODEN else 1.0
+            elif not elektrode and own_elektroden:
+                score += 0.5
+            scored.append((name, score))
+
+        scored.sort(key=lambda item: (item[1], item[0]))
+        return scored[:limit]
+
+
+def main():
+    """Kleine Demo mit Zeitmessung"""
+    start = time.perf_counter()
+    index = NGKSearchIndex()
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"📚 Katalog: {len(index)} Bezeichnungen (Aufbau {build_ms:.0f} ms)")
+
+    requirements = dict(durchmesser=14.0, laenge=19.0, entstoerung=True,
+                        waermewert=(9, 10), elektrode='P')
+    start = time.perf_counter()
+    bits = index.query_bits(**requirements)
+    query_us = (time.perf_counter() - start) * 1e6
+    treffer = index.search(**requirements)
+    print(f"🔍 14mm, 19mm, Entstörung, Wärmewert 9-10, Platin → {len(treffer)} Treffer ({query_us:.0f} µs)")
+    for name in treffer[:10]:
+        print(f"   {name}")
+    print()
+
+    print("🔁 Alternativen zu CR9E:")
+    for name, score in index.equivalents("CR9E", limit=15):
+        print(f"   {name:<10} (Abstand {score:.2f})")
+
+
+if __name__ == "__main__":
+    main()
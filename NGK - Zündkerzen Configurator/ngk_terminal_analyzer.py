@@ -43,6 +43,7 @@ class NGKAnalyzer:
             'G': 'Stift-Mittelelektrode aus Nickellegierung',
             'GV': 'Gold-Palladium-Mittelelektrode (Rennversion)',
             'H': 'Teilgewinde',
+            'IX': 'Iridium-Mittelelektrode',
             'K': 'Doppel-Masseelektrode (Toyota, BMW)',
             'L': 'Halber Wärmewert',
             'LM': 'Kompaktbauform für Rasenmäher',
@@ -78,6 +79,11 @@ class NGKAnalyzer:
             {'wert': 14, 'typ': 'Racing', 'temp': 'Extrem', 'anwendung': 'Rennzwecke, höchste Belastung', 'waermeleit': '42-48 W/mK'}
         ]
 
+        # Such-Index und Vergleichsliste werden erst bei Bedarf aufgebaut
+        # (siehe ngk_search.py / ngk_crossref.py)
+        self.search_index = None
+        self.cross_reference = None
+
     def clear_screen(self):
         """Bildschirm löschen"""
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -277,6 +283,8 @@ class NGKAnalyzer:
         print("4. Code-Übersicht anzeigen")
         print("5. Physikalische Grundlagen erklären")
         print("6. Beispiele anzeigen")
+        print("7. Alternativen zu einer Zündkerze finden")
+        print("8. Fremdnummer / Tippfehler auf NGK auflösen")
         print("0. Beenden")
         print()
 
@@ -296,6 +304,41 @@ class NGKAnalyzer:
             print(f"   {designation:<8} → {description}")
         print()
 
+    def show_equivalents(self, designation: str):
+        """Zeigt einbaugleiche Alternativen aus dem Such-Index"""
+        if self.search_index is None:
+            from ngk_search import NGKSearchIndex
+            print("   Baue Such-Index auf...")
+            self.search_index = NGKSearchIndex(self)
+
+        alternatives = self.search_index.equivalents(designation, limit=15)
+        if not alternatives:
+            print("❌ Bezeichnung nicht erkannt!")
+            return
+
+        print(f"🔁 ALTERNATIVEN ZU: {designation.upper()}")
+        print("-" * 50)
+        for name, score in alternatives:
+            print(f"   {name:<10} (Abstand {score:.2f})")
+
+    def show_cross_reference(self, number: str):
+        """Löst eine Fremd- oder vertippte Nummer auf NGK auf und analysiert sie"""
+        if self.cross_reference is None:
+            from ngk_crossref import CrossReference
+            self.cross_reference = CrossReference()
+
+        results = self.cross_reference.lookup(number)
+        if not results:
+            print("❌ Keine Entsprechung gefunden!")
+            return
+
+        print(f"🔁 ENTSPRECHUNGEN FÜR: {number}")
+        print("-" * 50)
+        for r in results:
+            print(f"   {r['hersteller']:<9} {r['nummer']:<10} → NGK {r['ngk']:<8} (Distanz {r['distanz']})")
+        print()
+        self.print_analysis(self.analyze_designation(results[0]['ngk']))
+
     def run(self):
         """Hauptprogramm-Schleife"""
         while True:
@@ -304,7 +347,7 @@ class NGKAnalyzer:
             self.show_menu()
             
             try:
-                choice = input("Wähle eine Option (0-6): ").strip()
+                choice = input("Wähle eine Option (0-8): ").strip()
                 
                 if choice == '0':
                     print("\n👋 Auf Wiedersehen!")
@@ -356,6 +399,20 @@ class NGKAnalyzer:
                     self.print_header()
                     self.show_examples()
                     input("⏎ Drücke Enter um fortzufahren...")
+
+                elif choice == '7':
+                    self.clear_screen()
+                    self.print_header()
+                    designation = input("🔍 NGK Bezeichnung eingeben (z.B. CR9E): ").strip()
+                    self.show_equivalents(designation)
+                    input("\n⏎ Drücke Enter um fortzufahren...")
+
+                elif choice == '8':
+                    self.clear_screen()
+                    self.print_header()
+                    number = input("🔍 Teilenummer eingeben (z.B. Denso IU27, cr-9ek): ").strip()
+                    self.show_cross_reference(number)
+                    input("\n⏎ Drücke Enter um fortzufahren...")
                     
                 else:
                     print("❌ Ungültige Auswahl!")
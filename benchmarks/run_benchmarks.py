@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Benchmarks für alle drei Tools
+Läuft offline und ohne Hardware (ESP32 wird als serielles Gerät simuliert):
+
+    ngk.*      NGKAnalyzer.analyze_designation über den erzeugten Katalog
+    zx6r.*     ZX6RApp Kaltstart und Renderzeit jeder Ansicht (Rich headless)
+    logger.*   read_sensors() gegen simuliertes Serial, Logging-Durchsatz
+
+Ergebnisse landen als JSON in benchmarks/results/ (mit Git-Stand) und werden
+mit benchmarks/baseline.json verglichen. Baseline anlegen bzw. erneuern:
+
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py                 # Vergleich
+    python benchmarks/run_benchmarks.py --only ngk      # nur eine Gruppe
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+sys.path.insert(0, os.path.join(REPO_DIR, "zx6r - Datenlogger"))
+import tool_paths  # noqa: E402,F401  (macht alle drei Tool-Ordner importierbar)
+
+# name → (Setup-Funktion, Wiederholungen); Setup liefert (Messfunktion, Operationen pro Lauf, Einheit)
+BENCHMARKS: Dict[str, Tuple[Callable, int]] = {}
+
+
+def benchmark(name: str, repeat: int = 5):
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+    return register
+
+
+class SimulatedSerial:
+    """Verhält sich wie serial.Serial mit der ESP32-Firmware am anderen Ende"""
+
+    def __init__(self):
+        self.count = 0
+        self.pending = False
+
+    def write(self, data: bytes):
+        self.pending = data.startswith(b"READ")
+
+    def flush(self):
+        pass
+
+    def readline(self) -> bytes:
+        if not self.pending:
+            return b""
+        self.pending = False
+        self.count += 1
+        rpm = 1000 + (self.count * 37) % 11000
+        temp = -777.0 if self.count % 500 == 0 else 80 + (self.count % 200) / 10
+        return f"RPM:{rpm},TEMP:{temp:.1f}\r\n".encode()
+
+    def close(self):
+        pass
+
+
+def _simulated_reader():
+    from data_logger import OriginalSensorReader
+    from transports import SerialTransport
+
+    transport = SerialTransport.__new__(SerialTransport)
+    transport.connection = SimulatedSerial()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return OriginalSensorReader(transport=transport)
+
+
+# --- NGK -------------------------------------------------------------------
+
+@benchmark("ngk.search_index_build", repeat=3)
+def bench_ngk_index():
+    from ngk_search import NGKSearchIndex
+    from ngk_terminal_analyzer import NGKAnalyzer
+
+    analyzer = NGKAnalyzer()
+    return (lambda: NGKSearchIndex(analyzer)), 1, "Index"
+
+
+@benchmark("ngk.analyze_designation")
+def bench_ngk_analyze():
+    from ngk_search import NGKSearchIndex
+    from ngk_terminal_analyzer import NGKAnalyzer
+
+    analyzer = NGKAnalyzer()
+    designations = NGKSearchIndex(analyzer).designations[::5]
+
+    def run():
+        analyze = analyzer.analyze_designation
+        for designation in designations:
+            analyze(designation)
+    return run, len(designations), "Bezeichnungen"
+
+
+# --- ZX6R App --------------------------------------------------------------
+
+@benchmark("zx6r.cold_start", repeat=5)
+def bench_zx6r_cold_start():
+    code = ("import time; t = time.perf_counter(); import zx6r_app; zx6r_app.ZX6RApp(); "
+            "print(time.perf_counter() - t)")
+    env = dict(os.environ, PYTHONPATH=tool_paths.TUNING_DIR)
+    workdir = tempfile.mkdtemp()
+
+    def run():
+        # Frischer Interpreter; gemessen wird Import + Konstruktor, nicht der Python-Start
+        out = subprocess.run([sys.executable, "-c", code], cwd=workdir, env=env,
+                             capture_output=True, text=True, check=True)
+        return float(out.stdout.strip())
+    return run, 1, "Start"
+
+
+def _view_benchmark(view: str):
+    def setup():
+        from rich.console import Console
+        from zx6r_app import ZX6RApp
+
+        with contextlib.chdir(tempfile.mkdtemp()):
+            app = ZX6RApp()
+        sink = io.StringIO()
+        app.console = Console(file=sink, width=120, force_terminal=True, color_system="truecolor")
+
+        def run():
+            sink.seek(0)
+            sink.truncate()
+            getattr(app, view)()
+        return run, 1, "Ansicht"
+    return setup
+
+
+for _view in ("show_header", "show_setup_comparison", "show_performance_table",
+              "show_speed_table", "show_ascii_graph"):
+    benchmark(f"zx6r.view.{_view}", repeat=10)(_view_benchmark(_view))
+
+
+# --- Datenlogger -----------------------------------------------------------
+
+@benchmark("logger.read_sensors")
+def bench_read_sensors():
+    reader = _simulated_reader()
+    count = 20000
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(count):
+                reader.read_sensors()
+    return run, count, "Samples"
+
+
+def _logging_benchmark(log_format: str):
+    def setup():
+        reader = _simulated_reader()
+        workdir = tempfile.mkdtemp()
+        duration_s = 1.0
+
+        def run():
+            from session_log import load_session
+            with contextlib.chdir(workdir), contextlib.redirect_stdout(io.StringIO()):
+                log_file = reader.start_continuous_logging(duration_s / 60, log_format=log_format, interval=0)
+                rows = len(load_session(log_file)["timestamp"])
+                os.remove(log_file)
+            # Feste Laufzeit → als Zeit pro Sample zurückgeben
+            return duration_s / max(rows, 1)
+        return run, 1, "Sample"
+    return setup
+
+
+benchmark("logger.logging_csv", repeat=3)(_logging_benchmark("csv"))
+benchmark("logger.logging_zxl", repeat=3)(_logging_benchmark("zxl"))
+
+
+# --- Ablauf ----------------------------------------------------------------
+
+def run_benchmarks(only: str = "") -> Dict[str, dict]:
+    results = {}
+    for name, (setup, repeat) in BENCHMARKS.items():
+        if only and not name.startswith(only):
+            continue
+        run, ops, unit = setup()
+        times: List[float] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            measured = run()
+            elapsed = time.perf_counter() - start
+            # Messfunktionen mit eigener Messung (Subprozess, feste Laufzeit) liefern die Zeit selbst
+            times.append(measured if isinstance(measured, float) else elapsed)
+        median = statistics.median(times)
+        results[name] = {
+            "median_s": median,
+            "min_s": min(times),
+            "runs": repeat,
+            "ops": ops,
+            "unit": unit,
+            "ops_per_s": ops / median if median > 0 else None,
+        }
+        rate = results[name]["ops_per_s"]
+        print(f"⏱️ {name:38s} {median * 1000:10.3f} ms   " + (f"{rate:12,.0f} {unit}/s" if rate else ""))
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                             capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unbekannt"
+
+
+def save_results(results: Dict[str, dict], path: str = None) -> str:
+    report = {
+        "erstellt": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "plattform": platform.platform(),
+        "ergebnisse": results,
+    }
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"bench_{stamp}_{report['revision']}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Vergleich mit der Baseline ausgeben → Namen der langsameren Benchmarks"""
+    regressions = []
+    print()
+    print(f"{'Benchmark':38s} {'Baseline':>10s} {'Jetzt':>10s} {'Faktor':>8s}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:38s} {'–':>10s} {result['median_s'] * 1000:9.3f}ms {'neu':>8s}")
+            continue
+        before = baseline[name]["median_s"]
+        ratio = result["median_s"] / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            marker = "🔴 langsamer"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            marker = "🟢 schneller"
+        else:
+            marker = ""
+        print(f"{name:38s} {before * 1000:9.3f}ms {result['median_s'] * 1000:9.3f}ms {ratio:7.2f}× {marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ZX6R/NGK Benchmarks")
+    parser.add_argument("--only", default="", help="nur Benchmarks mit diesem Präfix (z.B. ngk, zx6r, logger)")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    parser.add_argument("--threshold", type=float, default=0.15, help="erlaubte Abweichung (0.15 = 15%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit-Code 1 bei Verschlechterung")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only)
+    path = save_results(results)
+    print(f"\n📁 Ergebnis: {os.path.relpath(path, REPO_DIR)}")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE) as f:
+                baseline = json.load(f)["ergebnisse"]
+        baseline.update(results)
+        save_results(baseline, BASELINE_FILE)
+        print(f"📌 Baseline gespeichert: {os.path.relpath(BASELINE_FILE, REPO_DIR)}")
+        return
+
+    if not os.path.exists(BASELINE_FILE):
+        print("💡 Noch keine Baseline – mit --save-baseline anlegen")
+        return
+    with open(BASELINE_FILE) as f:
+        baseline = json.load(f)
+    print(f"📌 Baseline: Revision {baseline['revision']} vom {baseline['erstellt']}")
+    regressions = compare(results, baseline["ergebnisse"], args.threshold)
+    if regressions:
+        print(f"\n🔴 {len(regressions)} Benchmark(s) langsamer als die Baseline: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\n🟢 Keine Verschlechterung gegenüber der Baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+ZX6R Alarm-Regeln
+Deklarative Regeln für Übertemperatur, Überdrehzahl und Sensorfehler.
+
+Regeln sind einfache Dicts:
+
+    {"name": "Überhitzung", "kanal": "temp", "ueber": 105, "aus_unter": 100,
+     "dauer_s": 3, "stufe": "kritisch"}
+    {"name": "Drehzahl-Abriss", "kanal": "rpm_rate", "unter": -20000}
+    {"name": "Temperatursensor", "feld": "temp_status", "wert": "sensor_error"}
+
+Kanäle: temp, rpm sowie die Änderungsraten temp_rate (°C/s) und rpm_rate
+(U/min pro s). "aus_unter"/"aus_ueber" geben die Hysterese an, "dauer_s"
+wie lange die Bedingung anstehen muss.
+
+Beim Kompilieren werden die Schwellen pro Kanal sortiert. Pro Sample wird
+nur per Bisektion gesucht, welche Schwellen seit dem letzten Wert
+überschritten wurden; Regeln, deren Schwelle nicht gekreuzt wurde, werden gar
+nicht angefasst. Der Aufwand pro Sample hängt damit von der Zahl der Kanäle
+ab, nicht von der Zahl der Regeln.
+"""
+
+import heapq
+import json
+import os
+import sys
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_RULES = [
+    {"name": "Überhitzung", "kanal": "temp", "ueber": 105, "aus_unter": 100, "dauer_s": 3, "stufe": "kritisch"},
+    {"name": "Temperatur hoch", "kanal": "temp", "ueber": 100, "aus_unter": 97, "dauer_s": 5, "stufe": "warnung"},
+    {"name": "Temperatur steigt schnell", "kanal": "temp_rate", "ueber": 2.0, "aus_unter": 0.5, "dauer_s": 3, "stufe": "warnung"},
+    {"name": "Überdrehzahl", "kanal": "rpm", "ueber": 12500, "aus_unter": 12000, "stufe": "kritisch"},
+    {"name": "Drehzahl-Abriss (Sensor?)", "kanal": "rpm_rate", "unter": -20000, "aus_ueber": -1000, "stufe": "warnung"},
+    {"name": "Temperatursensor-Fehler", "feld": "temp_status", "wert": "sensor_error", "dauer_s": 1, "stufe": "warnung"},
+    {"name": "ESP32 nicht verbunden", "feld": "status", "wert": "disconnected", "stufe": "kritisch"},
+    {"name": "Lesefehler", "feld": "status", "wert": "read_error", "dauer_s": 1, "stufe": "warnung"},
+]
+
+CHANNELS = ("temp", "rpm", "temp_rate", "rpm_rate")
+STATUS_FIELDS = ("status", "rpm_status", "temp_status")
+
+
+class _ThresholdSet:
+    """Sortierte Ein-/Aus-Schwellen aller 'ueber'-Regeln eines Kanals
+
+    'unter'-Regeln werden mit negiertem Wert auf denselben Fall abgebildet.
+    """
+
+    def __init__(self):
+        self.on: List[tuple] = []    # (schwelle, regel_id)
+        self.off: List[tuple] = []
+        self.last: Optional[float] = None
+
+    def add(self, rule_id: int, on: float, off: float):
+        self.on.append((on, rule_id))
+        self.off.append((off, rule_id))
+
+    def finish(self):
+        self.on.sort()
+        self.off.sort()
+        self.on_values = [v for v, _ in self.on]
+        self.off_values = [v for v, _ in self.off]
+
+    def crossings(self, value: float):
+        """(eingeschaltet, ausgeschaltet) seit dem letzten Wert"""
+        last = self.last
+        self.last = value
+        if last is None:
+            # Erster Wert: alles, was schon über der Einschaltschwelle liegt
+            return self.on[:bisect_right(self.on_values, value)], ()
+        if value > last:
+            lo = bisect_right(self.on_values, last)
+            hi = bisect_right(self.on_values, value)
+            return self.on[lo:hi], ()
+        if value < last:
+            lo = bisect_right(self.off_values, value)
+            hi = bisect_right(self.off_values, last)
+            return (), self.off[lo:hi]
+        return (), ()
+
+
+class AlertEngine:
+    """Wertet kompilierte Regeln inkrementell Sample für Sample aus"""
+
+    def __init__(self, rules: Optional[List[Dict]] = None):
+        self.rules = list(rules if rules is not None else DEFAULT_RULES)
+        self.thresholds: Dict[tuple, _ThresholdSet] = {}
+        self.status_rules: Dict[tuple, List[int]] = {}
+        self._compile()
+
+        n = len(self.rules)
+        self.condition = [False] * n   # Bedingung (mit Hysterese) erfüllt
+        self.active = [False] * n      # Alarm ausgelöst
+        self.generation = [0] * n      # macht veraltete Timer ungültig
+        self._timers: List[tuple] = []
+        self._last_status: Dict[str, Optional[str]] = {f: None for f in STATUS_FIELDS}
+        self._last_values: Dict[str, Optional[tuple]] = {"temp": None, "rpm": None}
+        self._current: Dict[str, object] = {}  # letzter Wert je Kanal/Feld (für Timer-Alarme)
+
+    def _compile(self):
+        """Regeln nach Kanal/Richtung in sortierte Schwellenlisten übersetzen"""
+        for rule_id, rule in enumerate(self.rules):
+            if "feld" in rule:
+                if rule["feld"] not in STATUS_FIELDS:
+                    raise ValueError(f"Regel '{rule['name']}': unbekanntes Feld {rule['feld']}")
+                self.status_rules.setdefault((rule["feld"], rule["wert"]), []).append(rule_id)
+                continue
+
+            channel = rule.get("kanal")
+            if channel not in CHANNELS:
+                raise ValueError(f"Regel '{rule['name']}': unbekannter Kanal {channel}")
+            if "ueber" in rule:
+                on = rule["ueber"]
+                off = rule.get("aus_unter", on)
+                sign = 1
+            elif "unter" in rule:
+                on = -rule["unter"]
+                off = -rule.get("aus_ueber", rule["unter"])
+                sign = -1
+            else:
+                raise ValueError(f"Regel '{rule['name']}': 'ueber' oder 'unter' fehlt")
+            if off > on:
+                raise ValueError(f"Regel '{rule['name']}': Hysterese liegt auf der falschen Seite")
+            self.thresholds.setdefault((channel, sign), _ThresholdSet()).add(rule_id, on, off)
+
+        for threshold_set in self.thresholds.values():
+            threshold_set.finish()
+
+    # ------------------------------------------------------------------
+
+    def _set_condition(self, rule_id: int, met: bool, timestamp: float, value, events: List[Dict]):
+        if self.condition[rule_id] == met:
+            return
+        self.condition[rule_id] = met
+        self.generation[rule_id] += 1
+        rule = self.rules[rule_id]
+        if met:
+            delay = rule.get("dauer_s", 0)
+            if delay > 0:
+                heapq.heappush(self._timers, (timestamp + delay, rule_id, self.generation[rule_id]))
+            else:
+                self._fire(rule_id, timestamp, value, events)
+        elif self.active[rule_id]:
+            self.active[rule_id] = False
+            events.append(self._event(rule_id, "beendet", timestamp, value))
+
+    def _fire(self, rule_id: int, timestamp: float, value, events: List[Dict]):
+        self.active[rule_id] = True
+        events.append(self._event(rule_id, "ausgeloest", timestamp, value))
+
+    def _event(self, rule_id: int, kind: str, timestamp: float, value) -> Dict:
+        rule = self.rules[rule_id]
+        return {"zeit": timestamp, "regel": rule["name"], "stufe": rule.get("stufe", "warnung"),
+                "typ": kind, "wert": value}
+
+    def _update_channel(self, channel: str, value: float, timestamp: float, events: List[Dict]):
+        self._current[channel] = value
+        for sign in (1, -1):
+            threshold_set = self.thresholds.get((channel, sign))
+            if threshold_set is None:
+                continue
+            switched_on, switched_off = threshold_set.crossings(sign * value)
+            for _, rule_id in switched_on:
+                self._set_condition(rule_id, True, timestamp, value, events)
+            for _, rule_id in switched_off:
+                self._set_condition(rule_id, False, timestamp, value, events)
+
+    def process(self, sample: Dict) -> List[Dict]:
+        """Ein Sample (Dict wie von read_sensors + timestamp) auswerten"""
+        events: List[Dict] = []
+        timestamp = sample["timestamp"]
+
+        for field in STATUS_FIELDS:
+            value = sample.get(field)
+            previous = self._last_status[field]
+            if value == previous:
+                continue
+            self._last_status[field] = value
+            self._current[field] = value
+            for rule_id in self.status_rules.get((field, previous), ()):
+                self._set_condition(rule_id, False, timestamp, value, events)
+            for rule_id in self.status_rules.get((field, value), ()):
+                self._set_condition(rule_id, True, timestamp, value, events)
+
+        # Ersatzwerte (last_temp/last_rpm bei Fehlern) nicht als Messung werten
+        connected = sample.get("status") == "connected"
+        valid = {
+            "temp": connected and sample.get("temp_status") == "ok",
+            "rpm": connected,
+        }
+        for channel in ("temp", "rpm"):
+            if not valid[channel]:
+                continue
+            value = sample[channel]
+            self._update_channel(channel, value, timestamp, events)
+
+            last = self._last_values[channel]
+            self._last_values[channel] = (timestamp, value)
+            if last is not None and timestamp > last[0]:
+                rate = (value - last[1]) / (timestamp - last[0])
+                self._update_channel(channel + "_rate", rate, timestamp, events)
+
+        while self._timers and self._timers[0][0] <= timestamp:
+            _, rule_id, generation = heapq.heappop(self._timers)
+            if generation == self.generation[rule_id] and self.condition[rule_id]:
+                rule = self.rules[rule_id]
+                self._fire(rule_id, timestamp, self._current.get(rule.get("kanal", rule.get("feld"))), events)
+
+        return events
+
+    def active_alerts(self) -> List[str]:
+        return [rule["name"] for rule, active in zip(self.rules, self.active) if active]
+
+
+def load_rules(path: str = "zx6r_alerts.json") -> List[Dict]:
+    """Eigene Regeln aus JSON laden, sonst Standardregeln"""
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return DEFAULT_RULES
+
+
+def print_event(event: Dict):
+    """Alarm im Terminal ausgeben (neue Zeile, damit die Live-Anzeige lesbar bleibt)"""
+    icon = "🚨" if event["stufe"] == "kritisch" else "⚠️"
+    if event["typ"] == "beendet":
+        icon = "✅"
+    value = f" ({event['wert']})" if event["wert"] is not None else ""
+    print(f"\n{icon} {event['regel']}: {event['typ']}{value}")
+
+
+def attach_alerts(bus, rules: Optional[List[Dict]] = None,
+                  on_event: Callable[[Dict], None] = print_event):
+    """AlertEngine als Abnehmer am Sample-Bus anmelden und starten"""
+    from sample_bus import Consumer
+
+    engine = AlertEngine(rules if rules is not None else load_rules())
+    # Kleine Stapel, damit ein Alarm spätestens im nächsten Takt kommt
+    subscription = bus.subscribe("alerts", maxsize=1000, policy="block", batch_size=1, block_timeout=0.05)
+
+    def handle(batch):
+        for sample in batch:
+            for event in engine.process(sample):
+                on_event(event)
+
+    consumer = Consumer(subscription, handle)
+    consumer.start()
+    return engine, consumer
+
+
+def evaluate_log(path: str, rules: Optional[List[Dict]] = None) -> List[Dict]:
+    """Regeln auf eine aufgezeichnete Session anwenden"""
+    from session_log import STATUS_NAMES, iter_chunks
+    from status_codes import CONNECTION_NAMES
+
+    engine = AlertEngine(rules if rules is not None else load_rules())
+    events = []
+    for chunk in iter_chunks(path):
+        rpm_status = [STATUS_NAMES[c] for c in chunk["rpm_status"]]
+        temp_status = [STATUS_NAMES[c] for c in chunk["temp_status"]]
+        # Ohne Messung steht der Verbindungsstatus in den Kanal-Status (wie live)
+        status = [CONNECTION_NAMES.get(c, "connected") for c in chunk["rpm_status"].tolist()]
+        for i, timestamp in enumerate(chunk["timestamp"].tolist()):
+            events.extend(engine.process({
+                "timestamp": timestamp,
+                "rpm": float(chunk["rpm"][i]),
+                "temp": float(chunk["temp"][i]),
+                "rpm_status": rpm_status[i],
+                "temp_status": temp_status[i],
+                "status": status[i],
+            }))
+    return events
+
+
+def main():
+    """Aufgezeichnete Sessions prüfen: python alert_rules.py <session.csv> ..."""
+    if len(sys.argv) < 2:
+        print("Aufruf: python alert_rules.py <session.csv> [...]")
+        return
+    for path in sys.argv[1:]:
+        events = evaluate_log(path)
+        print(f"📁 {path}: {sum(e['typ'] == 'ausgeloest' for e in events)} Alarme")
+        for event in events:
+            print_event(event)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+ZX6R Berichte für ein ganzes Wochenende
+Erzeugt ohne Menüs einen Bericht pro Session, einen pro Setup und einen
+Setup-Vergleich – jeweils als eigenständige HTML-Datei (Diagramme als
+eingebettetes SVG) und/oder als Text (Diagramme als Braille-Grafik):
+
+    session_<name>   Kennwerte, Belastung, Runden, Pulls, Drehzahl/Temperatur
+    setup_<name>     Abweichungen zum Serien-Setup (ZX6RApp), Leistung,
+                     Kerzen-Empfehlung (NGKAnalyzer) aus allen Sessions
+    vergleich        Pull-Vergleich aller Setups (erstes = Referenz)
+
+Die Berichte sind unabhängig und werden parallel in einem Prozess-Pool
+erzeugt. Pro Bericht wird ein Hash über die Eingaben (Inhalt der Sessions,
+Setup-Daten, Code-Version) im Manifest gespeichert; unveränderte Berichte
+werden übersprungen.
+
+    python batch_report.py                                   # alle Sessions, aktuelles Setup
+    python batch_report.py Standard: a.csv b.csv Tuning: c.zxl
+    python batch_report.py c.zxl d.zxl                       # nur diese, aktuelles Setup
+"""
+
+import hashlib
+import html
+import importlib
+import inspect
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import tool_paths  # noqa: F401  (ZX6RApp, NGKAnalyzer und terminal_plot)
+import plug_recommendation
+import pull_analysis
+from derived_channels import DerivedStore
+from plug_recommendation import PlugRecommender, profile_session
+from pull_analysis import compare_setups, detect_pulls, summarize_setup
+from segments import SegmentIndex, compare_laps, format_laptime
+from session_log import STATUS_CODES, STATUS_NAMES, find_sessions, load_session
+
+REPORT_DIR = "reports"
+MANIFEST = ".manifest.json"
+FORMATS = ("html", "text")
+PLOT_POINTS = 600           # SVG-Punkte pro Kurve (Min/Max pro Spalte)
+
+# Ein Bericht ist eine Liste von Abschnitten, die beide Ausgabeformate rendern:
+#   {"titel", "werte": [(Name, Wert)]}
+#   {"titel", "tabelle": (Kopfzeile, Zeilen)}
+#   {"titel", "liste": [Text]}
+#   {"titel", "diagramm": {"x", "serien": [(Name, y, Farbe)], "x_label", "y_label"}}
+
+
+# --- Inhalte ---------------------------------------------------------------
+
+def session_report(path: str) -> dict:
+    """Bericht einer Session"""
+    columns = load_session(path)
+    t = columns["timestamp"]
+    sections = []
+    if not len(t):
+        return {"titel": f"Session {os.path.basename(path)}",
+                "abschnitte": [{"titel": "Übersicht", "liste": ["Keine Samples"]}]}
+
+    ok = columns["rpm_status"] == STATUS_CODES["ok"]
+    temp_ok = columns["temp_status"] == STATUS_CODES["ok"]
+    rpm, temp = columns["rpm"][ok], columns["temp"][temp_ok]
+    status_codes, status_counts = np.unique(columns["rpm_status"], return_counts=True)
+    sections.append({"titel": "Übersicht", "werte": [
+        ("Start", datetime.fromtimestamp(float(t[0])).strftime("%d.%m.%Y %H:%M")),
+        ("Dauer", f"{(t[-1] - t[0]) / 60:.1f} min"),
+        ("Samples", f"{len(t):,}"),
+        ("Drehzahl max / Mittel", f"{rpm.max():.0f} / {rpm.mean():.0f} U/min" if len(rpm) else "–"),
+        ("Temperatur min / Mittel / max",
+         f"{temp.min():.1f} / {temp.mean():.1f} / {temp.max():.1f} °C" if len(temp) else "–"),
+        ("Drehzahl-Status", ", ".join(f"{STATUS_NAMES.get(int(c), 'unknown')}: {n}"
+                                      for c, n in zip(status_codes, status_counts))),
+    ]})
+
+    profile = profile_session(path).to_dict()
+    sections.append({"titel": "Belastung", "werte":
+                     [("Fahrzeit", f"{profile['riding_s'] / 60:.1f} min")]
+                     + [(f"über {r} U/min", f"{s / 60:.1f} min") for r, s in profile["rpm_above"].items()]
+                     + [(f"über {c} °C", f"{s / 60:.1f} min") for c, s in profile["temp_above"].items()]
+                     + [(f"Längste Phase > {plug_recommendation.DWELL_RPM}", f"{profile['max_dwell_s']:.0f} s")]})
+
+    index = SegmentIndex().index(path)
+    laps = [s for s in index["segmente"] if s["art"] == "runde"]
+    if laps:
+        best = min(laps, key=lambda lap: lap["dauer"])
+        rows = [[str(lap["runde"]), format_laptime(lap["dauer"]),
+                 "🏆" if lap is best else f"+{compare_laps(lap, best)['dauer']:.1f} s",
+                 f"{lap.get('rpm_max', 0):.0f}", f"{lap.get('zeit_ueber_10000', 0):.1f} s",
+                 f"{lap['temp_start']:.0f} → {lap['temp_ende']:.0f} °C" if "temp_start" in lap else "–"]
+                for lap in laps]
+        sections.append({"titel": f"Runden ({len(laps)})", "tabelle": (
+            ["Runde", "Zeit", "Δ", "U/min max", "> 10000", "Temperatur"], rows)})
+    pits = [s for s in index["segmente"] if s["art"] == "boxenstopp"]
+    if pits:
+        sections.append({"titel": "Boxenstopps", "liste": [
+            f"nach {format_laptime(s['start'])} für {format_laptime(s['dauer'])}" for s in pits]})
+
+    pulls = detect_pulls(columns, source=path)
+    if pulls:
+        fastest = max(pulls, key=lambda p: (p["rpm_bis"] - p["rpm_von"]) / p["dauer"])
+        summary = summarize_setup(pulls)
+        sections.append({"titel": f"Vollgas-Pulls ({len(pulls)})", "werte": [
+            ("Schnellster Pull", f"{fastest['rpm_von']:.0f} → {fastest['rpm_bis']:.0f} U/min "
+                                 f"in {fastest['dauer']:.1f} s"),
+        ] + [(f"Band {band} U/min", f"{seconds:.2f} s" if not np.isnan(seconds) else "–")
+             for band, seconds in summary["band_zeiten"].items()]})
+
+    minutes = (t - t[0]) / 60
+    sections.append({"titel": "Drehzahl", "diagramm": {
+        "x": minutes, "serien": [("RPM", np.where(ok, columns["rpm"], np.nan), "cyan")],
+        "x_label": "min", "y_label": "U/min"}})
+    sections.append({"titel": "Temperatur", "diagramm": {
+        "x": minutes, "serien": [("Temp", np.where(temp_ok, columns["temp"], np.nan), "red")],
+        "x_label": "min", "y_label": "°C"}})
+    return {"titel": f"Session {os.path.basename(path)}", "abschnitte": sections}
+
+
+def setup_report(name: str, paths: List[str], setup: dict) -> dict:
+    """Bericht eines Setups über alle seine Sessions"""
+    sections = []
+    standard, current = setup["standard_setup"], setup["setup"]
+    rows = [[key.capitalize(), standard.get(key, "–"), value, "" if standard.get(key) == value else "≠"]
+            for key, value in current.items()]
+    sections.append({"titel": "Setup", "tabelle": (["", "Serie", name, ""], rows)})
+
+    performance, reference = setup["performance"], setup["standard_performance"]
+    rpms = sorted(int(r) for r in performance)
+    perf_rows = []
+    for rpm in rpms:
+        now, base = performance[str(rpm)], reference[str(rpm)]
+        perf_rows.append([str(rpm), f"{base['leistung']}", f"{now['leistung']}",
+                          f"{now['leistung'] - base['leistung']:+}",
+                          f"{base['drehmoment']}", f"{now['drehmoment']}"])
+    sections.append({"titel": "Leistung (PS) und Drehmoment (Nm)", "tabelle": (
+        ["U/min", "PS Serie", f"PS {name}", "Δ PS", "Nm Serie", f"Nm {name}"], perf_rows)})
+    sections.append({"titel": "Leistungskurve", "diagramm": {
+        "x": np.array(rpms, dtype=np.float64),
+        "serien": [("Serie", np.array([reference[str(r)]["leistung"] for r in rpms], float), "yellow"),
+                   (name, np.array([performance[str(r)]["leistung"] for r in rpms], float), "green")],
+        "x_label": "U/min", "y_label": "PS"}})
+
+    sections.append({"titel": f"Sessions ({len(paths)})", "liste": [os.path.basename(p) for p in paths]})
+    if not paths:
+        return {"titel": f"Setup {name}", "abschnitte": sections}
+
+    profile = profile_session(paths[0])
+    for path in paths[1:]:
+        profile.merge(profile_session(path))
+    plug = setup["setup"].get("zuendkerzen", plug_recommendation.STANDARD_PLUG).split()[0]
+    recommendation = PlugRecommender(state_file=os.devnull, current_plug=plug).recommend(profile)
+    info = recommendation["info"]
+    sections.append({"titel": "Zündkerzen", "werte": [
+        ("Aktuelle Kerze", plug),
+        ("Empfohlener Wärmewert", f"{recommendation['waermewert']} – {info['typ']} ({info['anwendung']})"),
+        ("Begründung", "; ".join(recommendation["gruende"])),
+        ("Kerzen", ", ".join(recommendation["kandidaten"]) or "–"),
+    ]})
+
+    best = SegmentIndex().best_laps(paths)
+    if best:
+        reference_lap = best[0][1]
+        sections.append({"titel": "Beste Runde pro Session", "tabelle": (["Session", "Zeit", "Δ"], [
+            [os.path.basename(path), format_laptime(lap["dauer"]),
+             "🏆" if lap is reference_lap else f"+{compare_laps(lap, reference_lap)['dauer']:.1f} s"]
+            for path, lap in best])})
+    return {"titel": f"Setup {name}", "abschnitte": sections}
+
+
+def comparison_report(setups: Dict[str, List[str]]) -> dict:
+    """Pull-Vergleich aller Setups (erstes = Referenz)"""
+    comparison = compare_setups(setups)
+    grid, results = comparison["raster"], comparison["setups"]
+    names = list(results)
+    fmt = pull_analysis._fmt
+    rows = []
+    for rpm in range(4000, 12001, 1000):
+        i = int(np.searchsorted(grid, rpm))
+        rows.append([str(rpm)] + [fmt(results[n]["rate"][i], ".0f") for n in names]
+                    + [fmt(results[n]["rate_delta_pct"][i], "+.1f") for n in names[1:]])
+    band_rows = [[band] + [fmt(results[n]["band_zeiten"][band], ".2f") for n in names]
+                 + [fmt(results[n]["band_delta_s"][band], "+.2f") for n in names[1:]]
+                 for band in results[names[0]]["band_zeiten"]]
+    deltas = [f"Δ {n}" for n in names[1:]]
+    colors = ("yellow", "green", "cyan", "magenta", "blue")
+    return {"titel": "Setup-Vergleich", "abschnitte": [
+        {"titel": "Pulls", "werte": [(n, str(results[n]["pulls"])) for n in names]},
+        {"titel": "Drehzahlanstieg (U/min pro s)", "tabelle": (["U/min"] + names + [d + " %" for d in deltas], rows)},
+        {"titel": "Anstieg über Drehzahl", "diagramm": {
+            "x": grid, "serien": [(n, results[n]["rate"], colors[i % len(colors)]) for i, n in enumerate(names)],
+            "x_label": "U/min", "y_label": "U/min/s"}},
+        {"titel": "Zeit durch Drehzahlband (s)", "tabelle": (["Band"] + names + [d + " s" for d in deltas], band_rows)},
+        {"titel": "Temperatur", "werte": [
+            (n, f"Start {fmt(results[n]['temp_start'], '.1f')} °C, Anstieg pro Pull "
+                f"{fmt(results[n]['temp_anstieg'], '.1f')} °C") for n in names]},
+    ]}
+
+
+# --- Ausgabe ---------------------------------------------------------------
+
+def _decimate(x: np.ndarray, y: np.ndarray, points: int = PLOT_POINTS):
+    """Min/Max pro Spalte, damit lange Sessions als kleines SVG bleiben"""
+    valid = ~np.isnan(y)
+    x, y = x[valid], y[valid]
+    if len(x) <= points:
+        return x, y
+    edges = np.linspace(0, len(x), points // 2 + 1).astype(np.int64)
+    starts = edges[:-1][np.diff(edges) > 0]
+    low = np.minimum.reduceat(y, starts)
+    high = np.maximum.reduceat(y, starts)
+    return np.repeat(x[starts], 2), np.stack((low, high), axis=1).ravel()
+
+
+SVG_COLORS = {"cyan": "#0aa", "red": "#c33", "yellow": "#c90", "green": "#3a3", "magenta": "#a3a", "blue": "#36c"}
+
+
+def _svg(plot: dict, width: int = 760, height: int = 220) -> str:
+    pad_l, pad_b, pad_t = 56, 28, 10
+    series = [(name, *_decimate(plot["x"], np.asarray(y, dtype=np.float64)), color)
+              for name, y, color in plot["serien"]]
+    series = [s for s in series if len(s[1])]
+    if not series:
+        return "<p>Keine Daten</p>"
+    x_min = min(s[1].min() for s in series)
+    x_max = max(s[1].max() for s in series)
+    y_min = min(s[2].min() for s in series)
+    y_max = max(s[2].max() for s in series)
+    x_span, y_span = (x_max - x_min) or 1, (y_max - y_min) or 1
+    inner_w, inner_h = width - pad_l - 10, height - pad_b - pad_t
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" class="plot">',
+             f'<rect x="{pad_l}" y="{pad_t}" width="{inner_w}" height="{inner_h}" fill="none" stroke="#ccc"/>']
+    for frac in (0, 0.5, 1):
+        y = pad_t + inner_h * (1 - frac)
+        parts.append(f'<text x="{pad_l - 4}" y="{y + 4:.0f}" text-anchor="end">{y_min + frac * y_span:.0f}</text>')
+        x = pad_l + inner_w * frac
+        parts.append(f'<text x="{x:.0f}" y="{height - 8}" text-anchor="middle">{x_min + frac * x_span:.1f}</text>')
+    parts.append(f'<text x="{pad_l + inner_w}" y="{height - 8}" text-anchor="end">{html.escape(plot["x_label"])}</text>')
+    parts.append(f'<text x="4" y="{pad_t + 10}">{html.escape(plot["y_label"])}</text>')
+    for name, x, y, color in series:
+        px = pad_l + (x - x_min) / x_span * inner_w
+        py = pad_t + (y_max - y) / y_span * inner_h
+        points = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(px, py))
+        parts.append(f'<polyline fill="none" stroke="{SVG_COLORS.get(color, "#333")}" stroke-width="1.2" '
+                     f'points="{points}"><title>{html.escape(name)}</title></polyline>')
+    parts.append("</svg>")
+    legend = " ".join(f'<span style="color:{SVG_COLORS.get(color, "#333")}">━━ {html.escape(name)}</span>'
+                      for name, _, _, color in series)
+    return "".join(parts) + f'<div class="legend">{legend}</div>'
+
+
+def render_html(report: dict) -> str:
+    title = html.escape(report["titel"])
+    body = [f"<h1>{title}</h1>", f'<p class="meta">Erstellt {report["erstellt"]}</p>']
+    for section in report["abschnitte"]:
+        body.append(f"<h2>{html.escape(section['titel'])}</h2>")
+        if "werte" in section:
+            body.append("<table>" + "".join(f"<tr><th>{html.escape(k)}</th><td>{html.escape(v)}</td></tr>"
+                                            for k, v in section["werte"]) + "</table>")
+        elif "tabelle" in section:
+            header, rows = section["tabelle"]
+            body.append("<table><tr>" + "".join(f"<th>{html.escape(h)}</th>" for h in header) + "</tr>"
+                        + "".join("<tr>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in row) + "</tr>"
+                                  for row in rows) + "</table>")
+        elif "liste" in section:
+            body.append("<ul>" + "".join(f"<li>{html.escape(item)}</li>" for item in section["liste"]) + "</ul>")
+        elif "diagramm" in section:
+            body.append(_svg(section["diagramm"]))
+    style = ("body{font-family:sans-serif;max-width:820px;margin:2em auto;color:#222}"
+             "table{border-collapse:collapse;margin:.5em 0}th,td{padding:2px 10px;text-align:left;"
+             "border-bottom:1px solid #eee}.meta{color:#888}.plot{width:100%;font-size:11px}"
+             ".legend{font-size:13px;margin-bottom:1em}")
+    return (f'<!DOCTYPE html>\n<html lang="de"><head><meta charset="utf-8"><title>{title}</title>'
+            f"<style>{style}</style></head><body>{''.join(body)}</body></html>\n")
+
+
+def render_text(report: dict) -> str:
+    from terminal_plot import TerminalPlot
+
+    lines = [report["titel"], "=" * len(report["titel"]), f"Erstellt {report['erstellt']}"]
+    for section in report["abschnitte"]:
+        lines += ["", section["titel"], "-" * len(section["titel"])]
+        if "werte" in section:
+            width = max(len(k) for k, _ in section["werte"])
+            lines += [f"  {k:<{width}}  {v}" for k, v in section["werte"]]
+        elif "tabelle" in section:
+            header, rows = section["tabelle"]
+            widths = [max(len(str(c)) for c in column) for column in zip(header, *rows)]
+            for row in [header] + rows:
+                cells = [f"{str(row[0]):<{widths[0]}}"] + [f"{str(c):>{w}}" for c, w in zip(row[1:], widths[1:])]
+                lines.append("  " + "  ".join(cells).rstrip())
+        elif "liste" in section:
+            lines += [f"  • {item}" for item in section["liste"]]
+        elif "diagramm" in section:
+            plot = section["diagramm"]
+            chart = TerminalPlot(width=72, height=10, x_label=plot["x_label"], y_label=plot["y_label"])
+            for name, y, color in plot["serien"]:
+                chart.add_series(plot["x"], y, name, color)
+            lines += chart.render(markup=None)
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = {"html": (render_html, ".html"), "text": (render_text, ".txt")}
+
+
+# --- Ablauf ----------------------------------------------------------------
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "bericht"
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash über den Code aller Module, von denen die Berichte abhängen"""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in (__name__, "tool_paths", "status_codes", "session_log", "compressed_log", "pull_analysis",
+                 "derived_channels", "segments", "plug_recommendation", "ngk_terminal_analyzer", "ngk_search",
+                 "ngk_crossref", "zx6r_app", "terminal_plot"):
+        digest.update(inspect.getsource(importlib.import_module(name)).encode())
+    return digest.hexdigest()
+
+
+def build_report(kind: str, args: tuple, out_base: str, formats: Tuple[str, ...]) -> List[str]:
+    """Einen Bericht erzeugen und in allen Formaten schreiben (läuft im Worker)"""
+    builders = {"session": session_report, "setup": setup_report, "vergleich": comparison_report}
+    report = builders[kind](*args)
+    report["erstellt"] = datetime.now().strftime("%d.%m.%Y %H:%M")
+    written = []
+    for fmt in formats:
+        render, suffix = RENDERERS[fmt]
+        target = out_base + suffix
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(render(report))
+        os.replace(tmp_path, target)
+        written.append(target)
+    return written
+
+
+class ReportBatch:
+    """Alle Berichte eines Laufs, mit Manifest zum Überspringen unveränderter"""
+
+    def __init__(self, out_dir: str = REPORT_DIR, formats: Tuple[str, ...] = FORMATS):
+        self.out_dir = out_dir
+        self.formats = tuple(formats)
+        self.store = DerivedStore()
+        self.manifest_file = os.path.join(out_dir, MANIFEST)
+        self.manifest: Dict[str, str] = {}
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file) as f:
+                self.manifest = json.load(f)
+
+    def _input_hash(self, *parts) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps([code_version(), self.formats, *parts], sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def jobs(self, setups: Dict[str, List[str]], setup_data: Dict[str, dict]) -> List[dict]:
+        """Alle Berichte mit Eingabe-Hash"""
+        sources = {path: self.store.source_hash(path) for paths in setups.values() for path in paths}
+        jobs = []
+        for path in dict.fromkeys(p for paths in setups.values() for p in paths):
+            jobs.append({"name": f"session_{_slug(os.path.splitext(os.path.basename(path))[0])}",
+                         "kind": "session", "args": (path,), "hash": self._input_hash(sources[path])})
+        for name, paths in setups.items():
+            jobs.append({"name": f"setup_{_slug(name)}", "kind": "setup", "args": (name, paths, setup_data[name]),
+                         "hash": self._input_hash(name, [sources[p] for p in paths], setup_data[name])})
+        if len(setups) > 1:
+            jobs.append({"name": "vergleich", "kind": "vergleich", "args": (setups,),
+                         "hash": self._input_hash({n: [sources[p] for p in ps] for n, ps in setups.items()})})
+        self.store._save_hashes()
+        return jobs
+
+    def _is_current(self, job: dict) -> bool:
+        base = os.path.join(self.out_dir, job["name"])
+        return (self.manifest.get(job["name"]) == job["hash"]
+                and all(os.path.exists(base + RENDERERS[f][1]) for f in self.formats))
+
+    def run(self, setups: Dict[str, List[str]], setup_data: Dict[str, dict],
+            workers: Optional[int] = None) -> Tuple[List[str], List[str]]:
+        """Berichte erzeugen → (neu erzeugt, übersprungen)"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        jobs = self.jobs(setups, setup_data)
+        todo = [job for job in jobs if not self._is_current(job)]
+        skipped = [job["name"] for job in jobs if job not in todo]
+
+        def submit(job):
+            return (job["kind"], job["args"], os.path.join(self.out_dir, job["name"]), self.formats)
+
+        if len(todo) <= 1 or workers == 1:
+            for job in todo:
+                build_report(*submit(job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(job, pool.submit(build_report, *submit(job))) for job in todo]
+                for job, future in futures:
+                    future.result()
+        for job in todo:
+            self.manifest[job["name"]] = job["hash"]
+        with open(self.manifest_file, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        self.write_index(jobs)
+        return [job["name"] for job in todo], skipped
+
+    def write_index(self, jobs: List[dict]):
+        links = []
+        for job in jobs:
+            files = " ".join(f'<a href="{html.escape(job["name"] + RENDERERS[f][1])}">{f}</a>' for f in self.formats)
+            links.append(f"<li>{html.escape(job['name'])} – {files}</li>")
+        with open(os.path.join(self.out_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write('<!DOCTYPE html>\n<html lang="de"><head><meta charset="utf-8"><title>ZX6R Berichte</title>'
+                    f"</head><body><h1>ZX6R Berichte</h1><ul>{''.join(links)}</ul></body></html>\n")
+
+
+def load_setup_data(names: List[str]) -> Dict[str, dict]:
+    """Setup-Daten aus ZX6RApp: "Standard" = Serie, alle anderen = aktuelles Tuning"""
+    from zx6r_app import ZX6RApp
+
+    app = ZX6RApp()
+
+    def as_strings(performance):
+        return {str(rpm): values for rpm, values in performance.items()}
+
+    data = {}
+    for name in names:
+        standard = name.lower() in ("standard", "serie")
+        data[name] = {
+            "setup": app.standard_setup if standard else app.tuning_setup,
+            "standard_setup": app.standard_setup,
+            "performance": as_strings(app.standard_performance if standard else app.tuning_performance),
+            "standard_performance": as_strings(app.standard_performance),
+        }
+    return data
+
+
+def main():
+    """Aufruf: python batch_report.py [session ...] [Setup: session ...] [--format html|text] [--workers N]"""
+    args = sys.argv[1:]
+    formats, workers = FORMATS, None
+    if "--format" in args:
+        i = args.index("--format")
+        formats = tuple(args[i + 1].split(","))
+        del args[i:i + 2]
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+
+    # Sessions vor dem ersten "Setup:" gehören zum aktuellen Tuning
+    setups: Dict[str, List[str]] = {}
+    current = "Tuning"
+    for arg in args:
+        if arg.endswith(":"):
+            current = arg[:-1]
+            setups.setdefault(current, [])
+        else:
+            setups.setdefault(current, []).append(arg)
+    if not setups:
+        sessions = find_sessions(".")
+        if not sessions:
+            print("📭 Keine Sessions gefunden")
+            return
+        setups = {"Tuning": sessions}
+
+    start = datetime.now()
+    batch = ReportBatch(formats=formats)
+    built, skipped = batch.run(setups, load_setup_data(list(setups)), workers)
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"📄 {len(built)} Berichte erzeugt, {len(skipped)} unverändert ({elapsed:.1f} s)")
+    print(f"📁 {os.path.join(batch.out_dir, 'index.html')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+ZX6R komprimiertes Log-Format (.zxl)
+Für lange Aufzeichnungen auf SD-Karte statt CSV.
+
+Aufbau:
+    Datei   = "ZXL1" | Block* | Index | Trailer
+    Block   = Kopf (Anzahl, erster Zeitstempel, Stream-Längen) | zlib(Streams)
+    Streams = Zeitstempel   (ms, Delta-vom-Delta, Zig-Zag-Varint)
+              RPM           (Delta, Zig-Zag-Varint)
+              Temperatur    (0.1°C, Delta, Zig-Zag-Varint)
+              rpm_status    (Lauflänge: Codes…, Längen…)
+              temp_status   (Lauflänge)
+    Index   = (Offset, erster Zeitstempel, Anzahl) je Block
+
+Jeder Block ist für sich dekodierbar, über den Index kann direkt zu einer
+Uhrzeit gesprungen werden. Fehlt der Index (Stromausfall), werden die Blöcke
+beim Öffnen einmal durchlaufen. Kodierung und Dekodierung sind vektorisiert;
+der Decoder liefert dieselben Spalten-Arrays wie session_log.iter_chunks().
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from session_log import COLUMNS, STATUS_CODES, iter_chunks
+
+FILE_MAGIC = b"ZXL1"
+BLOCK_MAGIC = b"BLK1"
+INDEX_MAGIC = b"ZXLI"
+# Magic, Anzahl, erster Zeitstempel (ms), 5 Stream-Längen, komprimierte Länge
+BLOCK_HEADER = struct.Struct("<4sIq5II")
+INDEX_ENTRY = struct.Struct("<QqI")
+TRAILER = struct.Struct("<QI4s")   # Index-Offset, Anzahl Blöcke, Magic
+
+
+# ----------------------------------------------------------------------
+# Vektorisierte Varint-/Zig-Zag-Kodierung
+# ----------------------------------------------------------------------
+
+def zigzag_encode(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def zigzag_decode(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)).astype(np.int64)) ^ -((values & np.uint64(1)).astype(np.int64))
+
+
+def varint_encode(values: np.ndarray) -> bytes:
+    """LEB128 für ein Array vorzeichenloser Werte"""
+    values = np.asarray(values, dtype=np.uint64)
+    if not len(values):
+        return b""
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        lengths += values >= np.uint64(1 << (7 * k))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        mask = lengths > k
+        part = (values[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[mask] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[mask] + k] = (part | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def varint_decode(data: bytes) -> np.ndarray:
+    """Umkehrung von varint_encode"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return np.zeros(0, dtype=np.uint64)
+    last = (raw & 0x80) == 0
+    # Nummer des Werts, zu dem jedes Byte gehört, und Position darin
+    value_id = np.concatenate(([0], np.cumsum(last)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    position = np.arange(len(raw)) - starts[value_id]
+    parts = (raw & 0x7F).astype(np.uint64) << (np.uint64(7) * position.astype(np.uint64))
+    return np.add.reduceat(parts, starts)
+
+
+def _rle_encode(codes: np.ndarray) -> bytes:
+    if not len(codes):
+        return b""
+    change = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], change))
+    lengths = np.diff(np.concatenate((starts, [len(codes)])))
+    return varint_encode(np.concatenate((codes[starts].astype(np.uint64), lengths.astype(np.uint64))))
+
+
+def _rle_decode(data: bytes) -> np.ndarray:
+    values = varint_decode(data)
+    half = len(values) // 2
+    return np.repeat(values[:half].astype(np.uint8), values[half:].astype(np.int64))
+
+
+def encode_block(chunk: Dict[str, np.ndarray], level: int = 6) -> bytes:
+    """Ein Block aus Spalten-Arrays (Format wie session_log)"""
+    ts_ms = np.round(np.asarray(chunk["timestamp"], dtype=np.float64) * 1000).astype(np.int64)
+    first = int(ts_ms[0])
+    # Delta vom Delta: bei festem Takt fast nur Nullen
+    deltas = np.diff(ts_ms, prepend=first)
+    dod = np.diff(deltas, prepend=0)
+    rpm = np.round(np.asarray(chunk["rpm"])).astype(np.int64)
+    temp = np.round(np.asarray(chunk["temp"], dtype=np.float64) * 10).astype(np.int64)
+
+    streams = [
+        varint_encode(zigzag_encode(dod)),
+        varint_encode(zigzag_encode(np.diff(rpm, prepend=0))),
+        varint_encode(zigzag_encode(np.diff(temp, prepend=0))),
+        _rle_encode(np.asarray(chunk["rpm_status"], dtype=np.uint8)),
+        _rle_encode(np.asarray(chunk["temp_status"], dtype=np.uint8)),
+    ]
+    payload = zlib.compress(b"".join(streams), level)
+    header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(ts_ms), first, *(len(s) for s in streams), len(payload))
+    return header + payload
+
+
+def decode_block(header: Tuple, payload: bytes) -> Dict[str, np.ndarray]:
+    """Block wieder in Spalten-Arrays"""
+    _magic, _count, first, *lengths, _size = header
+    raw = zlib.decompress(payload)
+    streams = []
+    pos = 0
+    for length in lengths:
+        streams.append(raw[pos:pos + length])
+        pos += length
+
+    dod = zigzag_decode(varint_decode(streams[0]))
+    ts_ms = first + np.cumsum(np.cumsum(dod))
+    return {
+        "timestamp": ts_ms / 1000.0,
+        "rpm": np.cumsum(zigzag_decode(varint_decode(streams[1]))).astype(np.float32),
+        "temp": (np.cumsum(zigzag_decode(varint_decode(streams[2]))) / 10.0).astype(np.float32),
+        "rpm_status": _rle_decode(streams[3]),
+        "temp_status": _rle_decode(streams[4]),
+    }
+
+
+# ----------------------------------------------------------------------
+# Writer / Reader
+# ----------------------------------------------------------------------
+
+class CompressedLogWriter:
+    """Schreibt Samples blockweise; ein Block ist spätestens nach block_seconds auf der Karte"""
+
+    def __init__(self, path: str, block_size: int = 4096, block_seconds: float = 30.0, level: int = 6):
+        self.path = path
+        self.block_size = block_size
+        self.block_seconds = block_seconds
+        self.level = level
+        self.index: List[Tuple[int, int, int]] = []
+        self._rows = {name: [] for name in COLUMNS}
+        self._block_started = None
+        self._file = open(path, "wb")
+        self._file.write(FILE_MAGIC)
+
+    def write_samples(self, samples: List[Dict]):
+        """Samples von read_sensors() (SampleRecord oder Dict, mit timestamp) anhängen"""
+        from sample_record import SampleRecord
+
+        unknown = STATUS_CODES["unknown"]
+        rows = self._rows
+        for d in samples:
+            if isinstance(d, SampleRecord):
+                # Status liegen schon als Code vor
+                rows["timestamp"].append(d.timestamp)
+                rows["rpm"].append(d.rpm)
+                rows["temp"].append(d.temp)
+                rows["rpm_status"].append(d.rpm_status)
+                rows["temp_status"].append(d.temp_status)
+                continue
+            rows["timestamp"].append(d["timestamp"])
+            rows["rpm"].append(d["rpm"])
+            rows["temp"].append(d["temp"])
+            rows["rpm_status"].append(STATUS_CODES.get(d.get("rpm_status", d.get("status")), unknown))
+            rows["temp_status"].append(STATUS_CODES.get(d.get("temp_status", d.get("status")), unknown))
+        if self._block_started is None and samples:
+            self._block_started = time.monotonic()
+        if (len(rows["timestamp"]) >= self.block_size
+                or (self._block_started is not None
+                    and time.monotonic() - self._block_started >= self.block_seconds)):
+            self.flush()
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        """Spalten-Arrays direkt als Block(e) schreiben (z.B. beim Umwandeln von CSV)"""
+        self.flush()
+        for start in range(0, len(chunk["timestamp"]), self.block_size):
+            self._write_block({name: chunk[name][start:start + self.block_size] for name in COLUMNS})
+
+    def flush(self):
+        """Gepufferte Samples als Block schreiben"""
+        if not self._rows["timestamp"]:
+            return
+        rows = self._rows
+        chunk = {
+            "timestamp": np.asarray(rows["timestamp"], dtype=np.float64),
+            "rpm": np.asarray(rows["rpm"], dtype=np.float64),
+            "temp": np.asarray(rows["temp"], dtype=np.float64),
+            "rpm_status": np.asarray(rows["rpm_status"], dtype=np.uint8),
+            "temp_status": np.asarray(rows["temp_status"], dtype=np.uint8),
+        }
+        self._rows = {name: [] for name in COLUMNS}
+        self._block_started = None
+        self._write_block(chunk)
+
+    def _write_block(self, chunk: Dict[str, np.ndarray]):
+        if not len(chunk["timestamp"]):
+            return
+        offset = self._file.tell()
+        block = encode_block(chunk, self.level)
+        self._file.write(block)
+        self._file.flush()
+        self.index.append((offset, int(round(chunk["timestamp"][0] * 1000)), len(chunk["timestamp"])))
+
+    def close(self):
+        """Letzten Block, Index und Trailer schreiben"""
+        if self._file.closed:
+            return
+        self.flush()
+        index_offset = self._file.tell()
+        for entry in self.index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(TRAILER.pack(index_offset, len(self.index), INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CompressedLogReader:
+    """Wahlfreier Zugriff auf die Blöcke einer .zxl-Datei"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        if self._file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"{path}: keine ZXL-Datei")
+        self.index = self._read_index() or self._scan_blocks()
+        self.start_times = [first for _, first, _ in self.index]
+
+    def _read_index(self) -> Optional[List[Tuple[int, int, int]]]:
+        size = os.path.getsize(self.path)
+        if size < len(FILE_MAGIC) + TRAILER.size:
+            return None
+        self._file.seek(size - TRAILER.size)
+        index_offset, count, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != INDEX_MAGIC:
+            return None
+        self._file.seek(index_offset)
+        data = self._file.read(count * INDEX_ENTRY.size)
+        return [INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size) for i in range(count)]
+
+    def _scan_blocks(self) -> List[Tuple[int, int, int]]:
+        """Index aus den Blockköpfen rekonstruieren (Datei nicht sauber geschlossen)"""
+        index = []
+        offset = len(FILE_MAGIC)
+        self._file.seek(offset)
+        while True:
+            head = self._file.read(BLOCK_HEADER.size)
+            if len(head) < BLOCK_HEADER.size:
+                break
+            header = BLOCK_HEADER.unpack(head)
+            if header[0] != BLOCK_MAGIC:
+                break
+            size = header[-1]
+            if len(self._file.read(size)) < size:
+                break  # abgeschnittener letzter Block
+            index.append((offset, header[2], header[1]))
+            offset += BLOCK_HEADER.size + size
+        return index
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(count for _, _, count in self.index)
+
+    def read_block(self, i: int) -> Dict[str, np.ndarray]:
+        offset = self.index[i][0]
+        self._file.seek(offset)
+        header = BLOCK_HEADER.unpack(self._file.read(BLOCK_HEADER.size))
+        return decode_block(header, self._file.read(header[-1]))
+
+    def block_at(self, timestamp: float) -> int:
+        """Nummer des Blocks, der den Zeitpunkt enthält"""
+        return max(0, bisect_right(self.start_times, int(round(timestamp * 1000))) - 1)
+
+    def iter_blocks(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Blöcke (optional nur im Zeitfenster [start, end]) als Spalten-Arrays"""
+        first = self.block_at(start) if start is not None else 0
+        for i in range(first, len(self.index)):
+            if end is not None and self.index[i][1] > end * 1000:
+                break
+            chunk = self.read_block(i)
+            if start is not None or end is not None:
+                # Vergleich in gespeicherter Auflösung (ms)
+                t_ms = np.round(chunk["timestamp"] * 1000)
+                mask = np.ones(len(t_ms), dtype=bool)
+                if start is not None:
+                    mask &= t_ms >= round(start * 1000)
+                if end is not None:
+                    mask &= t_ms <= round(end * 1000)
+                chunk = {name: values[mask] for name, values in chunk.items()}
+            yield chunk
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_csv(csv_path: str, zxl_path: Optional[str] = None) -> str:
+    """Vorhandenes CSV-Log in .zxl umwandeln"""
+    zxl_path = zxl_path or os.path.splitext(csv_path)[0] + ".zxl"
+    with CompressedLogWriter(zxl_path) as writer:
+        for chunk in iter_chunks(csv_path):
+            writer.write_chunk(chunk)
+    return zxl_path
+
+
+def main():
+    """CSV-Logs umwandeln: python compressed_log.py <session.csv> ..."""
+    if len(sys.argv) < 2:
+        print("Aufruf: python compressed_log.py <session.csv> [...]")
+        return
+    for path in sys.argv[1:]:
+        target = convert_csv(path)
+        before, after = os.path.getsize(path), os.path.getsize(target)
+        print(f"📦 {path} → {target}: {before / 1e6:.2f} MB → {after / 1e6:.2f} MB ({before / max(after, 1):.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ ESP32 Code für Temperatur + RPM Messung
 */
 
 #include <WiFi.h>
+#include <WiFiUdp.h>
 #include <math.h>
 
 // Pin-Definitionen
@@ -30,6 +31,37 @@ const float NOMINAL_RESISTANCE = 2500.0; // NTC bei 25°C
 const float NOMINAL_TEMPERATURE = 25.0;
 const float B_COEFFICIENT = 3977.0;     // NTC B-Wert (typisch für Motorrad)
 
+// Store-and-Forward: Ringpuffer im RAM, wird per DUMP am Stück ausgelesen
+// 12000 Samples x 8 Byte = 96 KB = 20 min bei 10 Hz, danach älteste überschreiben
+struct Sample {
+  uint32_t ms;       // millis() bei der Messung
+  uint16_t rpm;
+  int16_t temp10;    // Temperatur in 0.1°C (Fehlercodes -9990/-8880/-7770)
+};
+#define BUFFER_SIZE 12000
+Sample sampleBuffer[BUFFER_SIZE];
+uint32_t bufferHead = 0;    // nächster Schreibplatz
+uint32_t bufferCount = 0;
+
+// WLAN-Telemetrie: Samples stapelweise per UDP an den Laptop
+// Datagramm: "SEQ:<n>,BOOT:<id>" + je Sample eine Zeile "MS:..,RPM:..,TEMP:.."
+// BOOT ist pro Start zufällig, daran erkennt Python den Neustart (SEQ beginnt bei 0)
+const char* WIFI_SSID = "ZX6R-Box";
+const char* WIFI_PASSWORD = "zx6r1998";
+const IPAddress TELEMETRY_HOST(192, 168, 4, 2);
+const uint16_t TELEMETRY_PORT = 4210;
+#define UDP_BATCH 5               // 5 Samples = 1 Datagramm alle 500 ms
+WiFiUDP udp;
+uint32_t udpSequence = 0;
+uint32_t udpBootId = 0;
+uint8_t udpBatchCount = 0;
+char udpBatch[UDP_BATCH * 48 + 32];   // + Kopf "SEQ:..,BOOT:.."
+size_t udpBatchLength = 0;
+
+// Befehlszeile von Serial (nicht blockierend gesammelt)
+String commandLine = "";
+float lastTemperature = 0;
+
 void setup() {
   Serial.begin(115200);
   
@@ -45,6 +77,11 @@ void setup() {
   analogReadResolution(12);  // 12-Bit ADC
   analogSetAttenuation(ADC_11db);  // 0-3.3V Bereich
   
+  // WLAN verbindet im Hintergrund, USB funktioniert auch ohne
+  udpBootId = esp_random();
+  WiFi.mode(WIFI_STA);
+  WiFi.begin(WIFI_SSID, WIFI_PASSWORD);
+  
   Serial.println("ZX6R Original-Sensor Logger gestartet");
   Serial.println("Temperatur: ADC Pin 34");
   Serial.println("RPM: Interrupt Pin 2");
@@ -64,13 +101,10 @@ void loop() {
     // Status-LED blinken
     digitalWrite(LED_PIN, !digitalRead(LED_PIN));
     
-    // Daten über Serial senden (für Python-Script)
-    if (Serial.available() && Serial.readString().indexOf("READ") >= 0) {
-      Serial.print("RPM:");
-      Serial.print((int)currentRPM);
-      Serial.print(",TEMP:");
-      Serial.println(temperature, 1);
-    }
+    // Jede Messung puffern, auch wenn gerade niemand fragt
+    lastTemperature = temperature;
+    storeSample(millis(), currentRPM, temperature);
+    queueUdpSample(millis(), currentRPM, temperature);
     
     // Debug-Ausgabe
     if (millis() % 1000 < 100) {  // Jede Sekunde
@@ -83,6 +117,80 @@ void loop() {
     
     lastRead = millis();
   }
+
+  // Befehle vom Python-Script: READ, DUMP, CLEAR
+  while (Serial.available()) {
+    char c = Serial.read();
+    if (c == '\\n') {
+      handleCommand(commandLine);
+      commandLine = "";
+    } else if (c != '\\r' && commandLine.length() < 32) {
+      commandLine += c;
+    }
+  }
+}
+
+void handleCommand(String command) {
+  if (command.indexOf("READ") >= 0) {
+    // Daten über Serial senden (für Python-Script)
+    Serial.print("RPM:");
+    Serial.print((int)currentRPM);
+    Serial.print(",TEMP:");
+    Serial.println(lastTemperature, 1);
+  } else if (command.indexOf("DUMP") >= 0) {
+    dumpBuffer();
+  } else if (command.indexOf("CLEAR") >= 0) {
+    bufferCount = 0;
+    Serial.println("OK:CLEAR");
+  }
+}
+
+void storeSample(unsigned long ms, float rpm, float temperature) {
+  Sample &s = sampleBuffer[bufferHead];
+  s.ms = ms;
+  s.rpm = (uint16_t)rpm;
+  s.temp10 = (int16_t)lroundf(temperature * 10.0);
+  bufferHead = (bufferHead + 1) % BUFFER_SIZE;
+  if (bufferCount < BUFFER_SIZE) bufferCount++;
+}
+
+void queueUdpSample(unsigned long ms, float rpm, float temperature) {
+  if (udpBatchCount == 0) {
+    udpBatchLength = snprintf(udpBatch, sizeof(udpBatch), "SEQ:%lu,BOOT:%08lx",
+                              (unsigned long)udpSequence, (unsigned long)udpBootId);
+  }
+  udpBatchLength += snprintf(udpBatch + udpBatchLength, sizeof(udpBatch) - udpBatchLength,
+                             "\\nMS:%lu,RPM:%d,TEMP:%.1f", ms, (int)rpm, temperature);
+  if (++udpBatchCount < UDP_BATCH) return;
+
+  // Stapel voll: senden (ohne WLAN verworfen, der Ringpuffer hat alles)
+  if (WiFi.status() == WL_CONNECTED) {
+    udp.beginPacket(TELEMETRY_HOST, TELEMETRY_PORT);
+    udp.write((const uint8_t *)udpBatch, udpBatchLength);
+    udp.endPacket();
+  }
+  udpSequence++;   // auch ohne Senden zählen, damit Python die Lücke sieht
+  udpBatchCount = 0;
+}
+
+void dumpBuffer() {
+  // Kopf: Anzahl und aktuelle millis() (Python rechnet damit auf Uhrzeit um)
+  uint32_t count = bufferCount;
+  uint32_t start = (bufferHead + BUFFER_SIZE - count) % BUFFER_SIZE;
+  Serial.print("DUMP:");
+  Serial.print(count);
+  Serial.print(",");
+  Serial.println(millis());
+
+  // Binär am Stück, älteste zuerst; Prüfsumme = Summe aller Bytes
+  uint32_t checksum = 0;
+  for (uint32_t i = 0; i < count; i++) {
+    const uint8_t *bytes = (const uint8_t *)&sampleBuffer[(start + i) % BUFFER_SIZE];
+    Serial.write(bytes, sizeof(Sample));
+    for (uint8_t b = 0; b < sizeof(Sample); b++) checksum += bytes[b];
+  }
+  Serial.print("END:");
+  Serial.println(checksum);
 }
 
 void rpmPulseISR() {
@@ -147,34 +255,42 @@ float readOriginalTempSensor() {
 }
 '''
 
-import serial
 import time
 import json
 import math
 from datetime import datetime
 
+from sample_record import SampleRecord
+from status_codes import CONNECTION_CODES, STATUS_CODES
+
+OK, IDLE_OR_ERROR, SENSOR_ERROR = STATUS_CODES["ok"], STATUS_CODES["idle_or_error"], STATUS_CODES["sensor_error"]
+CONNECTED, DISCONNECTED = CONNECTION_CODES["connected"], CONNECTION_CODES["disconnected"]
+PARSE_ERROR, READ_ERROR = CONNECTION_CODES["parse_error"], CONNECTION_CODES["read_error"]
+
 class OriginalSensorReader:
     """Liest Original ZX6R Sensoren über ESP32"""
     
-    def __init__(self, serial_port="/dev/ttyUSB0", baudrate=115200):
+    def __init__(self, serial_port="/dev/ttyUSB0", baudrate=115200, transport=None):
         self.serial_port = serial_port
         self.baudrate = baudrate
+        self.transport = transport  # None = SerialTransport, sonst z.B. UdpTransport (transports.py)
         self.connection = None
         self.last_temp = 0
         self.last_rpm = 0
+        self.keep_raw_response = False  # Antwortzeile im Sample behalten (nur zur Fehlersuche)
         
         self.connect()
     
     def connect(self):
         """Verbinde zu ESP32"""
         try:
-            self.connection = serial.Serial(
-                self.serial_port, 
-                self.baudrate, 
-                timeout=2
-            )
-            time.sleep(3)  # ESP32 Boot-Zeit
-            print("✅ ESP32 Original-Sensor Reader verbunden")
+            if self.transport is None:
+                from transports import SerialTransport
+                self.transport = SerialTransport(self.serial_port, self.baudrate, timeout=2)
+                time.sleep(3)  # ESP32 Boot-Zeit
+            # Rohzugriff (DUMP/CLEAR) gibt es nur über USB
+            self.connection = self.transport.connection
+            print(f"✅ ESP32 Original-Sensor Reader verbunden ({type(self.transport).__name__})")
             
             # Test-Abfrage
             test_data = self.read_sensors()
@@ -184,18 +300,18 @@ class OriginalSensorReader:
             print(f"❌ ESP32 Verbindung fehlgeschlagen: {e}")
             print("💡 Prüfe USB-Kabel und Port")
     
-    def read_sensors(self) -> dict:
-        """Lese Original-Sensoren"""
-        if not self.connection:
-            return {"rpm": self.last_rpm, "temp": self.last_temp, "status": "disconnected"}
+    def read_sensors(self) -> SampleRecord:
+        """Lese Original-Sensoren
+
+        Liefert einen SampleRecord (sample_record.py), der sich beim Lesen
+        wie das frühere Dict verhält: sample["rpm"], sample.get("temp_status").
+        """
+        if not self.transport:
+            return SampleRecord(self.last_rpm, self.last_temp, DISCONNECTED)
         
         try:
-            # Anfrage senden
-            self.connection.write(b"READ\n")
-            self.connection.flush()
-            
-            # Antwort lesen (Timeout 2s)
-            response = self.connection.readline().decode().strip()
+            # Antwort über USB (READ) oder WLAN (nächstes Sample), Timeout 2s
+            response = self.transport.request_line()
             
             if response and "RPM:" in response and "TEMP:" in response:
                 # Parse Response: "RPM:5500,TEMP:85.5"
@@ -209,69 +325,221 @@ class OriginalSensorReader:
                 
                 # Fehler-Codes prüfen
                 if temp < -500:
-                    temp_status = "sensor_error"
+                    temp_status = SENSOR_ERROR
                     temp = self.last_temp  # Letzten gültigen Wert verwenden
                 else:
-                    temp_status = "ok"
+                    temp_status = OK
                     self.last_temp = temp
                 
                 if rpm < 500:
-                    rpm_status = "idle_or_error"
+                    rpm_status = IDLE_OR_ERROR
                 else:
-                    rpm_status = "ok"
+                    rpm_status = OK
                     self.last_rpm = rpm
                 
-                return {
-                    "rpm": rpm,
-                    "temp": temp,
-                    "rpm_status": rpm_status,
-                    "temp_status": temp_status,
-                    "status": "connected",
-                    "raw_response": response
-                }
+                # WLAN: Messzeit aus MS (Laptop-Uhr), USB: setzt die AcquisitionPump
+                return SampleRecord(rpm, temp, CONNECTED, rpm_status, temp_status,
+                                    timestamp=getattr(self.transport, "line_time", None),
+                                    raw_response=response if self.keep_raw_response else None)
             
             else:
                 print(f"⚠️ Unerwartete Antwort: {response}")
-                return {"rpm": self.last_rpm, "temp": self.last_temp, "status": "parse_error"}
+                return SampleRecord(self.last_rpm, self.last_temp, PARSE_ERROR)
                 
         except Exception as e:
             print(f"❌ Sensor-Lesefehler: {e}")
-            return {"rpm": self.last_rpm, "temp": self.last_temp, "status": "read_error"}
+            return SampleRecord(self.last_rpm, self.last_temp, READ_ERROR)
     
-    def start_continuous_logging(self, duration_minutes=10):
-        """Starte kontinuierliche Aufzeichnung"""
-        
-        log_file = f"zx6r_original_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    def download_backlog(self, clear=True):
+        """Ringpuffer des ESP32 per DUMP am Stück herunterladen
+
+        Liefert Spalten-Arrays wie session_log (Zeitstempel auf Host-Uhrzeit
+        umgerechnet) oder None, wenn nichts kam. Nur aufrufen, wenn gerade
+        nicht geloggt wird – sonst teilen sich zwei Abfragen die Schnittstelle.
+        """
+        import numpy as np
+        from session_log import STATUS_CODES
+
+        if not self.connection:
+            return None
+
+        self.connection.reset_input_buffer()
+        self.connection.write(b"DUMP\n")
+        self.connection.flush()
+
+        # Debug-Zeilen der Firmware bis zum Kopf überspringen
+        deadline = time.time() + 5
+        header = b""
+        while time.time() < deadline:
+            header = self.connection.readline()
+            if header.startswith(b"DUMP:"):
+                break
+        else:
+            print("❌ ESP32 antwortet nicht auf DUMP")
+            return None
+        host_now = time.time()
+        count, device_now = (int(v) for v in header[5:].decode().strip().split(","))
+
+        sample_dtype = np.dtype([("ms", "<u4"), ("rpm", "<u2"), ("temp10", "<i2")])
+        expected = count * sample_dtype.itemsize
+        raw = bytearray()
+        while len(raw) < expected:
+            chunk = self.connection.read(expected - len(raw))
+            if not chunk:
+                print(f"❌ Download abgebrochen ({len(raw)}/{expected} Bytes)")
+                return None
+            raw.extend(chunk)
+
+        trailer = self.connection.readline().decode(errors="replace").strip()
+        if trailer != f"END:{sum(raw) & 0xFFFFFFFF}":
+            print(f"❌ Prüfsumme falsch ({trailer})")
+            return None
+        if clear:
+            self.connection.write(b"CLEAR\n")
+            self.connection.flush()
+
+        records = np.frombuffer(bytes(raw), dtype=sample_dtype)
+        # millis() läuft nach 49 Tagen über – Differenz modulo 2^32 rechnen
+        age_ms = (np.uint32(device_now) - records["ms"]).astype(np.float64)
+        temp = records["temp10"] / 10.0
+        rpm = records["rpm"].astype(np.float32)
+
+        # Fehlercodes wie in read_sensors(): letzten gültigen Wert weiterführen
+        temp_error = temp < -500
+        valid_index = np.where(~temp_error, np.arange(len(temp)), 0)
+        np.maximum.accumulate(valid_index, out=valid_index)
+        temp = np.where(temp_error, temp[valid_index], temp)
+        temp[temp < -500] = self.last_temp
+
+        return {
+            "timestamp": host_now - age_ms / 1000.0,
+            "rpm": rpm,
+            "temp": temp.astype(np.float32),
+            "rpm_status": np.where(rpm < 500, STATUS_CODES["idle_or_error"], STATUS_CODES["ok"]).astype(np.uint8),
+            "temp_status": np.where(temp_error, STATUS_CODES["sensor_error"], STATUS_CODES["ok"]).astype(np.uint8),
+        }
+
+    def sync_backlog(self, log_file=None, min_gap=0.15):
+        """Puffer herunterladen und in eine Session einfügen
+
+        Ohne log_file wird eine neue Session angelegt (Fahrt ohne Laptop).
+        Mit log_file werden nur Samples übernommen, die in Lücken der
+        vorhandenen Aufzeichnung fallen (weiter als min_gap Sekunden von
+        jedem vorhandenen Sample entfernt); das Ergebnis ist nach Zeit sortiert.
+        """
+        import numpy as np
+        from session_log import COLUMNS, load_session, save_session
+
+        start = time.time()
+        backlog = self.download_backlog()
+        if backlog is None or not len(backlog["timestamp"]):
+            print("📭 Kein Puffer auf dem ESP32")
+            return log_file
+        print(f"📥 {len(backlog['timestamp'])} Samples in {time.time() - start:.1f} s geladen")
+
+        if log_file is None:
+            first = datetime.fromtimestamp(float(backlog["timestamp"][0]))
+            log_file = f"zx6r_original_{first.strftime('%Y%m%d_%H%M%S')}.csv"
+            save_session(log_file, backlog)
+            print(f"📁 Neue Session: {log_file}")
+            return log_file
+
+        existing = load_session(log_file)
+        known = existing["timestamp"]
+        if len(known):
+            pos = np.searchsorted(known, backlog["timestamp"])
+            before = np.abs(backlog["timestamp"] - known[np.clip(pos - 1, 0, len(known) - 1)])
+            after = np.abs(known[np.clip(pos, 0, len(known) - 1)] - backlog["timestamp"])
+            keep = np.minimum(before, after) > min_gap
+        else:
+            keep = np.ones(len(backlog["timestamp"]), dtype=bool)
+
+        merged = {name: np.concatenate([existing[name], backlog[name][keep]]) for name in COLUMNS}
+        order = np.argsort(merged["timestamp"], kind="stable")
+        save_session(log_file, {name: values[order] for name, values in merged.items()})
+        print(f"📁 {int(keep.sum())} Samples in {log_file} ergänzt")
+        return log_file
+
+    def start_continuous_logging(self, duration_minutes=10, bus=None, log_format="csv", conditioner=None,
+                                 interval=0.1, ring=None):
+        """Starte kontinuierliche Aufzeichnung
+
+        Erfassung, Live-Anzeige und Log-Writer hängen getrennt am Sample-Bus.
+        Über einen eigenen bus können weitere Abnehmer (Alarme, Analyse,
+        Server) angemeldet werden, bevor die Aufzeichnung startet.
+        log_format="zxl" schreibt komprimiert (siehe compressed_log.py).
+        Mit conditioner (signal_conditioning.SignalConditioner) bekommt die
+        CSV zusätzlich gefilterte Kanäle und Qualität; .zxl speichert nur
+        die Rohwerte (nachträglich mit condition_columns() berechenbar).
+        interval ist der Abfragetakt (0.1 = 10 Hz; 0 = so schnell wie möglich,
+        für Benchmarks). Mit ring (sample_ring.SampleRing) stehen die
+        letzten Samples zusätzlich als Arrays für Anzeigen bereit.
+        """
+        from sample_bus import AcquisitionPump, Consumer, SampleBus
+
+        log_file = f"zx6r_original_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{log_format}"
         
         print(f"📊 Starte Original-Sensor Logging: {duration_minutes} min")
         print(f"📁 Datei: {log_file}")
         
-        # CSV Header
-        with open(log_file, 'w') as f:
-            f.write("timestamp,rpm,temp,rpm_status,temp_status\n")
-        
-        start_time = time.time()
-        end_time = start_time + (duration_minutes * 60)
-        
+        bus = bus or SampleBus()
+        # Writer bekommt eine Stunde Puffer (10 Hz), hängt er länger, werden neue
+        # Samples verworfen und gezählt – die Erfassung wartet nie auf ihn.
+        # Die Anzeige braucht nur das neueste Sample.
+        writer_sub = bus.subscribe("log", maxsize=36000, policy="drop_newest", batch_size=50)
+        display_sub = bus.subscribe("display", maxsize=10, policy="drop_oldest", batch_size=10)
+
+        if log_format == "zxl":
+            from compressed_log import CompressedLogWriter
+            log_writer = CompressedLogWriter(log_file)
+            write_batch = log_writer.write_samples
+            close_log = log_writer.close
+        else:
+            csv_file = open(log_file, 'w')
+            extra_columns = ("rpm_filt", "temp_filt", "rpm_quality", "temp_quality") if conditioner else ()
+            csv_file.write(",".join(("timestamp", "rpm", "temp", "rpm_status", "temp_status") + extra_columns) + "\n")
+            close_log = csv_file.close
+
+            def write_batch(batch):
+                csv_file.writelines(
+                    f"{d['timestamp']},{d['rpm']},{d['temp']},"
+                    f"{d.get('rpm_status', d['status'])},{d.get('temp_status', d['status'])}"
+                    + "".join(f",{'' if d.get(c) is None else d[c]}" for c in extra_columns) + "\n"
+                    for d in batch
+                )
+                csv_file.flush()
+
+        def show_batch(batch):
+            data = batch[-1]
+            status_indicator = "🟢" if data["status"] == "connected" else "🔴"
+            rpm = data.get("rpm_filt") if data.get("rpm_filt") is not None else data["rpm"]
+            temp = data.get("temp_filt") if data.get("temp_filt") is not None else data["temp"]
+            print(f"\r{status_indicator} {int(rpm):4d} RPM | {temp:5.1f}°C | {datetime.fromtimestamp(data['timestamp']).strftime('%H:%M:%S')}", end="")
+
+        consumers = [
+            Consumer(writer_sub, write_batch, on_close=close_log, max_wait=0.5),
+            Consumer(display_sub, show_batch),
+        ]
+        pump = AcquisitionPump(self, bus, interval=interval, conditioner=conditioner, ring=ring)
+        for consumer in consumers:
+            consumer.start()
+        pump.start()
+
         try:
-            while time.time() < end_time:
-                timestamp = time.time()
-                data = self.read_sensors()
-                
-                # Live-Anzeige
-                status_indicator = "🟢" if data["status"] == "connected" else "🔴"
-                print(f"\r{status_indicator} {data['rpm']:4d} RPM | {data['temp']:5.1f}°C | {datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}", end="")
-                
-                # CSV schreiben
-                with open(log_file, 'a') as f:
-                    f.write(f"{timestamp},{data['rpm']},{data['temp']},{data['rpm_status']},{data['temp_status']}\n")
-                
-                time.sleep(0.1)  # 10Hz
-                
+            pump.join(timeout=duration_minutes * 60)
         except KeyboardInterrupt:
             print("\n🛑 Logging gestoppt")
+        finally:
+            pump.stop()
+            pump.join()
+            bus.unsubscribe(writer_sub)
+            bus.unsubscribe(display_sub)
+            for consumer in consumers:
+                consumer.join()
         
         print(f"\n📁 Daten gespeichert: {log_file}")
+        if writer_sub.dropped:
+            print(f"⚠️ {writer_sub.dropped} Samples verworfen (Schreiben zu langsam)")
         return log_file
 
 # Schaltplan als Kommentar
@@ -309,6 +577,26 @@ VORSICHT:
 - Absicherung mit 1A Sicherung
 '''
 
+def plot_session(log_file, width=72, height=10):
+    """Drehzahl und Temperatur einer Session im Terminal zeichnen (Braille)"""
+    import tool_paths  # noqa: F401  (terminal_plot liegt bei den Motorkenndaten)
+    from session_log import STATUS_CODES, load_session
+    from terminal_plot import TerminalPlot
+
+    columns = load_session(log_file)
+    if not len(columns["timestamp"]):
+        print("📭 Keine Daten")
+        return
+    minutes = (columns["timestamp"] - columns["timestamp"][0]) / 60
+    temp_ok = columns["temp_status"] == STATUS_CODES["ok"]
+
+    rpm_plot = TerminalPlot(width, height, title="Drehzahl", x_label="min", y_label="U/min")
+    rpm_plot.add_series(minutes, columns["rpm"], "RPM", "cyan")
+    rpm_plot.show(markup="ansi")
+    temp_plot = TerminalPlot(width, height, title="Kühlmittel", x_label="min", y_label="°C")
+    temp_plot.add_series(minutes[temp_ok], columns["temp"][temp_ok], "Temperatur", "red")
+    temp_plot.show(markup="ansi")
+
 def main():
     """Hauptprogramm für Original-Sensor Anzapfung"""
     
@@ -320,7 +608,11 @@ def main():
     
     # Sensor-Reader starten
     try:
-        reader = OriginalSensorReader()
+        if input("Verbindung über WLAN (UDP) statt USB? (j/n): ").strip().lower() == 'j':
+            from transports import UdpTransport
+            reader = OriginalSensorReader(transport=UdpTransport())
+        else:
+            reader = OriginalSensorReader()
         
         # Test-Lesung
         test_data = reader.read_sensors()
@@ -330,8 +622,23 @@ def main():
         print(f"   Verbindung: {test_data['status']}")
         
         if test_data['status'] == 'connected':
+            if reader.connection and input("\nGepufferte Fahrt vom ESP32 herunterladen? (j/n): ").strip().lower() == 'j':
+                reader.sync_backlog()
+
             duration = int(input("\nAufzeichnungsdauer (Minuten): "))
-            reader.start_continuous_logging(duration)
+
+            # Alarme laufen als eigener Abnehmer neben Logger und Anzeige
+            from alert_rules import attach_alerts
+            from sample_bus import SampleBus
+            bus = SampleBus()
+            attach_alerts(bus)
+            from signal_conditioning import SignalConditioner
+            conditioner = SignalConditioner()
+            log_file = reader.start_continuous_logging(duration, bus=bus, conditioner=conditioner)
+            print(f"🧹 Signalqualität: {conditioner.counts}")
+            plot_session(log_file)
+            if hasattr(reader.transport, "stats"):
+                print(f"📡 WLAN-Statistik: {reader.transport.stats}")
         
     except Exception as e:
         print(f"❌ Fehler: {e}")
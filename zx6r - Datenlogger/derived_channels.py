@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+ZX6R abgeleitete Kanäle
+Häufig gebrauchte Größen aus den Rohdaten einer Session, einmal berechnet
+und auf Platte zwischengespeichert:
+
+    rpm_smooth            Drehzahl, 1 s gleitend gemittelt
+    rpm_rate              Drehzahländerung (U/min pro Sekunde)
+    gear                  geschätzter Gang (0 = unbekannt), nur aus Drehzahlsprüngen beim
+                          Schalten und den Übersetzungen in ZX6RApp.geschwindigkeiten –
+                          Grenzen der Schätzung siehe gear()
+    temp_slope            Temperaturänderung (°C pro Minute)
+    time_temp_over_100    Sekunden über 100 °C (kumuliert, letzter Wert = gesamt)
+    time_rpm_over_10000   Sekunden über 10.000 U/min (kumuliert)
+
+Jeder Kanal nennt seine Abhängigkeiten (Roh- oder abgeleitete Kanäle) und
+wird vektorisiert berechnet. Der Cache-Schlüssel besteht aus dem Hash der
+Session-Datei und dem Hash des Kanal-Codes (inkl. Abhängigkeiten): geänderte
+Sessions oder geänderter Code werden neu berechnet, alles andere kommt aus
+dem Cache. Mehrere Sessions laufen parallel in einem Prozess-Pool.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from pull_analysis import moving_average
+from session_log import COLUMNS, STATUS_CODES, find_sessions, load_session
+
+CACHE_DIR = ".zx6r_derived"
+MAX_GAP_S = 1.0        # größere Lücken zählen nicht als Zeit über Schwelle
+
+# name → {"func", "deps", "uses", "salt"}
+CHANNELS: Dict[str, dict] = {}
+
+
+def channel(name: str, deps: Tuple[str, ...], uses: Tuple[Callable, ...] = (),
+            salt: Optional[Callable[[], object]] = None):
+    """Abgeleiteten Kanal registrieren; func bekommt ein Dict mit den deps
+
+    uses: Hilfsfunktionen, deren Quelltext mit in die Code-Version eingeht
+    salt: liefert Daten außerhalb des Codes (z.B. Übersetzungen), die ebenfalls
+          in die Code-Version eingehen
+    """
+    def register(func: Callable[[Dict[str, np.ndarray]], np.ndarray]):
+        CHANNELS[name] = {"func": func, "deps": deps, "uses": uses, "salt": salt}
+        return func
+    return register
+
+
+def _session_dt(timestamp: np.ndarray) -> np.ndarray:
+    """Zeitschritte pro Sample, Lücken/Sprünge zählen 0"""
+    dt = np.diff(timestamp, prepend=timestamp[:1])
+    return np.where((dt <= 0) | (dt > MAX_GAP_S), 0.0, dt)
+
+
+def _samples_per(seconds: float, timestamp: np.ndarray) -> int:
+    if len(timestamp) < 2:
+        return 1
+    dt = float(np.median(np.diff(timestamp)))
+    return max(1, int(round(seconds / dt))) if dt > 0 else 1
+
+
+# --- Kanäle ----------------------------------------------------------------
+
+@channel("rpm_smooth", deps=("rpm", "timestamp"), uses=(moving_average, _samples_per))
+def rpm_smooth(c):
+    # Firmware rechnet RPM 1× pro Sekunde neu → 1 s Mittel macht aus Treppen Rampen
+    return moving_average(c["rpm"], _samples_per(1.0, c["timestamp"])).astype(np.float32)
+
+
+@channel("rpm_rate", deps=("rpm_smooth", "timestamp"))
+def rpm_rate(c):
+    if len(c["timestamp"]) < 2:
+        return np.zeros(len(c["timestamp"]), dtype=np.float32)
+    return np.gradient(c["rpm_smooth"].astype(np.float64), c["timestamp"]).astype(np.float32)
+
+
+@lru_cache(maxsize=1)
+def gear_step_ratios() -> np.ndarray:
+    """Drehzahlverhältnis nach/vor dem Hochschalten für 1→2 … 5→6
+
+    Aus ZX6RApp.geschwindigkeiten: km/h pro 1000 U/min je Gang (Median über
+    alle Drehzahlen); beim Schalten bleibt die Geschwindigkeit gleich, die
+    Drehzahl fällt um das Verhältnis der Nachbargänge.
+    """
+    import tool_paths  # noqa: F401  (ZX6RApp liegt bei den Motorkenndaten)
+    from zx6r_app import ZX6RApp
+
+    table = ZX6RApp().geschwindigkeiten
+    per_1000 = np.median([np.asarray(speeds, dtype=np.float64) / rpm * 1000
+                          for rpm, speeds in table.items()], axis=0)
+    return per_1000[:-1] / per_1000[1:]
+
+
+@channel("gear", deps=("rpm", "rpm_status"), uses=(gear_step_ratios,),
+         salt=lambda: np.round(gear_step_ratios(), 4).tolist())
+def gear(c, tolerance: float = 0.03):
+    """Gang nur aus der Drehzahl – eine Schätzung mit klaren Grenzen
+
+    Ohne Geschwindigkeit ist der Gang nur an Schaltvorgängen erkennbar:
+      - Hochschalten: Drehzahl steigt, fällt um das Verhältnis zweier
+        Nachbargänge und steigt danach weiter
+      - Herunterschalten: Drehzahl fällt, springt um das Verhältnis hoch
+        (Zwischengas) und fällt danach weiter
+    Alles andere (Beschleunigen, Bremsen, Kupplung) ändert den Gang nicht.
+    Bis zum ersten erkannten Schaltvorgang und nach Leerlauf ist der Gang
+    unbekannt (0). Die Firmware liefert RPM nur 1× pro Sekunde, die
+    Verhältnisse sind daher auf etwa ±0.03 genau; 3→4 (0.806) und 4→5
+    (0.818) liegen enger beieinander. Passt ein Sprung zu mehreren
+    Gangwechseln, entscheidet der bisher bekannte Gang, sonst 0.
+    """
+    rpm = c["rpm"].astype(np.float64)
+    n = len(rpm)
+    gears = np.zeros(n, dtype=np.uint8)
+    if n < 2:
+        return gears
+    ratios = gear_step_ratios()
+
+    # Drehzahlstufen (1-Hz-Treppen): Wechsel k geht von level[k] nach level[k + 1]
+    changes = np.flatnonzero(np.diff(rpm) != 0) + 1
+    levels = np.concatenate(([np.nan], rpm[np.concatenate(([0], changes))], [np.nan]))
+    before, after = levels[1:-2], levels[2:-1]
+    earlier, later = levels[:-3], levels[3:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        valid = ((before >= 1500) & (after >= 1500) & (earlier >= 1500) & (later >= 1500)
+                 & (c["rpm_status"][changes] == STATUS_CODES["ok"]))
+        step = after / before
+        up = valid & (step < 1) & (before > earlier) & (later > after)
+        down = valid & (step > 1) & (before < earlier) & (later < after)
+        up_match = np.abs(step[:, None] - ratios[None, :]) <= tolerance
+        down_match = np.abs(1 / step[:, None] - ratios[None, :]) <= tolerance
+
+    # Ereignisse in zeitlicher Reihenfolge: (Index, mögliche Gänge danach, Richtung)
+    events = []
+    for k in np.flatnonzero(up & up_match.any(axis=1)):
+        events.append((changes[k], np.flatnonzero(up_match[k]) + 2, 1))
+    for k in np.flatnonzero(down & down_match.any(axis=1)):
+        events.append((changes[k], np.flatnonzero(down_match[k]) + 1, -1))
+    idle = rpm < 1500
+    for index in np.flatnonzero(idle & ~np.concatenate(([False], idle[:-1]))):
+        events.append((index, (), 0))   # Leerlauf/Motor aus: Gang wieder unbekannt
+    if not events:
+        return gears
+
+    current, marks, values = 0, [], []
+    for index, options, direction in sorted(events, key=lambda e: e[0]):
+        if direction == 0:
+            current = 0
+        elif current and current + direction in options:
+            current += direction
+        else:
+            current = int(options[0]) if len(options) == 1 else 0
+        marks.append(index)
+        values.append(current)
+
+    # Letzten Stand nach vorne füllen
+    last = np.searchsorted(marks, np.arange(n), side="right") - 1
+    return np.where(last >= 0, np.asarray(values)[np.maximum(last, 0)], 0).astype(np.uint8)
+
+
+@channel("temp_slope", deps=("temp", "temp_status", "timestamp"), uses=(moving_average, _samples_per))
+def temp_slope(c):
+    t = c["timestamp"]
+    valid = c["temp_status"] == STATUS_CODES["ok"]
+    if valid.sum() < 2:
+        return np.full(len(t), np.nan, dtype=np.float32)
+    temp = np.interp(t, t[valid], c["temp"][valid])   # Fehlerwerte überbrücken
+    smooth = moving_average(temp, _samples_per(10.0, t))
+    return (np.gradient(smooth, t) * 60).astype(np.float32)
+
+
+@channel("time_temp_over_100", deps=("temp", "temp_status", "timestamp"), uses=(_session_dt,))
+def time_temp_over_100(c):
+    above = (c["temp"] >= 100) & (c["temp_status"] == STATUS_CODES["ok"])
+    return np.cumsum(np.where(above, _session_dt(c["timestamp"]), 0.0)).astype(np.float32)
+
+
+@channel("time_rpm_over_10000", deps=("rpm", "rpm_status", "timestamp"), uses=(_session_dt,))
+def time_rpm_over_10000(c):
+    above = (c["rpm"] >= 10000) & (c["rpm_status"] == STATUS_CODES["ok"])
+    return np.cumsum(np.where(above, _session_dt(c["timestamp"]), 0.0)).astype(np.float32)
+
+
+# --- Abhängigkeiten und Code-Version ---------------------------------------
+
+def resolve(names: Iterable[str]) -> List[str]:
+    """Abgeleitete Kanäle inkl. Abhängigkeiten in Berechnungsreihenfolge"""
+    order: List[str] = []
+
+    def visit(name, path=()):
+        if name in COLUMNS or name in order:
+            return
+        if name not in CHANNELS:
+            raise KeyError(f"Unbekannter Kanal: {name}")
+        if name in path:
+            raise ValueError(f"Zyklische Abhängigkeit: {' → '.join(path + (name,))}")
+        for dep in CHANNELS[name]["deps"]:
+            visit(dep, path + (name,))
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+@lru_cache(maxsize=None)
+def code_hash(name: str) -> str:
+    """Hash über Quelltext, Hilfsfunktionen und Daten des Kanals inkl. Abhängigkeiten"""
+    spec = CHANNELS[name]
+    digest = hashlib.blake2b(digest_size=8)
+    for func in (spec["func"],) + tuple(spec["uses"]):
+        digest.update(inspect.getsource(inspect.unwrap(func)).encode())
+    if spec["salt"] is not None:
+        digest.update(repr(spec["salt"]()).encode())
+    for dep in spec["deps"]:
+        digest.update(dep.encode())
+        if dep in CHANNELS:
+            digest.update(code_hash(dep).encode())
+    return digest.hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# --- Cache -----------------------------------------------------------------
+
+def _cache_path(cache_dir: str, source: str, name: str) -> str:
+    return os.path.join(cache_dir, source, f"{name}-{code_hash(name)}.npy")
+
+
+def compute_session(path: str, names: List[str], cache_dir: str, source: str) -> List[str]:
+    """Fehlende Kanäle einer Session berechnen und speichern → berechnete Namen"""
+    order = resolve(names)
+    missing = [n for n in order if not os.path.exists(_cache_path(cache_dir, source, n))]
+    if not missing:
+        return []
+
+    columns: Dict[str, np.ndarray] = dict(load_session(path))
+    os.makedirs(os.path.join(cache_dir, source), exist_ok=True)
+    for name in order:
+        target = _cache_path(cache_dir, source, name)
+        if name not in missing:
+            columns[name] = np.load(target)
+            continue
+        spec = CHANNELS[name]
+        columns[name] = spec["func"]({dep: columns[dep] for dep in spec["deps"]})
+        tmp_path = f"{target}.{os.getpid()}.tmp.npy"   # parallele Prozesse kommen sich nicht in die Quere
+        np.save(tmp_path, columns[name])
+        os.replace(tmp_path, target)
+    return missing
+
+
+class DerivedStore:
+    """Abgeleitete Kanäle für viele Sessions, mit Platten-Cache"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._hash_file = os.path.join(cache_dir, "sources.json")
+        self._hashes: Dict[str, dict] = {}
+        if os.path.exists(self._hash_file):
+            with open(self._hash_file) as f:
+                self._hashes = json.load(f)
+
+    def source_hash(self, path: str) -> str:
+        """Inhalts-Hash einer Session; neu gelesen nur wenn Größe/mtime sich ändern"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        known = self._hashes.get(key)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["hash"]
+        digest = file_hash(path)
+        self._hashes[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest}
+        return digest
+
+    def _save_hashes(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._hash_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._hashes, f, indent=1)
+        os.replace(tmp_path, self._hash_file)
+
+    def is_cached(self, path: str, names: Iterable[str]) -> bool:
+        source = self.source_hash(path)
+        return all(os.path.exists(_cache_path(self.cache_dir, source, n)) for n in resolve(names))
+
+    def materialize(self, paths: Iterable[str], names: Optional[Iterable[str]] = None,
+                    workers: Optional[int] = None) -> Dict[str, List[str]]:
+        """Kanäle für alle Sessions bereitstellen → {Session: neu berechnete Kanäle}"""
+        names = list(names or CHANNELS)
+        jobs = {}
+        for path in paths:
+            if not self.is_cached(path, names):
+                jobs[path] = self.source_hash(path)
+        self._save_hashes()
+
+        results = {path: [] for path in paths}
+        if len(jobs) == 1 or workers == 1:
+            for path, source in jobs.items():
+                results[path] = compute_session(path, names, self.cache_dir, source)
+        elif jobs:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {path: pool.submit(compute_session, path, names, self.cache_dir, source)
+                           for path, source in jobs.items()}
+                for path, future in futures.items():
+                    results[path] = future.result()
+        return results
+
+    def load(self, path: str, names: Iterable[str], mmap: bool = True) -> Dict[str, np.ndarray]:
+        """Kanäle einer Session laden (fehlende werden vorher berechnet)"""
+        names = list(names)
+        self.materialize([path], names)
+        source = self.source_hash(path)
+        mode = "r" if mmap else None
+        return {name: np.load(_cache_path(self.cache_dir, source, name), mmap_mode=mode) for name in names}
+
+
+def main():
+    """Alle (oder die angegebenen) Sessions: Kanäle berechnen und kurz zusammenfassen"""
+    paths = sys.argv[1:] or find_sessions(".")
+    if not paths:
+        print("📭 Keine Sessions gefunden")
+        return
+    store = DerivedStore()
+    computed = store.materialize(paths)
+    for path in paths:
+        c = store.load(path, ["gear", "time_temp_over_100", "time_rpm_over_10000"])
+        gears = np.bincount(c["gear"], minlength=7)[1:]
+        status = f"{len(computed[path])} berechnet" if computed[path] else "aus Cache"
+        print(f"📁 {os.path.basename(path)} ({status})")
+        print(f"   über 100 °C: {float(c['time_temp_over_100'][-1]) if len(c['gear']) else 0:.0f} s, "
+              f"über 10.000 U/min: {float(c['time_rpm_over_10000'][-1]) if len(c['gear']) else 0:.0f} s")
+        print("   Gänge (Samples): " + ", ".join(f"{g}.: {n}" for g, n in enumerate(gears, 1) if n))
+
+
+if __name__ == "__main__":
+    main()
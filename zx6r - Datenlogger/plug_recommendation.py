@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+ZX6R Zündkerzen-Empfehlung aus Logdaten
+Verknüpft gemessene Kühlmitteltemperatur und Drehzahl mit den NGK Wärmewerten.
+
+Jede Session wird blockweise gelesen und zu einem Belastungsprofil verdichtet
+(Zeit über Temperatur-/Drehzahlschwellen, längste Hochdrehzahl-Phase).
+Profile werden pro Session in einer JSON-Datei gehalten, neue oder geänderte
+Sessions werden beim nächsten Lauf nachgerechnet, alle anderen nicht.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import tool_paths  # noqa: F401  (macht den NGK-Ordner importierbar)
+from ngk_terminal_analyzer import NGKAnalyzer
+from session_log import STATUS_CODES, find_sessions, iter_chunks
+
+# Serienkerze der ZX6R 600G (siehe ZX6RApp.standard_setup)
+STANDARD_PLUG = "CR9E"
+
+TEMP_THRESHOLDS = (90, 100, 105)          # °C
+RPM_THRESHOLDS = (6000, 8000, 10000, 11000)
+DWELL_RPM = 10000                          # ab hier zählt "Dauervollgas"
+MAX_GAP_S = 1.0                            # größere Lücken = Logging unterbrochen
+
+
+class ExposureProfile:
+    """Belastungsprofil (Sekunden) einer oder mehrerer Sessions"""
+
+    def __init__(self):
+        self.total_s = 0.0
+        self.riding_s = 0.0
+        self.temp_s = 0.0                  # Zeit mit gültiger Temperatur
+        self.temp_sum = 0.0                # zeitgewichtete Summe für den Mittelwert
+        self.max_temp = None
+        self.temp_above = {t: 0.0 for t in TEMP_THRESHOLDS}
+        self.rpm_above = {r: 0.0 for r in RPM_THRESHOLDS}
+        self.max_dwell_s = 0.0
+
+        # Übertrag zwischen Blöcken
+        self._last_timestamp = None
+        self._dwell_carry = 0.0
+
+    def add_chunk(self, chunk: Dict[str, np.ndarray]):
+        """Einen Block Samples einrechnen (vektorisiert)"""
+        t = chunk["timestamp"]
+        if not len(t):
+            return
+
+        previous = t[0] if self._last_timestamp is None else self._last_timestamp
+        dt = np.diff(t, prepend=previous)
+        gap = (dt <= 0) | (dt > MAX_GAP_S)
+        dt = np.where(gap, 0.0, dt)
+        self._last_timestamp = float(t[-1])
+
+        rpm = chunk["rpm"]
+        rpm_ok = chunk["rpm_status"] == STATUS_CODES["ok"]
+        temp = chunk["temp"]
+        temp_ok = chunk["temp_status"] == STATUS_CODES["ok"]
+
+        self.total_s += float(dt.sum())
+        riding = rpm_ok & (rpm >= 500)
+        self.riding_s += float(dt[riding].sum())
+
+        for threshold in RPM_THRESHOLDS:
+            self.rpm_above[threshold] += float(dt[rpm_ok & (rpm >= threshold)].sum())
+
+        if temp_ok.any():
+            dt_temp = dt[temp_ok]
+            valid_temp = temp[temp_ok]
+            self.temp_s += float(dt_temp.sum())
+            self.temp_sum += float((dt_temp * valid_temp).sum())
+            chunk_max = float(valid_temp.max())
+            self.max_temp = chunk_max if self.max_temp is None else max(self.max_temp, chunk_max)
+            for threshold in TEMP_THRESHOLDS:
+                self.temp_above[threshold] += float(dt_temp[valid_temp >= threshold].sum())
+
+        self._add_dwell(rpm_ok & (rpm >= DWELL_RPM) & ~gap, dt)
+
+    def _add_dwell(self, high: np.ndarray, dt: np.ndarray):
+        """Längste zusammenhängende Hochdrehzahl-Phase über Blockgrenzen hinweg"""
+        weighted = np.cumsum(np.where(high, dt, 0.0))
+        # Kumulierte Zeit am letzten Nicht-High-Sample = Startpunkt der laufenden Phase
+        base = np.maximum.accumulate(np.where(high, 0.0, weighted))
+        run = weighted - base
+        # Eine am Blockanfang laufende Phase setzt die aus dem letzten Block fort
+        run = run + np.where(np.cumsum(~high) == 0, self._dwell_carry, 0.0)
+
+        self.max_dwell_s = max(self.max_dwell_s, float(run.max()))
+        self._dwell_carry = float(run[-1]) if high[-1] else 0.0
+
+    def merge(self, other: "ExposureProfile"):
+        """Profil einer weiteren Session aufaddieren"""
+        self.total_s += other.total_s
+        self.riding_s += other.riding_s
+        self.temp_s += other.temp_s
+        self.temp_sum += other.temp_sum
+        if other.max_temp is not None:
+            self.max_temp = other.max_temp if self.max_temp is None else max(self.max_temp, other.max_temp)
+        for threshold in TEMP_THRESHOLDS:
+            self.temp_above[threshold] += other.temp_above[threshold]
+        for threshold in RPM_THRESHOLDS:
+            self.rpm_above[threshold] += other.rpm_above[threshold]
+        self.max_dwell_s = max(self.max_dwell_s, other.max_dwell_s)
+
+    @property
+    def mean_temp(self) -> Optional[float]:
+        return self.temp_sum / self.temp_s if self.temp_s else None
+
+    def share(self, seconds: float) -> float:
+        """Anteil an der Fahrzeit"""
+        return seconds / self.riding_s if self.riding_s else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_s": self.total_s,
+            "riding_s": self.riding_s,
+            "temp_s": self.temp_s,
+            "temp_sum": self.temp_sum,
+            "max_temp": self.max_temp,
+            "temp_above": {str(k): v for k, v in self.temp_above.items()},
+            "rpm_above": {str(k): v for k, v in self.rpm_above.items()},
+            "max_dwell_s": self.max_dwell_s,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ExposureProfile":
+        profile = cls()
+        for key in ("total_s", "riding_s", "temp_s", "temp_sum", "max_temp", "max_dwell_s"):
+            setattr(profile, key, data[key])
+        profile.temp_above = {int(k): v for k, v in data["temp_above"].items()}
+        profile.rpm_above = {int(k): v for k, v in data["rpm_above"].items()}
+        return profile
+
+
+def profile_session(path: str) -> ExposureProfile:
+    """Belastungsprofil einer Session, gestreamt"""
+    profile = ExposureProfile()
+    for chunk in iter_chunks(path):
+        profile.add_chunk(chunk)
+    return profile
+
+
+class PlugRecommender:
+    """Wärmewert-Empfehlung, inkrementell über alle bisherigen Sessions"""
+
+    def __init__(self, state_file="zx6r_plug_profile.json", current_plug=STANDARD_PLUG, analyzer=None):
+        self.state_file = state_file
+        self.current_plug = current_plug
+        self.analyzer = analyzer or NGKAnalyzer()
+        self.search_index = None
+        self.sessions = self.load_state()  # Pfad → {"signatur", "profil"}
+
+    def load_state(self) -> Dict:
+        """Gespeicherte Session-Profile laden"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r") as f:
+                    return json.load(f).get("sessions", {})
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def save_state(self):
+        """Session-Profile speichern"""
+        with open(self.state_file, "w") as f:
+            json.dump({"sessions": self.sessions}, f, indent=2)
+
+    @staticmethod
+    def _signature(path: str) -> List[int]:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def update(self, paths: Optional[List[str]] = None) -> List[str]:
+        """Neue oder geänderte Sessions einrechnen; liefert die neu berechneten Pfade"""
+        if paths is None:
+            paths = find_sessions()
+
+        updated = []
+        for path in paths:
+            key = os.path.abspath(path)
+            signature = self._signature(path)
+            known = self.sessions.get(key)
+            if known and known["signatur"] == signature:
+                continue
+            self.sessions[key] = {"signatur": signature, "profil": profile_session(path).to_dict()}
+            updated.append(path)
+
+        if updated:
+            self.save_state()
+        return updated
+
+    def profile(self) -> ExposureProfile:
+        """Gesamtprofil aller bekannten Sessions"""
+        total = ExposureProfile()
+        for session in self.sessions.values():
+            total.merge(ExposureProfile.from_dict(session["profil"]))
+        return total
+
+    def recommend(self, profile: Optional[ExposureProfile] = None, candidates: int = 5) -> Dict:
+        """Empfohlener Wärmewert mit Begründung und passenden NGK-Kerzen"""
+        if profile is None:
+            profile = self.profile()
+        if self.search_index is None:
+            from ngk_search import NGKSearchIndex
+            self.search_index = NGKSearchIndex(self.analyzer)
+
+        # Die Stufen unten sind auf die Serienkerze kalibriert; die eingebaute
+        # Kerze bestimmt nur, welche Kerzen als Kandidaten infrage kommen
+        standard = self.search_index.parse(STANDARD_PLUG)
+        base = standard["waermewert"] if standard else 9
+        heat = base
+        reasons = []
+
+        high_share = profile.share(profile.rpm_above[10000])
+        hot_share = profile.share(profile.temp_above[100])
+        if profile.riding_s < 60:
+            reasons.append("Zu wenig Fahrzeit für eine Aussage – Wärmewert unverändert")
+        else:
+            if profile.max_dwell_s >= 120 or high_share >= 0.35:
+                heat = base + 2
+                reasons.append(f"Sehr hohe Dauerlast: {profile.max_dwell_s:.0f} s am Stück über {DWELL_RPM} U/min, "
+                               f"{high_share:.0%} der Fahrzeit darüber")
+            elif profile.max_dwell_s >= 30 or high_share >= 0.15 or hot_share >= 0.10:
+                heat = base + 1
+                reasons.append(f"Hohe Last: {high_share:.0%} der Fahrzeit über 10000 U/min, "
+                               f"{hot_share:.0%} über 100°C, längste Phase {profile.max_dwell_s:.0f} s")
+            elif profile.share(profile.rpm_above[8000]) < 0.02 and (profile.max_temp or 0) < 85:
+                heat = base - 1
+                reasons.append("Kaum Last und kühler Motor – heißere Kerze gegen Verrußung")
+            else:
+                reasons.append("Belastung im normalen Bereich – Serien-Wärmewert passt")
+
+        heat_values = [w["wert"] for w in self.analyzer.waermewerte]
+        heat = min(max(heat, heat_values[0]), heat_values[-1])
+        info = next(w for w in self.analyzer.waermewerte if w["wert"] == heat)
+
+        plugs = []
+        parsed = self.search_index.parse(self.current_plug)
+        if parsed:
+            spread = abs(heat - parsed["waermewert"]) + 1
+            plugs = [name for name, _ in self.search_index.equivalents(self.current_plug, heat_spread=spread, limit=200)
+                     if self.search_index.parse(name)["waermewert"] == heat][:candidates]
+
+        return {
+            "aktuelle_kerze": self.current_plug,
+            "waermewert": heat,
+            "info": info,
+            "gruende": reasons,
+            "kandidaten": plugs,
+            "profil": profile.to_dict(),
+        }
+
+
+def print_recommendation(recommendation: Dict):
+    """Empfehlung im Terminal ausgeben"""
+    profil = recommendation["profil"]
+    print("🌡️  BELASTUNGSPROFIL")
+    print("-" * 50)
+    print(f"   Fahrzeit:            {profil['riding_s'] / 60:7.1f} min")
+    for threshold, seconds in profil["rpm_above"].items():
+        print(f"   über {threshold:>5} U/min:    {seconds / 60:7.1f} min")
+    for threshold, seconds in profil["temp_above"].items():
+        print(f"   über {threshold:>5} °C:       {seconds / 60:7.1f} min")
+    print(f"   Längste Phase > {DWELL_RPM}: {profil['max_dwell_s']:5.0f} s")
+    print()
+    info = recommendation["info"]
+    print(f"🔧 EMPFEHLUNG: Wärmewert {recommendation['waermewert']} → {info['typ']} ({info['anwendung']})")
+    for reason in recommendation["gruende"]:
+        print(f"   • {reason}")
+    if recommendation["kandidaten"]:
+        print(f"   Kerzen statt {recommendation['aktuelle_kerze']}: {', '.join(recommendation['kandidaten'])}")
+
+
+def main():
+    """Alle Sessions im aktuellen Ordner auswerten"""
+    recommender = PlugRecommender()
+    updated = recommender.update()
+    print(f"📊 {len(recommender.sessions)} Sessions bekannt, {len(updated)} neu berechnet")
+    print()
+    print_recommendation(recommender.recommend())
+
+
+if __name__ == "__main__":
+    main()
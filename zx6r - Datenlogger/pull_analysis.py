@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+ZX6R Vollgas-Pulls vergleichen
+Findet Durchzüge (Drehzahl steigt zügig über einen weiten Bereich) in den
+Session-Logs und legt sie über die Drehzahl statt über die Zeit übereinander.
+
+Jeder Pull wird auf ein gemeinsames Drehzahlraster interpoliert. Pro Setup
+(z.B. Standard 140/130 gegen K&N mit 135/132.5, siehe ZX6RApp) werden die
+Kurven gemittelt und verglichen: Drehzahlanstieg (U/min pro Sekunde, bei
+gleichem Gang ein Maß für die Beschleunigung), Zeit durch Drehzahlbänder
+und Temperaturanstieg während des Pulls.
+"""
+
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from session_log import STATUS_CODES, load_session
+
+RPM_GRID = np.arange(3000, 12501, 100, dtype=np.float64)
+RPM_BANDS = ((4000, 6000), (6000, 8000), (8000, 10000), (10000, 12000))
+
+MIN_RATE = 600.0        # U/min pro Sekunde, darunter kein Vollgas
+MIN_SPAN = 3000.0       # Pull muss mindestens so viel Drehzahl überstreichen
+MIN_DURATION_S = 1.5
+MAX_GAP_S = 0.3         # kurze Einbrüche (Schaltruckler, Messrauschen) überbrücken
+SMOOTH_S = 1.0          # Firmware rechnet RPM nur 1× pro Sekunde neu → Treppen glätten
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Gleitender Mittelwert gleicher Länge (Ränder mit weniger Werten)"""
+    if window <= 1:
+        return values.astype(np.float64)
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    half = window // 2
+    idx = np.arange(len(values))
+    lo = np.clip(idx - half, 0, len(values))
+    hi = np.clip(idx - half + window, 0, len(values))
+    return (cumsum[hi] - cumsum[lo]) / (hi - lo)
+
+
+def _runs(mask: np.ndarray):
+    """Start- und End-Indizes (exklusiv) zusammenhängender True-Bereiche"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_pulls(columns: Dict[str, np.ndarray], source: str = "") -> List[dict]:
+    """Vollgas-Pulls einer Session finden (vektorisiert)"""
+    t = columns["timestamp"]
+    if len(t) < 3:
+        return []
+    rpm = columns["rpm"].astype(np.float64)
+    temp = columns["temp"].astype(np.float64)
+
+    dt = float(np.median(np.diff(t)))
+    if dt <= 0:
+        return []
+    smooth = moving_average(rpm, int(round(SMOOTH_S / dt)))
+    rate = np.gradient(smooth, t)
+
+    rising = (rate > MIN_RATE) & (columns["rpm_status"] == STATUS_CODES["ok"])
+
+    # Kurze Lücken zwischen steigenden Abschnitten schließen
+    starts, ends = _runs(~rising)
+    short = (t[np.minimum(ends, len(t) - 1)] - t[starts] <= MAX_GAP_S) & (starts > 0) & (ends < len(t))
+    for s, e in zip(starts[short], ends[short]):
+        rising[s:e] = True
+
+    temp_ok = columns["temp_status"] == STATUS_CODES["ok"]
+    pulls = []
+    for s, e in zip(*_runs(rising)):
+        duration = t[e - 1] - t[s]
+        span = smooth[e - 1] - smooth[s]
+        if duration < MIN_DURATION_S or span < MIN_SPAN:
+            continue
+        pull_temp = np.where(temp_ok[s:e], temp[s:e], np.nan)
+        pulls.append({
+            "quelle": source,
+            "start": float(t[s]),
+            "dauer": float(duration),
+            "rpm_von": float(smooth[s]),
+            "rpm_bis": float(smooth[e - 1]),
+            "t": t[s:e] - t[s],
+            "rpm": smooth[s:e],
+            "rate": rate[s:e],
+            "temp": pull_temp,
+        })
+    return pulls
+
+
+def align_pulls(pulls: List[dict], grid: np.ndarray = RPM_GRID) -> Dict[str, np.ndarray]:
+    """Pulls auf das Drehzahlraster legen → Matrizen (Pull × Raster), NaN außerhalb"""
+    shape = (len(pulls), len(grid))
+    aligned = {name: np.full(shape, np.nan) for name in ("zeit", "rate", "temp")}
+    for i, pull in enumerate(pulls):
+        # Drehzahl muss für interp streng steigen
+        rpm = np.maximum.accumulate(pull["rpm"])
+        keep = np.concatenate(([True], np.diff(rpm) > 0))
+        rpm = rpm[keep]
+        aligned["zeit"][i] = np.interp(grid, rpm, pull["t"][keep], left=np.nan, right=np.nan)
+        aligned["rate"][i] = np.interp(grid, rpm, pull["rate"][keep], left=np.nan, right=np.nan)
+        temp = pull["temp"][keep]
+        valid = ~np.isnan(temp)
+        if valid.sum() >= 2:
+            aligned["temp"][i] = np.interp(grid, rpm[valid], temp[valid], left=np.nan, right=np.nan)
+    return aligned
+
+
+def _column_mean(matrix: np.ndarray) -> np.ndarray:
+    """Spaltenmittel ohne NaN (ohne Warnung bei leeren Spalten)"""
+    count = np.sum(~np.isnan(matrix), axis=0)
+    total = np.nansum(matrix, axis=0)
+    return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def _band_times(zeit: np.ndarray, grid: np.ndarray) -> Dict[str, float]:
+    """Mittlere Zeit durch jedes Drehzahlband (nur Pulls, die das Band ganz abdecken)"""
+    times = {}
+    for low, high in RPM_BANDS:
+        i, j = np.searchsorted(grid, low), np.searchsorted(grid, high)
+        if j >= len(grid) or not len(zeit):
+            times[f"{low}-{high}"] = float("nan")
+            continue
+        span = zeit[:, j] - zeit[:, i]
+        span = span[~np.isnan(span)]
+        times[f"{low}-{high}"] = float(span.mean()) if len(span) else float("nan")
+    return times
+
+
+def summarize_setup(pulls: List[dict], grid: np.ndarray = RPM_GRID) -> dict:
+    """Kennwerte eines Setups aus seinen Pulls"""
+    aligned = align_pulls(pulls, grid)
+    temps = [p["temp"][~np.isnan(p["temp"])] for p in pulls]
+    temps = [temp for temp in temps if len(temp)]
+    rises = [temp[-1] - temp[0] for temp in temps]
+    starts = [temp[0] for temp in temps]
+    return {
+        "pulls": len(pulls),
+        "rate": _column_mean(aligned["rate"]),
+        "temp": _column_mean(aligned["temp"]),
+        "band_zeiten": _band_times(aligned["zeit"], grid),
+        "temp_start": float(np.mean(starts)) if starts else float("nan"),
+        "temp_anstieg": float(np.mean(rises)) if rises else float("nan"),
+    }
+
+
+def compare_setups(setups: Dict[str, List[str]], grid: np.ndarray = RPM_GRID) -> dict:
+    """Sessions pro Setup auswerten; das erste Setup ist die Referenz
+
+    setups: {"Standard": [csv/zxl...], "Tuning": [...]}
+    """
+    results = {}
+    for name, paths in setups.items():
+        pulls = []
+        for path in paths:
+            pulls.extend(detect_pulls(load_session(path), source=path))
+        results[name] = summarize_setup(pulls, grid)
+
+    reference = next(iter(results.values()), None)
+    for summary in results.values():
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summary["rate_delta_pct"] = (summary["rate"] / reference["rate"] - 1) * 100
+        summary["band_delta_s"] = {
+            band: summary["band_zeiten"][band] - reference["band_zeiten"][band]
+            for band in summary["band_zeiten"]
+        }
+        summary["temp_anstieg_delta"] = summary["temp_anstieg"] - reference["temp_anstieg"]
+    return {"raster": grid, "setups": results}
+
+
+def _fmt(value: float, spec: str) -> str:
+    return "–" if np.isnan(value) else format(value, spec)
+
+
+def print_comparison(comparison: dict):
+    """Vergleich als Tabelle ausgeben"""
+    grid = comparison["raster"]
+    setups = comparison["setups"]
+    names = list(setups)
+
+    print("🏁 Vollgas-Pulls: " + ", ".join(f"{n} ({setups[n]['pulls']})" for n in names))
+    print()
+    print("Drehzahlanstieg (U/min pro s)")
+    print(f"{'U/min':>7} " + " ".join(f"{n[:12]:>12}" for n in names) + "  Δ% (zur Referenz)")
+    for rpm in range(4000, 12001, 1000):
+        i = int(np.searchsorted(grid, rpm))
+        values = " ".join(f"{_fmt(setups[n]['rate'][i], '.0f'):>12}" for n in names)
+        deltas = " ".join(_fmt(setups[n]["rate_delta_pct"][i], "+.1f") for n in names[1:])
+        print(f"{rpm:>7} {values}  {deltas}")
+
+    print()
+    print("Zeit durch Drehzahlband (s)")
+    for band in setups[names[0]]["band_zeiten"]:
+        values = " ".join(f"{_fmt(setups[n]['band_zeiten'][band], '.2f'):>12}" for n in names)
+        deltas = " ".join(_fmt(setups[n]["band_delta_s"][band], "+.2f") for n in names[1:])
+        print(f"{band:>11} {values}  {deltas}")
+
+    print()
+    print("Temperatur")
+    for n in names:
+        s = setups[n]
+        print(f"   {n}: Start {_fmt(s['temp_start'], '.1f')}°C, Anstieg pro Pull "
+              f"{_fmt(s['temp_anstieg'], '.1f')}°C (Δ {_fmt(s['temp_anstieg_delta'], '+.1f')}°C)")
+
+
+def _synthetic_session(pulls: int, rate: float, seed: int) -> Dict[str, np.ndarray]:
+    """Session mit Pulls 4000→12000 U/min bei 10 Hz (für den Benchmark)"""
+    rng = np.random.default_rng(seed)
+    parts, t0 = [], 0.0
+    for _ in range(pulls):
+        idle = np.full(100, 3000.0)
+        ramp = np.arange(4000.0, 12000.0, rate / 10)
+        rpm = np.concatenate((idle, ramp)) + rng.normal(0, 50, len(idle) + len(ramp))
+        parts.append(rpm)
+    rpm = np.concatenate(parts)
+    n = len(rpm)
+    return {
+        "timestamp": np.arange(n) * 0.1 + t0,
+        "rpm": rpm.astype(np.float32),
+        "temp": (85 + np.cumsum(np.where(rpm > 8000, 0.01, -0.005))).astype(np.float32),
+        "rpm_status": np.zeros(n, dtype=np.uint8),
+        "temp_status": np.zeros(n, dtype=np.uint8),
+    }
+
+
+def run_benchmark(pulls_per_setup: int = 40):
+    """Erkennung + Ausrichtung + Vergleich für zwei Setups mit je pulls_per_setup Pulls"""
+    sessions = {"Standard": _synthetic_session(pulls_per_setup, 1600, 1),
+                "Tuning": _synthetic_session(pulls_per_setup, 1700, 2)}
+    start = time.perf_counter()
+    results = {}
+    for name, columns in sessions.items():
+        results[name] = summarize_setup(detect_pulls(columns))
+    elapsed = time.perf_counter() - start
+    found = sum(r["pulls"] for r in results.values())
+    print(f"⏱️ {found} Pulls erkannt und ausgerichtet in {elapsed * 1000:.1f} ms")
+
+
+def main():
+    """Aufruf: python pull_analysis.py Standard: a.csv b.csv Tuning: c.csv"""
+    if "--bench" in sys.argv:
+        run_benchmark()
+        return
+
+    usage = "Aufruf: python pull_analysis.py Standard: <session.csv> ... Tuning: <session.csv> ..."
+    setups: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    for arg in sys.argv[1:]:
+        if arg.endswith(":"):
+            current = arg[:-1]
+            setups[current] = []
+        elif current is not None:
+            setups[current].append(arg)
+        else:
+            # Ohne Setup-Namen ist unklar, was die Referenz ist – nicht stillschweigend weglassen
+            print(f"❌ {arg}: Session vor dem ersten Setup-Namen (z.B. \"Standard:\")")
+            print(usage)
+            sys.exit(1)
+    if len(setups) < 2:
+        print(usage)
+        return
+    print_comparison(compare_setups(setups))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+ZX6R Sample-Bus
+Publish/Subscribe innerhalb eines Prozesses: eine Erfassung, viele Abnehmer.
+
+Der AcquisitionPump liest den OriginalSensorReader, schickt jedes Sample
+optional durch die Signalaufbereitung (signal_conditioning.py),
+schreibt es optional in einen SampleRing (sample_ring.py) und
+veröffentlicht es auf dem Bus. Jeder Abnehmer (CSV-Writer, Live-Anzeige, Alarme,
+Analyse, Server) hat eine eigene begrenzte Queue und holt sich Samples
+stapelweise ab. Pro Abnehmer wird festgelegt, was bei voller Queue passiert:
+
+    drop_oldest  ältestes Sample verwerfen (Live-Anzeigen)
+    drop_newest  neues Sample verwerfen (Log-Writer, mit großer Queue)
+    block        Erfassung wartet bis block_timeout, danach wird verworfen
+                 (block_timeout deutlich unter dem Abfragetakt halten)
+
+Ein langsamer Abnehmer kann die Erfassung damit höchstens block_timeout lang
+aufhalten, nie dauerhaft; verworfene Samples zählt dropped.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class Subscription:
+    """Begrenzte Queue eines Abnehmers"""
+
+    def __init__(self, name: str, maxsize: int = 1000, policy: str = "drop_oldest",
+                 batch_size: int = 50, block_timeout: float = 0.5):
+        if policy not in POLICIES:
+            raise ValueError(f"Unbekannte Policy: {policy} (erlaubt: {', '.join(POLICIES)})")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def _offer(self, sample):
+        """Vom Bus aufgerufen; hält sich an die Policy"""
+        with self._lock:
+            if self.closed:
+                return
+            if len(self._queue) >= self.maxsize:
+                if self.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif self.policy == "drop_newest":
+                    self.dropped += 1
+                    return
+                else:
+                    self._not_full.wait_for(lambda: len(self._queue) < self.maxsize or self.closed,
+                                            timeout=self.block_timeout)
+                    if len(self._queue) >= self.maxsize or self.closed:
+                        self.dropped += 1
+                        return
+            self._queue.append(sample)
+            if len(self._queue) >= self.batch_size or len(self._queue) == 1:
+                self._not_empty.notify()
+
+    def get_batch(self, timeout: Optional[float] = None, max_wait: float = 0.0) -> List:
+        """Bis zu batch_size Samples abholen
+
+        Wartet höchstens timeout auf das erste Sample. Mit max_wait > 0 wird
+        danach noch bis zu max_wait gewartet, damit sich ein Stapel füllt.
+        Leere Liste = Timeout oder Subscription geschlossen.
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: self._queue or self.closed, timeout=timeout):
+                return []
+            if max_wait > 0 and len(self._queue) < self.batch_size and not self.closed:
+                self._not_empty.wait_for(lambda: len(self._queue) >= self.batch_size or self.closed,
+                                         timeout=max_wait)
+            count = min(len(self._queue), self.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+            self.delivered += count
+            self._not_full.notify()
+            return batch
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def __len__(self):
+        return len(self._queue)
+
+
+class SampleBus:
+    """Verteilt veröffentlichte Samples an alle Subscriptions"""
+
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self.published = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, name: str, **options) -> Subscription:
+        subscription = Subscription(name, **options)
+        with self._lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        with self._lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+
+    def publish(self, sample):
+        # Liste wird bei (un)subscribe ersetzt, daher hier ohne Lock iterierbar
+        for subscription in self.subscriptions:
+            subscription._offer(sample)
+        self.published += 1
+
+    def close(self):
+        for subscription in self.subscriptions:
+            subscription.close()
+
+    def stats(self) -> dict:
+        """Zähler pro Abnehmer (für Diagnose langsamer Consumer)"""
+        return {
+            s.name: {"queued": len(s), "delivered": s.delivered, "dropped": s.dropped}
+            for s in self.subscriptions
+        }
+
+
+class AcquisitionPump(threading.Thread):
+    """Fragt den Sensor im festen Takt ab und veröffentlicht auf dem Bus"""
+
+    def __init__(self, reader, bus: SampleBus, interval: float = 0.1, conditioner=None, ring=None):
+        super().__init__(name="zx6r-acquisition", daemon=True)
+        self.reader = reader
+        self.bus = bus
+        self.interval = interval
+        self.conditioner = conditioner
+        self.ring = ring
+        self._stop_event = threading.Event()
+
+    def run(self):
+        next_time = time.monotonic()
+        while not self._stop_event.is_set():
+            timestamp = time.time()
+            sample = self.reader.read_sensors()
+            if sample.get("timestamp") is None:
+                sample["timestamp"] = timestamp   # UDP bringt die Messzeit vom ESP32 mit
+            if self.conditioner:
+                sample = self.conditioner.process(sample)
+            if self.ring is not None:
+                self.ring.append(sample)
+            self.bus.publish(sample)
+
+            next_time += self.interval
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                next_time = time.monotonic()  # Takt verpasst, nicht aufholen
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class Consumer(threading.Thread):
+    """Thread, der Stapel einer Subscription an eine Funktion übergibt"""
+
+    def __init__(self, subscription: Subscription, handle_batch: Callable[[List], None],
+                 on_close: Optional[Callable[[], None]] = None, max_wait: float = 0.0):
+        super().__init__(name=f"zx6r-{subscription.name}", daemon=True)
+        self.subscription = subscription
+        self.handle_batch = handle_batch
+        self.on_close = on_close
+        self.max_wait = max_wait
+
+    def run(self):
+        try:
+            while True:
+                batch = self.subscription.get_batch(timeout=0.5, max_wait=self.max_wait)
+                if batch:
+                    self.handle_batch(batch)
+                elif self.subscription.closed and not len(self.subscription):
+                    break
+        finally:
+            if self.on_close:
+                self.on_close()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+ZX6R Sample-Records
+Kompakte Darstellung der Samples von read_sensors():
+
+SampleRecord   ein Objekt mit __slots__ statt Dict; Status werden als
+               kleine Codes (status_codes.py) gespeichert.
+               Verhält sich beim Lesen wie das bisherige Dict
+               (sample["rpm"], sample.get("rpm_status"), sample.items()),
+               so dass Logger, Alarme, Server und Analyse unverändert
+               weiterlaufen; Status kommen dabei als Strings zurück.
+
+Ohne NumPy – der NumPy-Ringpuffer für die Records steht in sample_ring.py.
+"""
+
+from typing import Dict, Optional
+
+from status_codes import (CONNECTION_CODES, CONNECTION_NAMES, QUALITY_CODES, QUALITY_NAMES,
+                          STATUS_CODES, STATUS_NAMES)
+
+FIELDS = ("timestamp", "rpm", "temp", "status", "rpm_status", "temp_status",
+          "rpm_filt", "temp_filt", "rpm_quality", "temp_quality", "raw_response")
+
+# Feld → (Codes, Namen) für die als Code gespeicherten Felder
+_CODED = {
+    "status": (CONNECTION_CODES, CONNECTION_NAMES),
+    "rpm_status": (STATUS_CODES, STATUS_NAMES),
+    "temp_status": (STATUS_CODES, STATUS_NAMES),
+    "rpm_quality": (QUALITY_CODES, QUALITY_NAMES),
+    "temp_quality": (QUALITY_CODES, QUALITY_NAMES),
+}
+_UNKNOWN = STATUS_CODES["unknown"]
+
+
+class SampleRecord:
+    """Ein Sample; Dict-kompatibel beim Lesen, ohne Dict im Speicher"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, rpm, temp, status: int = 0, rpm_status: Optional[int] = None,
+                 temp_status: Optional[int] = None, timestamp: Optional[float] = None,
+                 raw_response: Optional[str] = None):
+        self.timestamp = timestamp
+        self.rpm = rpm
+        self.temp = temp
+        self.status = status
+        # Ohne Messung gilt der Verbindungsstatus auch für die Kanäle (wie im Log)
+        self.rpm_status = status if rpm_status is None else rpm_status
+        self.temp_status = status if temp_status is None else temp_status
+        self.rpm_filt = None
+        self.temp_filt = None
+        self.rpm_quality = None
+        self.temp_quality = None
+        self.raw_response = raw_response
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SampleRecord":
+        status = CONNECTION_CODES.get(data.get("status", "connected"), _UNKNOWN)
+        record = cls(data["rpm"], data["temp"], status)
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def __getitem__(self, key: str):
+        try:
+            value = getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+        if value is None:
+            raise KeyError(key)
+        coded = _CODED.get(key)
+        return coded[1].get(value, "unknown") if coded else value
+
+    def __setitem__(self, key: str, value):
+        coded = _CODED.get(key)
+        if coded and isinstance(value, str):
+            value = coded[0].get(value, _UNKNOWN)
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, None) is not None
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [key for key in FIELDS if getattr(self, key) is not None]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self) -> Dict:
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"SampleRecord({self.to_dict()})"
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+ZX6R Sample-Ring
+Vorbelegter NumPy-Ringpuffer mit typisierten Spalten für SampleRecords.
+Jedes Sample steht doppelt im Speicher (Position i und i + capacity),
+dadurch sind die letzten n Samples immer ein zusammenhängender Ausschnitt:
+columns() liefert Views ohne Kopie. Ein View auf n Samples bleibt
+unverändert, bis capacity − n neue Samples geschrieben wurden. Der Speicher
+bleibt auch bei ganztägigen Sessions fest.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from sample_record import SampleRecord
+
+SAMPLE_DTYPE = np.dtype([
+    ("timestamp", "<f8"), ("rpm", "<f4"), ("temp", "<f4"),
+    ("status", "u1"), ("rpm_status", "u1"), ("temp_status", "u1"),
+    ("rpm_filt", "<f4"), ("temp_filt", "<f4"), ("rpm_quality", "u1"), ("temp_quality", "u1"),
+])
+NO_QUALITY = 255
+
+
+class SampleRing:
+    """Ringpuffer fester Größe für die letzten capacity Samples"""
+
+    def __init__(self, capacity: int = 36000):   # 1 h bei 10 Hz, ca. 2 MB
+        self.capacity = capacity
+        self.data = np.zeros(2 * capacity, dtype=SAMPLE_DTYPE)
+        self.total = 0          # Samples seit Start (auch überschriebene)
+        self._lock = threading.Lock()
+
+    def append(self, sample):
+        """SampleRecord (oder Dict von read_sensors) einfügen – O(1)"""
+        if not isinstance(sample, SampleRecord):
+            sample = SampleRecord.from_dict(sample)
+        row = (
+            sample.timestamp if sample.timestamp is not None else np.nan, sample.rpm, sample.temp,
+            sample.status, sample.rpm_status, sample.temp_status,
+            np.nan if sample.rpm_filt is None else sample.rpm_filt,
+            np.nan if sample.temp_filt is None else sample.temp_filt,
+            NO_QUALITY if sample.rpm_quality is None else sample.rpm_quality,
+            NO_QUALITY if sample.temp_quality is None else sample.temp_quality,
+        )
+        with self._lock:
+            position = self.total % self.capacity
+            self.data[position] = row
+            self.data[position + self.capacity] = row
+            self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def view(self, last: Optional[int] = None) -> np.ndarray:
+        """Die letzten last Samples (älteste zuerst) als View auf den Puffer"""
+        with self._lock:
+            count = len(self) if last is None else min(last, len(self))
+            end = self.total % self.capacity + (self.capacity if self.total >= self.capacity else 0)
+            return self.data[end - count:end]
+
+    def columns(self, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Wie view(), aber als Spalten-Dict (kompatibel zu session_log, ohne Kopie)"""
+        rows = self.view(last)
+        return {name: rows[name] for name in SAMPLE_DTYPE.names}
+
+    def since(self, seconds: float) -> Dict[str, np.ndarray]:
+        """Spalten der Samples der letzten seconds Sekunden"""
+        rows = self.view()
+        if not len(rows):
+            return self.columns(0)
+        start = np.searchsorted(rows["timestamp"], rows["timestamp"][-1] - seconds)
+        return {name: rows[name][start:] for name in SAMPLE_DTYPE.names}
+
+    def latest(self) -> Optional[SampleRecord]:
+        rows = self.view(1)
+        if not len(rows):
+            return None
+        row = rows[0]
+        record = SampleRecord(float(row["rpm"]), float(row["temp"]), int(row["status"]),
+                              int(row["rpm_status"]), int(row["temp_status"]), float(row["timestamp"]))
+        if not np.isnan(row["rpm_filt"]):
+            record.rpm_filt = float(row["rpm_filt"])
+        if not np.isnan(row["temp_filt"]):
+            record.temp_filt = float(row["temp_filt"])
+        if row["rpm_quality"] != NO_QUALITY:
+            record.rpm_quality = int(row["rpm_quality"])
+        if row["temp_quality"] != NO_QUALITY:
+            record.temp_quality = int(row["temp_quality"])
+        return record
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+ZX6R Runden und Segmente
+Zerlegt eine lange Session (Trackday) in Abschnitte:
+
+    boxenstopp   Drehzahl unter 2000 U/min (oder keine Verbindung) ≥ 60 s
+    leerlauf     dasselbe, 10–60 s (Ampel, Stau, Warten an der Boxenausfahrt)
+    runde        eine Runde – die Drehzahlkurve wiederholt sich
+    teilrunde    Rest eines Turns, deutlich kürzer als eine Runde
+    fahrt        Turn ohne erkennbare Wiederholung (Landstraße, Prüfstand)
+
+Die Rundenzeit kommt aus der Autokorrelation der Drehzahl (per FFT) über
+einen Turn. Die Rundengrenzen werden danach einzeln nachgeschoben: der
+Anfang der ersten Runde (Boxenausfahrt) wird per Kreuzkorrelation im
+Bereich ±15 % um die erwartete Grenze wiedergefunden.
+
+Ergebnis ist ein Segment-Index pro Session (JSON im Cache der abgeleiteten
+Kanäle, Schlüssel wie dort: Inhalts-Hash der Session + Algorithmus-Version)
+mit Statistik pro Abschnitt. Rundenvergleiche und beste Runden kommen aus
+dem Index, ohne die Rohdaten neu zu lesen.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from derived_channels import CACHE_DIR, DerivedStore
+from pull_analysis import _runs, moving_average
+from session_log import STATUS_CODES, find_sessions, load_session
+
+DT = 0.1                # Raster für die Mustersuche (10 Hz wie der Logger)
+SMOOTH_S = 1.0
+IDLE_RPM = 2000.0
+MIN_IDLE_S = 10.0
+PIT_MIN_S = 60.0
+MAX_GAP_S = 2.0         # größere Lücken im Log zählen als Stillstand
+MIN_LAP_S = 40.0
+MAX_LAP_S = 300.0
+MIN_CORRELATION = 0.3   # Autokorrelation, ab der eine Rundenzeit gilt
+LAP_TOLERANCE = 0.15    # Runden dürfen so viel kürzer/länger sein
+SIGNATURE_S = 30.0      # Länge des Rundenanfangs für die Grenzsuche
+
+OFFLINE_STATUS = ("disconnected", "parse_error", "read_error")
+
+
+def _uniform(columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Drehzahl auf gleichmäßiges Raster → (Zeit, geglättete RPM, offline)"""
+    t = columns["timestamp"]
+    grid = np.arange(t[0], t[-1] + DT / 2, DT)
+    offline_codes = np.array([STATUS_CODES[s] for s in OFFLINE_STATUS], dtype=np.uint8)
+    online = ~np.isin(columns["rpm_status"], offline_codes)
+
+    rpm = np.where(online, columns["rpm"], 0.0).astype(np.float64)
+    rpm_grid = np.interp(grid, t, rpm)
+    # Rasterpunkte in Log-Lücken → Stillstand
+    position = np.searchsorted(t, grid, side="right")
+    previous = t[np.maximum(position - 1, 0)]
+    following = t[np.minimum(position, len(t) - 1)]
+    offline = (following - previous > MAX_GAP_S) | ~online[np.maximum(position - 1, 0)]
+    rpm_grid[offline] = 0.0
+    return grid, moving_average(rpm_grid, int(round(SMOOTH_S / DT))), offline
+
+
+def find_period(rpm: np.ndarray) -> Tuple[Optional[int], float]:
+    """Rundenzeit in Rasterschritten über die Autokorrelation → (Periode, Korrelation)"""
+    n = len(rpm)
+    lo, hi = int(MIN_LAP_S / DT), min(int(MAX_LAP_S / DT), n // 2)
+    if hi <= lo + 2:
+        return None, 0.0
+    x = rpm - rpm.mean()
+    size = 1 << int(np.ceil(np.log2(2 * n)))
+    spectrum = np.fft.rfft(x, size)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+    if acf[0] <= 0:
+        return None, 0.0
+    # Normiert und erwartungstreu (weniger überlappende Samples bei großen Lags)
+    acf = acf / acf[0] * n / (n - np.arange(n))
+
+    lags = np.arange(lo + 1, hi - 1)
+    peaks = lags[(acf[lags] > acf[lags - 1]) & (acf[lags] >= acf[lags + 1])]
+    if not len(peaks):
+        return None, 0.0
+    best = int(peaks[np.argmax(acf[peaks])])
+    # Vielfache der Runde (2×, 3×, …) gewinnen durch die Gewichtung bei großen Lags
+    # leicht: kleinsten Teiler best/k nehmen, dessen Maximum fast so hoch ist.
+    # Oberwellen der Drehzahlkurve erzeugen auch Maxima bei Bruchteilen einer
+    # Runde (z.B. 3/5) – echt ist der Teiler nur, wenn auch jedes seiner
+    # Vielfachen bis best ein ähnlich hohes Maximum hat.
+    strongest = acf[best]
+
+    def strong_peak(lag: float, width: float) -> Optional[int]:
+        near = peaks[np.abs(peaks - lag) <= width]
+        if not len(near) or acf[near].max() < 0.85 * strongest:
+            return None
+        return int(near[np.argmax(acf[near])])
+
+    for k in range(best // lo, 1, -1):
+        candidate = strong_peak(best / k, best / k * 0.05)
+        if candidate is not None and all(strong_peak(m * candidate, candidate * 0.05) is not None
+                                         for m in range(2, k)):
+            best = candidate
+            break
+    if acf[best] < MIN_CORRELATION:
+        return None, float(acf[best])
+    return best, float(acf[best])
+
+
+def _correlation(windows: np.ndarray, signature: np.ndarray) -> np.ndarray:
+    """Pearson-Korrelation jeder Fensterzeile mit der Signatur"""
+    w = windows - windows.mean(axis=1, keepdims=True)
+    s = signature - signature.mean()
+    norm = np.sqrt((w * w).sum(axis=1) * (s * s).sum())
+    return np.where(norm > 0, w @ s / np.where(norm > 0, norm, 1), 0.0)
+
+
+def split_laps(rpm: np.ndarray, period: int) -> Tuple[List[int], List[float]]:
+    """Rundengrenzen (Rasterindizes, inkl. Ende) und Ähnlichkeit pro Runde"""
+    n = len(rpm)
+    width = min(period // 2, int(SIGNATURE_S / DT))
+    signature = rpm[:width]
+    tolerance = int(period * LAP_TOLERANCE)
+    windows = np.lib.stride_tricks.sliding_window_view(rpm, width)
+
+    bounds, scores = [0], []
+    while True:
+        expected = bounds[-1] + period
+        lo, hi = expected - tolerance, min(expected + tolerance, n - width)
+        if lo > hi:
+            break
+        match = _correlation(windows[lo:hi + 1], signature)
+        bounds.append(lo + int(np.argmax(match)))
+        scores.append(float(match.max()))
+    if bounds[-1] < n:
+        bounds.append(n)
+        scores.append(float("nan"))
+    return bounds, scores
+
+
+def _segment_stats(columns: Dict[str, np.ndarray], start: float, end: float) -> dict:
+    """Statistik der Rohdaten zwischen start und end (Sekunden seit Logbeginn)"""
+    t = columns["timestamp"]
+    i0, i1 = (int(i) for i in np.searchsorted(t - t[0], [start, end]))
+    stats = {"i0": i0, "i1": i1}
+    if i1 <= i0:
+        return stats
+    ok = STATUS_CODES["ok"]
+    rpm = columns["rpm"][i0:i1]
+    rpm_ok = rpm[columns["rpm_status"][i0:i1] == ok]
+    temp = columns["temp"][i0:i1][columns["temp_status"][i0:i1] == ok]
+    dt = np.diff(t[i0:i1], append=t[i1 - 1])
+    dt = np.where((dt > 0) & (dt <= MAX_GAP_S), dt, 0.0)
+    if len(rpm_ok):
+        stats.update(rpm_max=round(float(rpm_ok.max()), 1), rpm_mittel=round(float(rpm_ok.mean()), 1))
+    if len(temp):
+        stats.update(temp_start=round(float(temp[0]), 1), temp_ende=round(float(temp[-1]), 1),
+                     temp_max=round(float(temp.max()), 1))
+    above = (rpm >= 10000) & (columns["rpm_status"][i0:i1] == ok)
+    stats["zeit_ueber_10000"] = round(float(dt[above].sum()), 1)
+    return stats
+
+
+def detect_segments(columns: Dict[str, np.ndarray]) -> List[dict]:
+    """Session in Boxenstopps, Leerlauf, Runden und Fahrten zerlegen"""
+    if len(columns["timestamp"]) < 2:
+        return []
+    grid, rpm, offline = _uniform(columns)
+    n = len(grid)
+    still = (rpm < IDLE_RPM) | offline
+    starts, ends = _runs(still)
+    keep = (ends - starts) * DT >= MIN_IDLE_S
+    pauses = list(zip(starts[keep], ends[keep]))
+
+    raw: List[Tuple[str, int, int, dict]] = []
+    position = 0
+    for pause_start, pause_end in pauses + [(n, n)]:
+        if pause_start > position:
+            raw.extend(_split_stint(rpm[position:pause_start], position))
+        if pause_end > pause_start:
+            kind = "boxenstopp" if (pause_end - pause_start) * DT >= PIT_MIN_S else "leerlauf"
+            raw.append((kind, pause_start, pause_end, {}))
+        position = pause_end
+
+    segments = []
+    lap_number = 0
+    for kind, lo, hi, extra in raw:
+        start, end = lo * DT, hi * DT
+        segment = {"art": kind, "start": round(start, 1), "dauer": round(end - start, 1)}
+        if kind == "runde":
+            lap_number += 1
+            segment["runde"] = lap_number
+        segment.update(extra)
+        segment.update(_segment_stats(columns, start, end))
+        segments.append(segment)
+    return segments
+
+
+def _split_stint(rpm: np.ndarray, offset: int) -> List[Tuple[str, int, int, dict]]:
+    """Turn zwischen zwei Pausen in Runden zerlegen (oder als Fahrt lassen)"""
+    period, correlation = find_period(rpm)
+    if period is None:
+        return [("fahrt", offset, offset + len(rpm), {})]
+    bounds, scores = split_laps(rpm, period)
+    parts = []
+    for lo, hi, score in zip(bounds[:-1], bounds[1:], scores):
+        full = hi - lo >= period * (1 - LAP_TOLERANCE)
+        extra = {"rundenzeit_turn": round(period * DT, 1)}
+        if not np.isnan(score):
+            extra["aehnlichkeit"] = round(score, 3)
+        parts.append(("runde" if full else "teilrunde", offset + lo, offset + hi, extra))
+    return parts
+
+
+@lru_cache(maxsize=1)
+def algorithm_version() -> str:
+    """Hash über Erkennungscode und Parameter – ändert sich einer, wird neu indiziert"""
+    digest = hashlib.blake2b(digest_size=8)
+    for func in (_uniform, find_period, _correlation, split_laps, _segment_stats,
+                 detect_segments, _split_stint, moving_average, _runs):
+        digest.update(inspect.getsource(func).encode())
+    params = (DT, SMOOTH_S, IDLE_RPM, MIN_IDLE_S, PIT_MIN_S, MAX_GAP_S, MIN_LAP_S, MAX_LAP_S,
+              MIN_CORRELATION, LAP_TOLERANCE, SIGNATURE_S, OFFLINE_STATUS)
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
+class SegmentIndex:
+    """Segment-Index pro Session, neben den abgeleiteten Kanälen gespeichert"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.store = DerivedStore(cache_dir)
+
+    def _index_path(self, path: str) -> str:
+        source = self.store.source_hash(path)
+        return os.path.join(self.store.cache_dir, source, f"segments-{algorithm_version()}.json")
+
+    def index(self, path: str) -> dict:
+        """Index einer Session (aus dem Cache oder neu erkannt)"""
+        index_path = self._index_path(path)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                return json.load(f)
+
+        columns = load_session(path)
+        index = {
+            "session": os.path.basename(path),
+            "version": algorithm_version(),
+            "samples": int(len(columns["timestamp"])),
+            "segmente": detect_segments(columns),
+        }
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, index_path)
+        self.store._save_hashes()
+        return index
+
+    def laps(self, path: str) -> List[dict]:
+        return [s for s in self.index(path)["segmente"] if s["art"] == "runde"]
+
+    def best_laps(self, paths: Iterable[str]) -> List[Tuple[str, dict]]:
+        """Schnellste Runde jeder Session, schnellste zuerst"""
+        best = []
+        for path in paths:
+            laps = self.laps(path)
+            if laps:
+                best.append((path, min(laps, key=lambda lap: lap["dauer"])))
+        return sorted(best, key=lambda item: item[1]["dauer"])
+
+    def samples(self, path: str, segment: dict) -> Dict[str, np.ndarray]:
+        """Rohdaten eines Segments (nur wenn Kurven gebraucht werden)"""
+        columns = load_session(path)
+        return {name: values[segment["i0"]:segment["i1"]] for name, values in columns.items()}
+
+
+def compare_laps(lap: dict, reference: dict) -> dict:
+    """Unterschiede einer Runde zur Referenzrunde (aus dem Index)"""
+    delta = {"dauer": round(lap["dauer"] - reference["dauer"], 1)}
+    for key in ("rpm_max", "rpm_mittel", "temp_max", "zeit_ueber_10000"):
+        if key in lap and key in reference:
+            delta[key] = round(lap[key] - reference[key], 1)
+    return delta
+
+
+def format_laptime(seconds: float) -> str:
+    minutes, rest = divmod(seconds, 60)
+    return f"{int(minutes)}:{rest:04.1f}"
+
+
+def print_session(path: str, index: dict):
+    segments = index["segmente"]
+    laps = [s for s in segments if s["art"] == "runde"]
+    best = min(laps, key=lambda lap: lap["dauer"]) if laps else None
+    print(f"\n📁 {index['session']}: {len(laps)} Runden, "
+          f"{sum(s['art'] == 'boxenstopp' for s in segments)} Boxenstopps")
+    for segment in segments:
+        if segment["art"] == "runde":
+            delta = compare_laps(segment, best)
+            marker = "🏆" if segment is best else f"+{delta['dauer']:.1f} s"
+            temp = f"{segment['temp_start']:.0f}→{segment['temp_ende']:.0f} °C" if "temp_start" in segment else ""
+            print(f"   Runde {segment['runde']:2d}  {format_laptime(segment['dauer'])}  {marker:>9s}  "
+                  f"max {segment.get('rpm_max', 0):5.0f} U/min  {temp}")
+        elif segment["art"] == "boxenstopp":
+            print(f"   🅿️ Boxenstopp {format_laptime(segment['dauer'])}")
+        elif segment["art"] == "fahrt":
+            print(f"   🛣️ Fahrt {format_laptime(segment['dauer'])} (keine Runden erkannt)")
+
+
+def check_periods(lap_s: float = 92.0, seed: int = 0) -> bool:
+    """Rundenzeit-Erkennung auf synthetischen Turns prüfen (Streckenprofil und Oberwellen)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(0, lap_s, DT)
+    knots = np.array([0, 8, 12, 20, 25, 33, 40, 46, 55, 60, 70, 78, 84, 92.0]) / 92.0 * lap_s
+    profiles = {
+        "Strecke": np.interp(t, knots, [6000, 12000, 6500, 11000, 5500, 9000, 7000,
+                                        12500, 6000, 10000, 5000, 11500, 7500, 6000]),
+        # Starke 5./7. Oberwelle: Maxima bei 3/5 bzw. 4/7 Runde sind fast so hoch
+        "Oberwellen 2+5": 8000 + 750 * np.sin(4 * np.pi * t / lap_s) + 1500 * np.sin(10 * np.pi * t / lap_s + 1),
+        "Oberwellen 3+5": 8000 + 1500 * np.sin(6 * np.pi * t / lap_s) + 3000 * np.sin(10 * np.pi * t / lap_s + 1),
+        "Oberwellen 2+7": 8000 + 750 * np.sin(4 * np.pi * t / lap_s) + 1500 * np.sin(14 * np.pi * t / lap_s + 1),
+    }
+    ok = True
+    for name, lap in profiles.items():
+        for laps in (3, 4, 6, 8):
+            rpm = np.tile(lap, laps) + rng.normal(0, 150, len(lap) * laps)
+            period, correlation = find_period(moving_average(rpm, int(round(SMOOTH_S / DT))))
+            found = None if period is None else period * DT
+            good = found is not None and abs(found - lap_s) <= lap_s * 0.03
+            ok &= good
+            print(f"   {'✅' if good else '❌'} {name:16s} {laps} Runden: "
+                  f"{format_laptime(found) if found else '–':>8s} (r = {correlation:.2f})")
+    return ok
+
+
+def main():
+    """Aufruf: python segments.py [session ...] – ohne Angabe alle Sessions im Ordner
+
+    python segments.py --check prüft die Rundenzeit-Erkennung auf synthetischen Daten.
+    """
+    if "--check" in sys.argv:
+        sys.exit(0 if check_periods() else 1)
+    paths = sys.argv[1:] or find_sessions(".")
+    if not paths:
+        print("📭 Keine Sessions gefunden")
+        return
+    segment_index = SegmentIndex()
+    for path in paths:
+        print_session(path, segment_index.index(path))
+
+    best = segment_index.best_laps(paths)
+    if len(best) > 1:
+        print("\n🏁 Beste Runde pro Session:")
+        reference = best[0][1]
+        for path, lap in best:
+            marker = "🏆" if lap is reference else f"+{compare_laps(lap, reference)['dauer']:.1f} s"
+            print(f"   {os.path.basename(path):40s} {format_laptime(lap['dauer'])}  {marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+ZX6R Session-Logs einlesen
+Liest die Logs von start_continuous_logging() blockweise als NumPy-Arrays,
+wahlweise CSV oder komprimiert (.zxl, siehe compressed_log.py).
+"""
+
+import csv
+import glob
+import os
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+# Status-Strings → kompakte Codes (unbekannte Werte landen bei "unknown")
+from status_codes import STATUS_CODES, STATUS_NAMES
+
+# Spalten wie in start_continuous_logging() geschrieben
+COLUMNS = ("timestamp", "rpm", "temp", "rpm_status", "temp_status")
+
+
+def _empty_chunk() -> Dict[str, list]:
+    return {name: [] for name in COLUMNS}
+
+
+def _to_arrays(rows: Dict[str, list]) -> Dict[str, np.ndarray]:
+    """Spaltenlisten in typisierte Arrays umwandeln"""
+    unknown = STATUS_CODES["unknown"]
+    return {
+        "timestamp": np.asarray(rows["timestamp"], dtype=np.float64),
+        "rpm": np.asarray(rows["rpm"], dtype=np.float32),
+        "temp": np.asarray(rows["temp"], dtype=np.float32),
+        "rpm_status": np.asarray([STATUS_CODES.get(s, unknown) for s in rows["rpm_status"]], dtype=np.uint8),
+        "temp_status": np.asarray([STATUS_CODES.get(s, unknown) for s in rows["temp_status"]], dtype=np.uint8),
+    }
+
+
+def iter_chunks(path: str, chunk_size: int = 65536) -> Iterator[Dict[str, np.ndarray]]:
+    """Liefert eine Session in Blöcken von chunk_size Zeilen (Speicherbedarf bleibt konstant)
+
+    .zxl-Dateien werden in ihren eigenen Blockgrößen geliefert.
+    """
+    if path.endswith(".zxl"):
+        from compressed_log import CompressedLogReader
+        with CompressedLogReader(path) as reader:
+            yield from reader.iter_blocks()
+        return
+
+    rows = _empty_chunk()
+    count = 0
+    with open(path, newline="") as f:
+        for record in csv.DictReader(f):
+            try:
+                timestamp = float(record["timestamp"])
+                rpm = float(record["rpm"])
+                temp = float(record["temp"])
+            except (TypeError, ValueError):
+                continue  # abgebrochene Zeile am Dateiende o.ä.
+            rows["timestamp"].append(timestamp)
+            rows["rpm"].append(rpm)
+            rows["temp"].append(temp)
+            rows["rpm_status"].append(record.get("rpm_status") or "unknown")
+            rows["temp_status"].append(record.get("temp_status") or "unknown")
+            count += 1
+            if count >= chunk_size:
+                yield _to_arrays(rows)
+                rows = _empty_chunk()
+                count = 0
+    if count:
+        yield _to_arrays(rows)
+
+
+def load_session(path: str) -> Dict[str, np.ndarray]:
+    """Komplette Session als Spalten-Arrays"""
+    chunks = list(iter_chunks(path))
+    if not chunks:
+        return _to_arrays(_empty_chunk())
+    return {name: np.concatenate([c[name] for c in chunks]) for name in COLUMNS}
+
+
+def find_sessions(directory: str = ".") -> List[str]:
+    """Alle Session-Logs eines Verzeichnisses, älteste zuerst (.zxl vor gleichnamiger .csv)"""
+    sessions = {}
+    for pattern in ("zx6r_original_*.csv", "zx6r_original_*.zxl"):
+        for path in glob.glob(os.path.join(directory, pattern)):
+            sessions[os.path.splitext(path)[0]] = path
+    return [sessions[base] for base in sorted(sessions)]
+
+
+def save_session(path: str, columns: Dict[str, np.ndarray]):
+    """Spalten-Arrays als Session schreiben (.csv oder .zxl), ersetzt die Datei atomar"""
+    tmp_path = path + ".tmp"
+    if path.endswith(".zxl"):
+        from compressed_log import CompressedLogWriter
+        with CompressedLogWriter(tmp_path) as writer:
+            writer.write_chunk(columns)
+    else:
+        with open(tmp_path, "w") as f:
+            f.write(",".join(COLUMNS) + "\n")
+            rpm_status = [STATUS_NAMES[c] for c in columns["rpm_status"].tolist()]
+            temp_status = [STATUS_NAMES[c] for c in columns["temp_status"].tolist()]
+            f.writelines(
+                f"{t},{int(r)},{round(float(tc), 1)},{rs},{ts}\n"
+                for t, r, tc, rs, ts in zip(columns["timestamp"].tolist(), columns["rpm"].tolist(),
+                                             columns["temp"].tolist(), rpm_status, temp_status)
+            )
+    os.replace(tmp_path, path)
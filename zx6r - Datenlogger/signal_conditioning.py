@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+ZX6R Signalaufbereitung
+Sitzt zwischen read_sensors() und den Abnehmern auf dem Sample-Bus und
+ergänzt jedes Sample um gefilterte Kanäle – die Rohwerte bleiben erhalten:
+
+    rpm / temp                  Rohwert wie vom ESP32
+    rpm_filt / temp_filt        gefiltert (Alpha-Beta-Filter)
+    rpm_quality / temp_quality  "ok", "spike" oder "dropout"
+
+Pro Kanal und Sample konstanter Aufwand:
+  - gleitender Median über die letzten gültigen Werte
+  - Spike: Rohwert weicht mehr als "spike" vom Median ab → Filter läuft
+    mit seiner Vorhersage weiter, der Messwert wird ignoriert
+  - Dropout: Sensorfehler/keine Verbindung (Status), Wert außerhalb des
+    plausiblen Bereichs oder 0 U/min kurz nach hoher Drehzahl (bleibt die
+    Drehzahl länger unten, ist der Motor wirklich aus) → Filter hält den
+    letzten Wert
+  - Alpha-Beta-Filter (stationärer Kalman-Filter für Wert + Änderungsrate)
+
+condition_columns() macht dasselbe vektorisiert für ganze Sessions
+(z.B. alte Logs oder .zxl-Archive, die nur Rohwerte speichern).
+"""
+
+import bisect
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from status_codes import QUALITY_CODES, QUALITY_NAMES, STATUS_CODES  # noqa: F401
+
+# Status, bei denen der Wert nur der letzte gültige ist (read_sensors-Fallback)
+BAD_STATUS = ("sensor_error", "unknown", "disconnected", "parse_error", "read_error")
+
+DEFAULT_CONFIG = {
+    "rpm": {
+        "median": 5, "alpha": 0.5, "beta": 0.1, "spike": 2500.0,
+        "min": 0.0, "max": 15000.0,
+        # unter 500 U/min innerhalb von 15 Samples nach > 1500 U/min = Signalaussetzer
+        "dropout_below": 500.0, "dropout_after": 1500.0, "dropout_hold": 15,
+    },
+    "temp": {
+        "median": 5, "alpha": 0.3, "beta": 0.02, "spike": 5.0,
+        "min": -20.0, "max": 150.0,
+    },
+}
+
+
+class ChannelFilter:
+    """Median, Klassifikation und Alpha-Beta-Filter für einen Kanal"""
+
+    def __init__(self, config: dict, dt: float = 0.1):
+        self.config = config
+        self.dt = dt
+        self.window = deque()
+        self.sorted_window = []
+        self.x: Optional[float] = None   # gefilterter Wert
+        self.v = 0.0                     # Änderungsrate pro Sekunde
+        self.count = 0
+        self.last_high = None            # Index des letzten Werts über dropout_after
+
+    def median(self) -> float:
+        values = self.sorted_window
+        mid = len(values) // 2
+        return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+    def _push(self, value: float):
+        self.window.append(value)
+        bisect.insort(self.sorted_window, value)
+        if len(self.window) > self.config["median"]:
+            old = self.window.popleft()
+            del self.sorted_window[bisect.bisect_left(self.sorted_window, old)]
+
+    def classify(self, value: float, status_ok: bool) -> str:
+        """Klassifizieren und gültige Werte ins Medianfenster übernehmen"""
+        cfg = self.config
+        index = self.count
+        self.count += 1
+        if not status_ok or not cfg["min"] <= value <= cfg["max"]:
+            return "dropout"
+        if "dropout_below" in cfg:
+            if value >= cfg["dropout_after"]:
+                self.last_high = index
+            elif (value < cfg["dropout_below"] and self.last_high is not None
+                  and index - self.last_high <= cfg["dropout_hold"]):
+                return "dropout"
+        self._push(value)
+        return "spike" if abs(value - self.median()) > cfg["spike"] else "ok"
+
+    def update(self, value: float, status_ok: bool = True):
+        """Ein Sample verarbeiten → (gefilterter Wert oder None, Qualität)"""
+        quality = self.classify(value, status_ok)
+        if quality == "ok" and self.x is None:
+            self.x, self.v = value, 0.0
+        elif self.x is not None:
+            if quality == "ok":
+                predicted = self.x + self.v * self.dt
+                residual = value - predicted
+                self.x = predicted + self.config["alpha"] * residual
+                self.v += self.config["beta"] * residual / self.dt
+            elif quality == "spike":
+                self.x += self.v * self.dt
+            else:
+                self.v = 0.0
+        return self.x, quality
+
+
+class SignalConditioner:
+    """Ergänzt Samples um gefilterte Kanäle (für AcquisitionPump)"""
+
+    def __init__(self, config: Optional[Dict[str, dict]] = None, dt: float = 0.1):
+        self.config = config or DEFAULT_CONFIG
+        self.channels = {name: ChannelFilter(cfg, dt) for name, cfg in self.config.items()}
+        self.counts = {name: {q: 0 for q in QUALITY_CODES} for name in self.channels}
+
+    def process(self, sample: dict) -> dict:
+        for name, channel in self.channels.items():
+            status = sample.get(f"{name}_status", sample.get("status"))
+            filtered, quality = channel.update(float(sample[name]), status not in BAD_STATUS)
+            sample[f"{name}_filt"] = round(filtered, 1) if filtered is not None else None
+            sample[f"{name}_quality"] = quality
+            self.counts[name][quality] += 1
+        return sample
+
+
+def _impulse_response(alpha: float, beta: float, dt: float, tol: float = 1e-9) -> np.ndarray:
+    """Impulsantwort des Alpha-Beta-Filters (linear, solange keine Spikes/Dropouts)"""
+    gain = np.array([alpha, beta / dt])
+    transition = (np.eye(2) - np.outer(gain, [1.0, 0.0])) @ np.array([[1.0, dt], [0.0, 1.0]])
+    response, state = [], gain.copy()
+    while len(response) < 10000:
+        response.append(state[0])
+        if len(response) > 10 and np.abs(state).max() < tol:
+            break
+        state = transition @ state
+    return np.array(response)
+
+
+def _rolling_median(values: np.ndarray, window: int) -> np.ndarray:
+    """Median über die letzten window Werte (am Anfang über weniger, wie im Stream)"""
+    if not len(values):
+        return values.astype(np.float64)
+    padded = np.concatenate((np.full(window - 1, np.nan), values.astype(np.float64)))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    result = np.median(windows, axis=1)
+    for i in range(min(window - 1, len(values))):
+        result[i] = np.median(values[:i + 1])
+    return result
+
+
+def condition_channel(values: np.ndarray, status_ok: np.ndarray, config: dict, dt: float = 0.1):
+    """Vektorisierte Variante von ChannelFilter → (gefiltert, Qualitätscodes)
+
+    Klassifikation und Median entsprechen dem Stream exakt. Vor dem Filtern
+    werden Spikes linear überbrückt und Dropouts mit dem letzten guten Wert
+    gefüllt; danach ist der Filter linear und läuft als Faltung.
+    """
+    values = values.astype(np.float64)
+    n = len(values)
+    quality = np.full(n, QUALITY_CODES["dropout"], dtype=np.uint8)
+    filtered = np.full(n, np.nan)
+
+    valid = status_ok & (values >= config["min"]) & (values <= config["max"])
+    if "dropout_below" in config:
+        high = valid & (values >= config["dropout_after"])
+        last_high = np.maximum.accumulate(np.where(high, np.arange(n), -1))
+        since_high = np.arange(n) - last_high
+        valid &= ~((values < config["dropout_below"]) & (last_high >= 0)
+                   & (since_high <= config["dropout_hold"]))
+    idx = np.flatnonzero(valid)
+    if not len(idx):
+        return filtered, quality
+
+    median = _rolling_median(values[idx], config["median"])
+    spike = np.abs(values[idx] - median) > config["spike"]
+    quality[idx] = np.where(spike, QUALITY_CODES["spike"], QUALITY_CODES["ok"])
+
+    good = idx[~spike]
+    if not len(good):
+        return filtered, quality
+    start = good[0]
+    positions = np.arange(start, n)
+    clean = np.interp(positions, good, values[good])
+    # Dropouts: letzten guten Wert halten statt überbrücken (wie der Stream)
+    held = values[good[np.searchsorted(good, positions, side="right") - 1]]
+    dropout = quality[start:] == QUALITY_CODES["dropout"]
+    clean[dropout] = held[dropout]
+
+    response = _impulse_response(config["alpha"], config["beta"], dt)
+    lead = len(response)
+    padded = np.concatenate((np.full(lead, clean[0]), clean))
+    filtered[start:] = np.convolve(padded, response)[lead:lead + len(clean)]
+    return filtered, quality
+
+
+def condition_columns(columns: Dict[str, np.ndarray], config: Optional[Dict[str, dict]] = None,
+                      dt: float = 0.1) -> Dict[str, np.ndarray]:
+    """Ganze Session aufbereiten → {rpm_filt, rpm_quality, temp_filt, temp_quality}"""
+    config = config or DEFAULT_CONFIG
+    bad = np.array([STATUS_CODES[s] for s in BAD_STATUS], dtype=np.uint8)
+    result = {}
+    for name, cfg in config.items():
+        status_ok = ~np.isin(columns[f"{name}_status"], bad)
+        filtered, quality = condition_channel(columns[name], status_ok, cfg, dt)
+        result[f"{name}_filt"] = filtered.astype(np.float32)
+        result[f"{name}_quality"] = quality
+    return result
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+ZX6R Status-Codes
+Kompakte Codes für Kanal-Status, Verbindungsstatus und Signalqualität.
+Ohne NumPy, damit der einfache Logger (data_logger.py) ohne Analyse-Pakete
+läuft; session_log, signal_conditioning und sample_record importieren
+die Tabellen von hier.
+"""
+
+# Status-Strings → kompakte Codes (unbekannte Werte landen bei "unknown").
+# Die letzten drei stehen im Log, wenn read_sensors() gar keine Messung hatte.
+STATUS_CODES = {"ok": 0, "idle_or_error": 1, "sensor_error": 2, "unknown": 3,
+                "disconnected": 4, "parse_error": 5, "read_error": 6}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Verbindungsstatus teilt sich die Codes mit den Kanal-Status ("connected" = ok)
+CONNECTION_CODES = {"connected": STATUS_CODES["ok"], "disconnected": STATUS_CODES["disconnected"],
+                    "parse_error": STATUS_CODES["parse_error"], "read_error": STATUS_CODES["read_error"]}
+CONNECTION_NAMES = {code: name for name, code in CONNECTION_CODES.items()}
+
+# Qualität aus der Signalaufbereitung
+QUALITY_CODES = {"ok": 0, "spike": 1, "dropout": 2}
+QUALITY_NAMES = {code: name for name, code in QUALITY_CODES.items()}
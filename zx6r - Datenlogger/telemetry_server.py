@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+ZX6R Telemetrie-Server
+Lokaler HTTP/JSON-Dienst für Boxen-Laptop und Handys.
+
+Stellt NGKAnalyzer, ZX6RApp-Setups/Kurven und Live-Daten des
+OriginalSensorReader bereit. Die Live-Daten kommen als Abnehmer vom
+Sample-Bus (sample_bus.py): entweder von einem vorhandenen Bus, an dem auch
+Logger und Alarme hängen, oder von einer eigenen Erfassung. Die serielle
+Schnittstelle wird so nur einmal abgefragt; alle Clients bekommen die
+Samples per Server-Sent Events aus dieser einen Quelle.
+
+Endpunkte:
+    GET /                       Mini-Dashboard
+    GET /api/ngk/analyze?d=CR9EK
+    GET /api/ngk/waermewerte
+    GET /api/zx6r/setups
+    GET /api/zx6r/curves
+    GET /api/live               letztes Sample
+    GET /api/live/stream        Server-Sent Events
+    GET /api/live/history?s=60  letzte s Sekunden als Spalten (aus dem SampleRing)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import tool_paths  # noqa: F401  (macht NGK- und Tuning-Ordner importierbar)
+from ngk_terminal_analyzer import NGKAnalyzer
+from sample_bus import AcquisitionPump, Consumer, SampleBus
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html lang="de"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>ZX6R Live</title>
+<style>
+body { font-family: sans-serif; background: #111; color: #eee; text-align: center; }
+.wert { font-size: 3em; margin: 0.3em; }
+.status { color: #888; }
+</style></head>
+<body>
+<h1>🏍️ ZX6R Live</h1>
+<div class="wert" id="rpm">-- U/min</div>
+<div class="wert" id="temp">-- °C</div>
+<div class="status" id="status">verbinde...</div>
+<script>
+const source = new EventSource("/api/live/stream");
+source.onmessage = (event) => {
+  const s = JSON.parse(event.data);
+  document.getElementById("rpm").textContent = s.rpm + " U/min";
+  document.getElementById("temp").textContent = s.temp.toFixed(1) + " °C";
+  document.getElementById("status").textContent = s.status;
+};
+source.onerror = () => { document.getElementById("status").textContent = "getrennt"; };
+</script>
+</body></html>
+"""
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _json_bytes(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class TelemetryServer:
+    """asyncio HTTP-Server, Live-Daten als Abnehmer am Sample-Bus"""
+
+    def __init__(self, reader=None, host="0.0.0.0", port=8080, poll_interval=0.1,
+                 data_file="zx6r_data.json", client_queue_size=50, bus=None, ring=None):
+        self.reader = reader
+        self.bus = bus
+        self.ring = ring          # SampleRing für /api/live/history (eigene Erfassung legt einen an)
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.data_file = data_file
+        self.client_queue_size = client_queue_size
+
+        self.analyzer = NGKAnalyzer()
+        self.latest: Optional[bytes] = None       # letztes Sample, fertig serialisiert
+        self.clients: Set[asyncio.Queue] = set()
+        self._server = None
+        self._pump = None
+        self._subscription = None
+
+        # Vorberechnete Antworten (ändern sich nicht zur Laufzeit)
+        self._static = {
+            "/": ("text/html; charset=utf-8", DASHBOARD_HTML.encode("utf-8")),
+            "/api/ngk/waermewerte": ("application/json", _json_bytes(self.analyzer.waermewerte)),
+        }
+        self._tuning_cache: Tuple[Optional[int], Dict[str, bytes]] = (None, {})
+        self._analyze = lru_cache(maxsize=1024)(self._analyze_uncached)
+
+    # ------------------------------------------------------------------
+    # Daten
+    # ------------------------------------------------------------------
+
+    def _analyze_uncached(self, designation: str) -> bytes:
+        return _json_bytes(self.analyzer.analyze_designation(designation))
+
+    def _tuning_payloads(self) -> Dict[str, bytes]:
+        """Setups und Kurven aus ZX6RApp; neu aufgebaut nur wenn zx6r_data.json sich ändert"""
+        mtime = os.stat(self.data_file).st_mtime_ns if os.path.exists(self.data_file) else 0
+        cached_mtime, payloads = self._tuning_cache
+        if cached_mtime == mtime:
+            return payloads
+
+        from zx6r_app import ZX6RApp
+        app = ZX6RApp()
+        app.data_file = self.data_file
+        app.tuning_performance = app.load_data()
+        payloads = {
+            "/api/zx6r/setups": _json_bytes({
+                "standard": app.standard_setup,
+                "tuning": app.tuning_setup,
+            }),
+            "/api/zx6r/curves": _json_bytes({
+                "standard_performance": app.standard_performance,
+                "tuning_performance": app.tuning_performance,
+                "geschwindigkeiten": app.geschwindigkeiten,
+            }),
+        }
+        self._tuning_cache = (mtime, payloads)
+        return payloads
+
+    def _start_feed(self):
+        """Abnehmer am Bus anmelden; ohne fremden Bus eigene Erfassung starten"""
+        if self.bus is None:
+            if self.reader is None:
+                return
+            self.bus = SampleBus()
+            if self.ring is None:
+                from sample_ring import SampleRing
+                self.ring = SampleRing()
+            self._pump = AcquisitionPump(self.reader, self.bus, interval=self.poll_interval, ring=self.ring)
+
+        loop = asyncio.get_running_loop()
+        self._subscription = self.bus.subscribe("server", maxsize=100, policy="drop_oldest", batch_size=20)
+
+        def forward(batch):
+            # Serialisierung im Consumer-Thread, die Event-Loop verteilt nur noch Bytes
+            for sample in batch:
+                payload = _json_bytes({k: v for k, v in sample.items() if k != "raw_response"})
+                loop.call_soon_threadsafe(self._publish, payload)
+
+        Consumer(self._subscription, forward).start()
+        if self._pump:
+            self._pump.start()
+
+    def _publish(self, payload: bytes):
+        """Sample an alle SSE-Clients verteilen; langsame Clients verlieren alte Samples"""
+        self.latest = payload
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Eine Verbindung; Keep-Alive bis der Client schließt"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, _version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"fehler": "Ungültige Anfrage"})
+                    break
+
+                url = urlsplit(target)
+                if method != "GET":
+                    await self._respond(writer, 405, {"fehler": "Nur GET"})
+                elif url.path == "/api/live/stream":
+                    await self._stream(writer)
+                    break
+                else:
+                    await self._route(writer, url.path, parse_qs(url.query))
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, writer, path: str, query: Dict):
+        if path in self._static:
+            content_type, body = self._static[path]
+            await self._respond_raw(writer, 200, content_type, body)
+        elif path == "/api/ngk/analyze":
+            designation = query.get("d", [""])[0].upper().strip()
+            if not designation:
+                await self._respond(writer, 400, {"fehler": "Parameter d fehlt"})
+            else:
+                await self._respond_raw(writer, 200, "application/json", self._analyze(designation))
+        elif path in ("/api/zx6r/setups", "/api/zx6r/curves"):
+            await self._respond_raw(writer, 200, "application/json", self._tuning_payloads()[path])
+        elif path == "/api/live":
+            if self.latest is None:
+                await self._respond(writer, 404, {"fehler": "Noch keine Daten"})
+            else:
+                await self._respond_raw(writer, 200, "application/json", self.latest)
+        elif path == "/api/live/history":
+            if self.ring is None:
+                await self._respond(writer, 404, {"fehler": "Kein Verlauf verfügbar"})
+            else:
+                try:
+                    seconds = float(query.get("s", ["60"])[0])
+                except ValueError:
+                    seconds = 60.0
+                columns = self.ring.since(seconds)
+                # NaN (kein Filterwert) ist kein gültiges JSON → null
+                await self._respond(writer, 200, {
+                    name: [None if v != v else v for v in columns[name].tolist()]
+                    for name in ("timestamp", "rpm", "temp", "rpm_filt", "temp_filt")
+                })
+        else:
+            await self._respond(writer, 404, {"fehler": "Unbekannter Pfad"})
+
+    async def _respond(self, writer, status: int, data):
+        await self._respond_raw(writer, status, "application/json", _json_bytes(data))
+
+    async def _respond_raw(self, writer, status: int, content_type: str, body: bytes):
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Access-Control-Allow-Origin: *\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _stream(self, writer):
+        """Server-Sent Events bis der Client trennt"""
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\n"
+                     b"Access-Control-Allow-Origin: *\r\n\r\n")
+        queue: asyncio.Queue = asyncio.Queue(self.client_queue_size)
+        if self.latest is not None:
+            queue.put_nowait(self.latest)
+        self.clients.add(queue)
+        try:
+            while True:
+                payload = await queue.get()
+                if payload is None:  # Server wird gestoppt
+                    break
+                writer.write(b"data: " + payload + b"\n\n")
+                await writer.drain()
+        finally:
+            self.clients.discard(queue)
+
+    # ------------------------------------------------------------------
+    # Start/Stop
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Server und Erfassung starten"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._start_feed()
+        return self._server
+
+    async def stop(self):
+        if self._pump:
+            self._pump.stop()
+        if self._subscription:
+            self.bus.unsubscribe(self._subscription)
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        await asyncio.sleep(0)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        server = await self.start()
+        print(f"🌐 Telemetrie-Server läuft auf http://{self.host}:{self.port}/")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Server mit ESP32-Reader starten"""
+    parser = argparse.ArgumentParser(description="ZX6R Telemetrie-Server")
+    parser.add_argument("--serial", default="/dev/ttyUSB0", help="Serieller Port des ESP32")
+    parser.add_argument("--port", type=int, default=8080, help="HTTP-Port")
+    parser.add_argument("--ohne-sensor", action="store_true", help="Nur Analyzer/Tuning-Daten, keine Live-Daten")
+    args = parser.parse_args()
+
+    reader = None
+    if not args.ohne_sensor:
+        from data_logger import OriginalSensorReader
+        reader = OriginalSensorReader(serial_port=args.serial)
+
+    try:
+        asyncio.run(TelemetryServer(reader, port=args.port).serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Server gestoppt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Pfade der Schwester-Tools
+Die drei Tools liegen in eigenen Ordnern; dieses Modul macht sie importierbar.
+"""
+
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NGK_DIR = os.path.join(REPO_DIR, "NGK - Zündkerzen Configurator")
+TUNING_DIR = os.path.join(REPO_DIR, "zx6r - Motorkenndaten ")
+LOGGER_DIR = os.path.join(REPO_DIR, "zx6r - Datenlogger")
+
+for _path in (NGK_DIR, TUNING_DIR, LOGGER_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
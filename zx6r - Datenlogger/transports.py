@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+ZX6R Transporte zwischen ESP32 und Python
+Der OriginalSensorReader holt Antwortzeilen ("RPM:5500,TEMP:85.5") über
+einen austauschbaren Transport:
+
+    SerialTransport  USB-Kabel, Abfrage per "READ" (wie bisher)
+    UdpTransport     WLAN, der ESP32 schickt Stapel von Samples als Datagramme
+
+UDP-Datagramme der Firmware:
+
+    SEQ:<laufende Nummer>,BOOT:<Zufalls-ID pro Start>
+    MS:<millis>,RPM:<rpm>,TEMP:<temp>
+    MS:<millis>,RPM:<rpm>,TEMP:<temp>
+    ...
+
+Ein kleiner Jitter-Puffer bringt vertauschte Datagramme wieder in
+Reihenfolge; fehlende, vertauschte, verspätete und doppelte Datagramme
+werden gezählt. Neue BOOT-ID (oder ohne ID: SEQ springt weit zurück) =
+ESP32 neu gestartet, die Zählung beginnt von vorn. Aus MS wird die
+Messzeit auf der Laptop-Uhr (line_time), damit verlorene oder gestapelte
+Datagramme als Lücke im Log erscheinen statt als gleichmäßiger Takt.
+Läuft der Abnehmer hinterher, werden die ältesten Zeilen verworfen und
+als "overflow" gezählt.
+
+LoopbackESP32 spielt den ESP32 lokal nach (auch mit künstlichem
+Verlust/Vertauschen/Neustart) und dient zum Testen ohne Motorrad.
+"""
+
+import random
+import socket
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import serial
+
+
+def parse_millis(line: str) -> Optional[int]:
+    """MS-Feld einer Sample-Zeile ("MS:1234,RPM:..") oder None"""
+    if not line.startswith("MS:"):
+        return None
+    try:
+        return int(line[3:].split(",", 1)[0])
+    except ValueError:
+        return None
+
+
+class SerialTransport:
+    """USB-Serial wie bisher: READ senden, eine Zeile lesen"""
+
+    line_time = None  # Antwort kommt sofort, Zeitstempel setzt die AcquisitionPump
+
+    def __init__(self, port="/dev/ttyUSB0", baudrate=115200, timeout=2):
+        self.connection = serial.Serial(port, baudrate, timeout=timeout)
+
+    def request_line(self) -> str:
+        self.connection.write(b"READ\n")
+        self.connection.flush()
+        return self.connection.readline().decode().strip()
+
+    def close(self):
+        self.connection.close()
+
+
+class UdpTransport:
+    """Empfängt Sample-Stapel per UDP; request_line() liefert sie der Reihe nach"""
+
+    def __init__(self, host="0.0.0.0", port=4210, timeout=2.0, reorder_window=4, max_backlog=1000):
+        self.timeout = timeout
+        self.reorder_window = reorder_window
+        self.connection = None  # kein serieller Zugriff (DUMP nur über USB)
+
+        self.stats = {"datagrams": 0, "samples": 0, "lost": 0, "reordered": 0, "late": 0, "duplicates": 0,
+                      "restarts": 0, "overflow": 0}
+        self._expected: Optional[int] = None
+        self._boot: Optional[str] = None
+        self._old_boots = deque(maxlen=8)
+        self._pending: Dict[int, Tuple[float, List[str]]] = {}   # Jitter-Puffer: seq → (Empfang, Zeilen)
+        self._skipped = deque(maxlen=256)          # als verloren gezählte seq
+        self._clock_offset: Optional[float] = None  # Laptop-Uhr − ESP32-millis/1000 (pro Start)
+        self._lines = deque(maxlen=max_backlog)    # (Zeile, Messzeit)
+        self.line_time: Optional[float] = None     # Messzeit der zuletzt gelieferten Zeile
+        self._ready = threading.Condition()
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.5)
+        self.address = self.sock.getsockname()
+        self._running = True
+        self._thread = threading.Thread(target=self._receive_loop, name="zx6r-udp", daemon=True)
+        self._thread.start()
+
+    def _receive_loop(self):
+        while self._running:
+            try:
+                data, _sender = self.sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.handle_datagram(data)
+
+    def handle_datagram(self, data: bytes, received: Optional[float] = None):
+        """Datagramm einsortieren und alles, was in Reihenfolge ist, freigeben"""
+        received = time.time() if received is None else received
+        lines = data.decode(errors="replace").splitlines()
+        if not lines or not lines[0].startswith("SEQ:"):
+            return
+        header = dict(field.split(":", 1) for field in lines[0].split(",") if ":" in field)
+        try:
+            seq = int(header["SEQ"])
+        except ValueError:
+            return
+        boot = header.get("BOOT")
+
+        with self._ready:
+            self.stats["datagrams"] += 1
+            if boot is not None and boot in self._old_boots:
+                self.stats["late"] += 1   # Nachzügler von vor dem Neustart
+                return
+            if self._expected is None:
+                self._expected, self._boot = seq, boot
+            elif boot is not None or self._boot is not None:
+                if boot != self._boot:
+                    self._restart(seq, boot)
+            elif seq < self._expected - self.reorder_window and seq not in self._skipped:
+                self._restart(seq, boot)   # alte Firmware ohne BOOT: SEQ weit zurück = Neustart
+            if seq < self._expected:
+                # Übersprungene Lücke kommt zu spät, sonst schon geliefert
+                self.stats["late" if seq in self._skipped else "duplicates"] += 1
+                return
+            if seq in self._pending:
+                self.stats["duplicates"] += 1
+                return
+            if seq == self._expected and self._pending:
+                self.stats["reordered"] += 1  # Lücke kam doch noch, nur zu spät
+            self._pending[seq] = (received, lines[1:])
+
+            if self._release():
+                self._ready.notify_all()
+
+    def _restart(self, seq: int, boot: Optional[str]):
+        """ESP32 neu gestartet: Wartendes des alten Starts ausliefern, Zählung neu beginnen"""
+        while self._pending:
+            self._skip_gap()
+            self._release()
+        self.stats["restarts"] += 1
+        if self._boot is not None:
+            self._old_boots.append(self._boot)
+        self._expected, self._boot = seq, boot
+        self._skipped.clear()
+        self._clock_offset = None  # millis() beginnt wieder bei 0
+
+    def _release(self) -> bool:
+        released = False
+        while True:
+            if self._expected in self._pending:
+                received, lines = self._pending.pop(self._expected)
+                self._queue_lines(received, [line for line in lines if line])
+                self._expected += 1
+                released = True
+            elif len(self._pending) > self.reorder_window:
+                self._skip_gap()  # Lücke kommt nicht mehr
+            else:
+                return released
+
+    def _queue_lines(self, received: float, lines: List[str]):
+        """Zeilen mit Messzeit einreihen; was über max_backlog hinausgeht, zählt als overflow"""
+        millis = [parse_millis(line) for line in lines]
+        if millis and millis[-1] is not None:
+            # Letztes Sample wird direkt vor dem Senden gemessen: kleinste Differenz = kürzeste Laufzeit
+            offset = received - millis[-1] / 1000
+            if self._clock_offset is None or offset < self._clock_offset:
+                self._clock_offset = offset
+        for line, ms in zip(lines, millis):
+            line_time = received if ms is None else self._clock_offset + ms / 1000
+            if len(self._lines) == self._lines.maxlen:
+                self.stats["overflow"] += 1
+            self._lines.append((line, line_time))
+        self.stats["samples"] += len(lines)
+
+    def _skip_gap(self):
+        """Fehlende seq bis zum nächsten wartenden Datagramm als verloren zählen"""
+        resume = min(self._pending)
+        self.stats["lost"] += resume - self._expected
+        self._skipped.extend(range(self._expected, resume))
+        self._expected = resume
+
+    def request_line(self) -> str:
+        """Nächste Sample-Zeile (Messzeit danach in line_time); wartet höchstens timeout"""
+        deadline = time.monotonic() + self.timeout
+        with self._ready:
+            while not self._lines:
+                remaining = deadline - time.monotonic()
+                if remaining > 0 and self._ready.wait_for(lambda: self._lines, timeout=remaining):
+                    break
+                if not self._pending:
+                    self.line_time = None
+                    return ""
+                # Lange nichts gekommen: Lücke aufgeben, Wartendes freigeben (kann leer sein)
+                self._skip_gap()
+                self._release()
+            line, self.line_time = self._lines.popleft()
+            return line
+
+    def close(self):
+        self._running = False
+        self.sock.close()
+        self._thread.join()
+
+
+class LoopbackESP32:
+    """Lokaler Ersatz für die ESP32-Firmware: schickt Stapel per UDP an localhost"""
+
+    def __init__(self, target=("127.0.0.1", 4210), batch_size=5, interval=0.1,
+                 loss=0.0, reorder=0.0, seed=None):
+        self.target = target
+        self.batch_size = batch_size
+        self.interval = interval
+        self.loss = loss
+        self.reorder = reorder
+        self.random = random.Random(seed)
+        self.seq = 0
+        self.sent = 0
+        self.ms = 0
+        self.boot_id = "%08x" % self.random.getrandbits(32)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._held: Optional[bytes] = None
+
+    def sample_line(self, ms: int) -> str:
+        rpm = int(6000 + 4000 * ((ms // 100) % 50) / 50)
+        temp = 85.0 + (ms // 1000) % 10
+        return f"MS:{ms},RPM:{rpm},TEMP:{temp:.1f}"
+
+    def send_batch(self, lines: List[str]):
+        """Ein Datagramm bauen und (ggf. verloren/vertauscht) senden"""
+        datagram = ("SEQ:%d,BOOT:%s\n" % (self.seq, self.boot_id) + "\n".join(lines)).encode()
+        self.seq += 1
+        self.sent += 1
+        if self.random.random() < self.loss:
+            return
+        if self._held is None and self.random.random() < self.reorder:
+            self._held = datagram   # später nach dem nächsten Datagramm senden
+            return
+        self.sock.sendto(datagram, self.target)
+        if self._held is not None:
+            self.sock.sendto(self._held, self.target)
+            self._held = None
+
+    def reboot(self):
+        """Neustart wie beim Zündung-aus/an: SEQ und millis() beginnen bei 0, neue BOOT-ID"""
+        self.seq = 0
+        self.ms = 0
+        self.boot_id = "%08x" % self.random.getrandbits(32)
+
+    def run(self, batches: int, realtime: bool = False):
+        """batches Stapel senden; realtime=True hält den 10-Hz-Takt ein"""
+        for _ in range(batches):
+            lines = []
+            for _ in range(self.batch_size):
+                lines.append(self.sample_line(self.ms))
+                self.ms += int(self.interval * 1000)
+            self.send_batch(lines)
+            if realtime:
+                time.sleep(self.interval * self.batch_size)
+        if self._held is not None:
+            self.sock.sendto(self._held, self.target)
+            self._held = None
+
+    def close(self):
+        self.sock.close()
+
+
+def main():
+    """Loopback-Test: simulierter ESP32 mit Verlust, Vertauschung und Neustart"""
+    transport = UdpTransport(host="127.0.0.1", port=0)
+    esp = LoopbackESP32(target=transport.address, loss=0.05, reorder=0.05, seed=1)
+    esp.run(100)
+    esp.reboot()
+    esp.run(100)
+    time.sleep(0.5)
+
+    transport.timeout = 0.2
+    received = 0
+    while transport.request_line():
+        received += 1
+    print(f"📡 {esp.sent} Datagramme gesendet, {received} Samples empfangen")
+    print(f"   Statistik: {transport.stats}")
+    transport.close()
+    esp.close()
+
+
+if __name__ == "__main__":
+    main()
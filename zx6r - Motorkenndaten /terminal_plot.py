@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+ZX6R Terminal-Plots
+Zeichnet Kurven hochauflösend ins Terminal: Braille-Zeichen liefern 2×4
+Subpixel pro Zeichen, Halbblöcke 1×2. Mehrere Serien, Achsen und Legende.
+
+Das Rastern ist vektorisiert (NumPy): Linien zwischen allen Punkten werden
+in einem Schritt erzeugt, lange Messreihen vorher pro Pixelspalte auf
+Minimum/Maximum reduziert. 100k Punkte sind damit kein Problem.
+
+Ausgabe wahlweise mit Rich-Markup (ZX6RApp), ANSI-Farben (Logger im
+normalen Terminal) oder ohne Farben.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Braille: Bit pro Subpixel (Zeile 0-3, Spalte 0-1), Zeichen = U+2800 + Bits
+BRAILLE_BITS = np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]], dtype=np.uint16)
+HALFBLOCK_CHARS = np.array([" ", "▀", "▄", "█"])
+
+ANSI_COLORS = {"red": 31, "green": 32, "yellow": 33, "blue": 34, "magenta": 35, "cyan": 36, "white": 37}
+MODES = {"braille": (2, 4), "halfblock": (1, 2)}   # Subpixel pro Zeichen (x, y)
+
+
+def _tick(value: float) -> str:
+    if abs(value) >= 100 or value == int(value):
+        return f"{value:.0f}"
+    if abs(value) >= 1:
+        return f"{value:.1f}"
+    return f"{value:.2f}"
+
+
+def _envelope(px: np.ndarray, py: np.ndarray):
+    """Bei steigendem x: pro Pixelspalte nur erster, min, max und letzter Punkt"""
+    starts = np.flatnonzero(np.concatenate(([True], px[1:] != px[:-1])))
+    ends = np.concatenate((starts[1:], [len(px)])) - 1
+    columns = np.stack((py[starts], np.minimum.reduceat(py, starts),
+                        np.maximum.reduceat(py, starts), py[ends]), axis=1)
+    return np.repeat(px[starts], 4), columns.ravel()
+
+
+def _visible_range(px: np.ndarray, py: np.ndarray, width: int, height: int):
+    """Sichtbarer Anteil [t0, t1] jeder Strecke auf der Zeichenfläche (Liang-Barsky, vektorisiert)
+
+    Die Fläche reicht einen halben Pixel über die Randpixel hinaus: alles, was
+    auf einen Randpixel gerundet wird, zählt als sichtbar.
+    """
+    x0, y0 = px[:-1] + 0.5, py[:-1] + 0.5
+    dx, dy = np.diff(px).astype(np.float64), np.diff(py).astype(np.float64)
+    t0, t1 = np.zeros(len(dx)), np.ones(len(dx))
+    visible = np.ones(len(dx), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0), (dx, width - x0), (-dy, y0), (dy, height - y0)):
+            ratio = q / p
+            visible &= ~((p == 0) & (q < 0))
+            t0 = np.where(p < 0, np.maximum(t0, ratio), t0)
+            t1 = np.where(p > 0, np.minimum(t1, ratio), t1)
+    return t0, t1, visible & (t0 <= t1)
+
+
+def _line_pixels(px: np.ndarray, py: np.ndarray, width: int, height: int):
+    """Alle Pixel der Linienzüge durch (px, py) – ohne Python-Schleife
+
+    Erzeugt werden nur die Schritte im sichtbaren Teil jeder Strecke (plus
+    einen Rand für die Rundung); sonst würde ein einzelner Ausreißer bei
+    festem y_range Millionen Pixel außerhalb der Fläche erzeugen.
+    """
+    if len(px) == 1:
+        return px, py
+    x0, y0 = px[:-1], py[:-1]
+    dx, dy = np.diff(px), np.diff(py)
+    steps = np.maximum(np.abs(dx), np.abs(dy))
+    t0, t1, visible = _visible_range(px, py, width, height)
+    first = np.clip(np.floor(t0 * steps).astype(np.int64) - 1, 0, steps)
+    last = np.clip(np.ceil(t1 * steps).astype(np.int64) + 1, 0, steps)
+    counts = np.where(visible, last - first + 1, 0)
+    segment = np.repeat(np.arange(len(steps)), counts)
+    offset = first[segment] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    frac = offset / np.maximum(steps, 1)[segment]
+    xs = np.rint(x0[segment] + dx[segment] * frac).astype(np.int64)
+    ys = np.rint(y0[segment] + dy[segment] * frac).astype(np.int64)
+    return xs, ys
+
+
+class TerminalPlot:
+    """Liniendiagramm mit Braille- oder Halbblock-Raster"""
+
+    def __init__(self, width: int = 72, height: int = 16, mode: str = "braille",
+                 title: str = "", x_label: str = "", y_label: str = "",
+                 x_range: Optional[Sequence[float]] = None, y_range: Optional[Sequence[float]] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unbekannter Modus: {mode} (erlaubt: {', '.join(MODES)})")
+        self.width = width        # Zeichen für die Zeichenfläche
+        self.height = height
+        self.mode = mode
+        self.title = title
+        self.x_label = x_label
+        self.y_label = y_label
+        self.x_range = x_range
+        self.y_range = y_range
+        self.series = []
+
+    def add_series(self, x, y, label: str = "", color: str = "cyan"):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        self.series.append({"x": x[valid], "y": y[valid], "label": label, "color": color})
+        return self
+
+    def _ranges(self):
+        xs = [s["x"] for s in self.series if len(s["x"])]
+        ys = [s["y"] for s in self.series if len(s["y"])]
+        x_range = self.x_range or ((min(a.min() for a in xs), max(a.max() for a in xs)) if xs else (0, 1))
+        y_range = self.y_range or ((min(a.min() for a in ys), max(a.max() for a in ys)) if ys else (0, 1))
+        if x_range[1] == x_range[0]:
+            x_range = (x_range[0] - 1, x_range[1] + 1)
+        if y_range[1] == y_range[0]:
+            y_range = (y_range[0] - 1, y_range[1] + 1)
+        return x_range, y_range
+
+    def rasterize(self):
+        """→ (Zeichen-Matrix, Serien-Index pro Zeichen oder -1)"""
+        sub_x, sub_y = MODES[self.mode]
+        pixel_w, pixel_h = self.width * sub_x, self.height * sub_y
+        (x_min, x_max), (y_min, y_max) = self._ranges()
+
+        codes = np.zeros((self.height, self.width), dtype=np.uint16)
+        owner = np.full((self.height, self.width), -1, dtype=np.int64)
+        for index, series in enumerate(self.series):
+            if not len(series["x"]):
+                continue
+            px = np.rint((series["x"] - x_min) / (x_max - x_min) * (pixel_w - 1)).astype(np.int64)
+            py = np.rint((y_max - series["y"]) / (y_max - y_min) * (pixel_h - 1)).astype(np.int64)
+            if len(px) > 2 * pixel_w and np.all(px[1:] >= px[:-1]):
+                px, py = _envelope(px, py)
+            xs, ys = _line_pixels(px, py, pixel_w, pixel_h)
+            inside = (xs >= 0) & (xs < pixel_w) & (ys >= 0) & (ys < pixel_h)
+
+            pixels = np.zeros((pixel_h, pixel_w), dtype=bool)
+            pixels[ys[inside], xs[inside]] = True
+            cells = pixels.reshape(self.height, sub_y, self.width, sub_x)
+            if self.mode == "braille":
+                layer = np.einsum("ryxs,ys->rx", cells.astype(np.uint16), BRAILLE_BITS)
+            else:
+                layer = cells[:, 0, :, 0] + 2 * cells[:, 1, :, 0].astype(np.uint16)
+            # Punkte gemeinsamer Zellen werden vereint, die Farbe gehört der späteren Serie
+            codes |= layer.astype(np.uint16)
+            owner[layer > 0] = index
+
+        if self.mode == "braille":
+            chars = np.where(codes > 0, np.char.mod("%c", 0x2800 + codes.astype(np.int64)), " ")
+        else:
+            chars = HALFBLOCK_CHARS[codes]
+        return chars, owner
+
+    def _colored(self, text: str, color: Optional[str], markup: Optional[str]) -> str:
+        if not color or not markup:
+            return text
+        if markup == "rich":
+            return f"[{color}]{text}[/{color}]"
+        return f"\033[{ANSI_COLORS.get(color, 37)}m{text}\033[0m"
+
+    def render(self, markup: Optional[str] = "rich") -> List[str]:
+        """Zeilen des Diagramms; markup: "rich", "ansi" oder None"""
+        chars, owner = self.rasterize()
+        (x_min, x_max), (y_min, y_max) = self._ranges()
+
+        tick_rows = {0: y_max, self.height // 2: (y_min + y_max) / 2, self.height - 1: y_min}
+        label_width = max(len(_tick(v)) for v in tick_rows.values())
+        lines = []
+        if self.title:
+            lines.append(" " * (label_width + 2) + self.title)
+        if self.y_label:
+            lines.append(" " * max(label_width - len(self.y_label) + 2, 0) + self.y_label)
+
+        for row in range(self.height):
+            label = _tick(tick_rows[row]).rjust(label_width) if row in tick_rows else " " * label_width
+            parts, start = [], 0
+            # Zusammenhängende Zeichen gleicher Serie in einem Farbblock
+            for col in range(1, self.width + 1):
+                if col == self.width or owner[row, col] != owner[row, start]:
+                    text = "".join(chars[row, start:col])
+                    series = owner[row, start]
+                    color = self.series[series]["color"] if series >= 0 else None
+                    parts.append(self._colored(text, color, markup))
+                    start = col
+            lines.append(f"{label} {'┤' if row in tick_rows else '│'}" + "".join(parts))
+
+        lines.append(" " * label_width + " └" + "─" * self.width)
+        left, mid, right = _tick(x_min), _tick((x_min + x_max) / 2), _tick(x_max)
+        axis = list(" " * (self.width + 2))
+        for pos, text in ((0, left), (self.width // 2 - len(mid) // 2, mid), (self.width - len(right), right)):
+            axis[pos:pos + len(text)] = text
+        lines.append(" " * (label_width + 1) + "".join(axis).rstrip() + (f"  {self.x_label}" if self.x_label else ""))
+
+        legend = [self._colored("━━", s["color"], markup) + f" {s['label']}" for s in self.series if s["label"]]
+        if legend:
+            lines.append(" " * (label_width + 2) + "   ".join(legend))
+        return lines
+
+    def show(self, console=None, markup: Optional[str] = None):
+        """Ausgeben: mit Rich-Console farbig per Markup, sonst per print()"""
+        if console is not None:
+            for line in self.render("rich"):
+                console.print(line, highlight=False)
+        else:
+            print("\n".join(self.render(markup)))
+
+
+def main():
+    """Demo und Zeitmessung mit 100k Punkten"""
+    import time
+
+    t = np.linspace(0, 600, 100_000)
+    rpm = 7000 + 3500 * np.sin(t / 40) + np.random.default_rng(0).normal(0, 300, len(t))
+    start = time.perf_counter()
+    plot = TerminalPlot(title="Drehzahl (100k Punkte)", x_label="s", y_label="U/min")
+    plot.add_series(t, rpm, "RPM", "cyan")
+    plot.add_series(t, 7000 + 3500 * np.sin(t / 40), "Mittel", "yellow")
+    lines = plot.render("ansi")
+    elapsed = time.perf_counter() - start
+    print("\n".join(lines))
+    print(f"⏱️ {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
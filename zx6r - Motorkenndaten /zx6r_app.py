@@ -241,25 +241,15 @@ class ZX6RApp:
             self.console.print("[green]✅ Tuning-Daten zurückgesetzt![/green]")
     
     def show_ascii_graph(self):
-        """Zeige einfaches ASCII-Diagramm"""
-        self.console.print("\n[cyan]📊 Leistungsdiagramm (ASCII)[/cyan]")
-        
-        max_power = max(max(p["leistung"] for p in self.standard_performance.values()),
-                       max(p["leistung"] for p in self.tuning_performance.values()))
-        
-        for rpm in sorted(self.standard_performance.keys()):
-            std_power = self.standard_performance[rpm]["leistung"]
-            tuning_power = self.tuning_performance[rpm]["leistung"]
-            
-            # Skaliere für ASCII (max 50 Zeichen)
-            std_bars = int((std_power / max_power) * 50)
-            tuning_bars = int((tuning_power / max_power) * 50)
-            
-            std_graph = "█" * std_bars
-            tuning_graph = "▓" * tuning_bars
-            
-            self.console.print(f"{rpm:5d}: [blue]{std_graph:50s}[/blue] {std_power:5.1f} PS")
-            self.console.print(f"     : [green]{tuning_graph:50s}[/green] {tuning_power:5.1f} PS")
+        """Zeige Leistungs- und Drehmomentkurven (Braille-Diagramm)"""
+        from terminal_plot import TerminalPlot
+
+        rpms = sorted(self.standard_performance.keys())
+        for key, title, unit in (("leistung", "📊 Leistung", "PS"), ("drehmoment", "📊 Drehmoment", "Nm")):
+            plot = TerminalPlot(width=60, height=12, title=f"[cyan]{title}[/cyan]", x_label="U/min", y_label=unit)
+            plot.add_series(rpms, [self.standard_performance[r][key] for r in rpms], "Standard", "blue")
+            plot.add_series(rpms, [self.tuning_performance[r][key] for r in rpms], "Tuning", "green")
+            plot.show(console=self.console)
             self.console.print()
     
     def show_menu(self):
@@ -271,7 +261,7 @@ class ZX6RApp:
         menu.add_row("[1] Setup-Vergleich anzeigen")
         menu.add_row("[2] Leistungstabelle anzeigen")  
         menu.add_row("[3] Geschwindigkeitstabelle anzeigen")
-        menu.add_row("[4] ASCII Leistungsdiagramm")
+        menu.add_row("[4] Leistungsdiagramm")
         menu.add_row("[5] Tuning-Werte bearbeiten")
         menu.add_row("[6] Tuning-Daten zurücksetzen")
         menu.add_row("[7] Alles anzeigen")